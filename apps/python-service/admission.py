@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+SilentSort Admission Control
+Bounded priority lanes in front of the analysis endpoints
+"""
+
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+LANES = (INTERACTIVE, BACKGROUND)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a lane's queue is full; carries a retry hint in seconds"""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"{lane} queue is full, retry after {retry_after}s")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Admit requests into a fixed number of execution slots.
+
+    Interactive requests may use every slot and are always dispatched before
+    background requests; background requests are capped below the total so
+    there is headroom for the desktop UI even while a bulk run saturates the
+    background lane. Each lane has a bounded wait queue and requests beyond it
+    are rejected immediately instead of piling up.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        background_max_concurrency: int = 6,
+        interactive_queue_size: int = 64,
+        background_queue_size: int = 256,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.background_max_concurrency = max(1, min(background_max_concurrency, self.max_concurrency))
+        self.queue_limits = {INTERACTIVE: interactive_queue_size, BACKGROUND: background_queue_size}
+
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._in_flight = {lane: 0 for lane in LANES}
+        self._admitted = {lane: 0 for lane in LANES}
+        self._rejected = {lane: 0 for lane in LANES}
+        self._max_queue_depth = {lane: 0 for lane in LANES}
+        self._avg_wait_ms = {lane: 0.0 for lane in LANES}
+        self._avg_service_ms = 0.0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Build a controller from ADMISSION_* environment variables"""
+        return cls(
+            max_concurrency=int(os.getenv("ADMISSION_MAX_CONCURRENCY", "8")),
+            background_max_concurrency=int(os.getenv("ADMISSION_BACKGROUND_MAX_CONCURRENCY", "6")),
+            interactive_queue_size=int(os.getenv("ADMISSION_INTERACTIVE_QUEUE", "64")),
+            background_queue_size=int(os.getenv("ADMISSION_BACKGROUND_QUEUE", "256")),
+        )
+
+    @staticmethod
+    def resolve_lane(*candidates: Optional[str]) -> str:
+        """Pick the lane from the first non-empty hint (header, body field, ...)"""
+        for candidate in candidates:
+            if candidate:
+                lane = candidate.strip().lower()
+                return BACKGROUND if lane in (BACKGROUND, "bulk", "batch", "low") else INTERACTIVE
+        default_lane = os.getenv("ADMISSION_DEFAULT_LANE", INTERACTIVE).lower()
+        return default_lane if default_lane in LANES else INTERACTIVE
+
+    # ========================================================================
+    # SLOT MANAGEMENT
+    # ========================================================================
+
+    def _total_in_flight(self) -> int:
+        return self._in_flight[INTERACTIVE] + self._in_flight[BACKGROUND]
+
+    def _has_slot(self, lane: str) -> bool:
+        if self._total_in_flight() >= self.max_concurrency:
+            return False
+        if lane == BACKGROUND:
+            return self._in_flight[BACKGROUND] < self.background_max_concurrency
+        return True
+
+    def _can_start_now(self, lane: str) -> bool:
+        """A new arrival may only skip the queue if nobody it must yield to is waiting"""
+        if self._waiters[lane] or not self._has_slot(lane):
+            return False
+        if lane == BACKGROUND and self._waiters[INTERACTIVE]:
+            return False
+        return True
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters, interactive lane first"""
+        for lane in LANES:
+            waiters = self._waiters[lane]
+            while waiters and self._has_slot(lane):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                self._in_flight[lane] += 1
+                future.set_result(None)
+
+    def retry_after(self, lane: str) -> int:
+        """Seconds until the lane's current backlog is expected to drain"""
+        slots = self.max_concurrency if lane == INTERACTIVE else self.background_max_concurrency
+        backlog = len(self._waiters[lane]) + self._in_flight[lane]
+        service_s = (self._avg_service_ms or 1000.0) / 1000
+        return max(1, math.ceil(backlog * service_s / slots))
+
+    async def acquire(self, lane: str) -> float:
+        """Wait for a slot in `lane`; returns the time spent queued in ms"""
+        if self._can_start_now(lane):
+            self._in_flight[lane] += 1
+            self._record_admitted(lane, 0.0)
+            return 0.0
+
+        waiters = self._waiters[lane]
+        if len(waiters) >= self.queue_limits[lane]:
+            self._rejected[lane] += 1
+            raise AdmissionRejected(lane, self.retry_after(lane))
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self._max_queue_depth[lane] = max(self._max_queue_depth[lane], len(waiters))
+        queued_at = time.perf_counter()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before cancellation; give it back
+                self.release(lane)
+            else:
+                try:
+                    waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        self._record_admitted(lane, wait_ms)
+        return wait_ms
+
+    def release(self, lane: str, service_ms: Optional[float] = None) -> None:
+        """Return a slot and wake the next waiter"""
+        self._in_flight[lane] -= 1
+        if service_ms is not None:
+            self._avg_service_ms = service_ms if not self._avg_service_ms else \
+                0.9 * self._avg_service_ms + 0.1 * service_ms
+        self._dispatch()
+
+    def _record_admitted(self, lane: str, wait_ms: float) -> None:
+        self._admitted[lane] += 1
+        self._avg_wait_ms[lane] = 0.9 * self._avg_wait_ms[lane] + 0.1 * wait_ms
+
+    @asynccontextmanager
+    async def admit(self, lane: str):
+        """Hold a slot in `lane` for the duration of the block"""
+        await self.acquire(lane)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(lane, (time.perf_counter() - started) * 1000)
+
+    # ========================================================================
+    # METRICS
+    # ========================================================================
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth, occupancy and counters per lane"""
+        lanes = {
+            lane: {
+                "queue_depth": len(self._waiters[lane]),
+                "max_queue_depth": self._max_queue_depth[lane],
+                "queue_limit": self.queue_limits[lane],
+                "in_flight": self._in_flight[lane],
+                "admitted": self._admitted[lane],
+                "rejected": self._rejected[lane],
+                "avg_wait_ms": round(self._avg_wait_ms[lane], 2),
+            }
+            for lane in LANES
+        }
+        lanes["slots"] = {
+            "max_concurrency": self.max_concurrency,
+            "background_max_concurrency": self.background_max_concurrency,
+            "avg_service_ms": round(self._avg_service_ms, 2),
+        }
+        return lanes
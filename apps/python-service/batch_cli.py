@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+SilentSort Batch CLI
+Sends files to /analyze-batch and prints each result (NDJSON) as it completes,
+either to a running service or to the app loaded in this process
+
+Usage: python batch_cli.py ~/Downloads [--recursive] [--concurrency 16] [--in-process] [--output results.ndjson]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+SERVICE_DIR = Path(__file__).resolve().parent
+
+
+def collect_files(paths: List[str], recursive: bool) -> List[str]:
+    """Visible regular files among `paths`, expanding directories (one level unless recursive)"""
+    files = []
+    for path in paths:
+        path = os.path.abspath(os.path.expanduser(path))
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".")) if recursive else []
+            files.extend(os.path.join(root, name) for name in sorted(names) if not name.startswith("."))
+    return files
+
+
+def file_request(path: str) -> Dict[str, Any]:
+    name = os.path.basename(path)
+    return {
+        "file_path": path,
+        "original_name": name,
+        "file_size": os.path.getsize(path),
+        "file_extension": os.path.splitext(name)[1],
+        "read_from_path": True,
+    }
+
+
+def stream_remote(url: str, body: Dict[str, Any]) -> Iterator[str]:
+    import httpx
+
+    with httpx.stream("POST", f"{url.rstrip('/')}/analyze-batch", json=body, timeout=None) as response:
+        response.raise_for_status()
+        yield from response.iter_lines()
+
+
+def stream_in_process(body: Dict[str, Any], roots: List[str]) -> Iterator[str]:
+    # The files are read by this process, so allow exactly the paths given on the command line
+    os.environ["SERVER_SIDE_READ"] = "true"
+    os.environ["SERVER_READ_ROOTS"] = ",".join(roots)
+    sys.path.insert(0, str(SERVICE_DIR))
+    from fastapi.testclient import TestClient
+    import main as service
+
+    with TestClient(service.app) as client:
+        with client.stream("POST", "/analyze-batch", json=body) as response:
+            response.raise_for_status()
+            yield from response.iter_lines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("paths", nargs="+", help="files or directories")
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=None, help="default: BATCH_MAX_CONCURRENCY")
+    parser.add_argument("--url", default=os.getenv("SILENTSORT_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--in-process", action="store_true", help="load main.py here instead of calling --url")
+    parser.add_argument("--output", help="write NDJSON here instead of stdout")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths, args.recursive)
+    if not files:
+        print("❌ No files found", file=sys.stderr)
+        sys.exit(1)
+    body = {"files": [file_request(path) for path in files], "max_concurrency": args.concurrency}
+
+    roots = [os.path.abspath(os.path.expanduser(path)) for path in args.paths]
+    lines = stream_in_process(body, roots) if args.in_process else stream_remote(args.url, body)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for line in lines:
+            if not line:
+                continue
+            print(line, file=output, flush=True)
+            event = json.loads(line)
+            if event["type"] == "summary":
+                print(f"✅ {event['files']} files ({event['errors']} errors) in {event['elapsed_ms']}ms, "
+                      f"{event['files_per_second']} files/s at concurrency {event['max_concurrency']}",
+                      file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+SilentSort Batch Runner
+Runs many files through the shared workflow concurrently and hands back
+each result as soon as it completes
+"""
+
+import os
+import time
+import asyncio
+import itertools
+import tempfile
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+Items = Union[List[Any], AsyncIterable[Any]]
+
+
+class RecordTooLarge(ValueError):
+    """An NDJSON record exceeded the size limit before its newline arrived"""
+
+
+async def ndjson_records(chunks: AsyncIterable[bytes], max_record_bytes: int = 1 << 20) -> AsyncIterator[bytes]:
+    """Non-empty lines of a newline-delimited byte stream, without buffering more than one record"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+        if len(buffer) > max_record_bytes:
+            raise RecordTooLarge(f"NDJSON record longer than {max_record_bytes} bytes")
+    if buffer.strip():
+        yield buffer
+
+
+async def _as_async(items: Items) -> AsyncIterator[Any]:
+    if isinstance(items, list):
+        for item in items:
+            yield item
+    else:
+        async for item in items:
+            yield item
+
+
+class BatchRunner:
+    """Bounded concurrent execution of one analysis function over many items.
+
+    `max_concurrency` workers pull items in order, so at most that many
+    analyses are in flight no matter how large the batch is; every worker
+    calls the same `analyze` (one compiled graph, one LLM client, shared
+    caches). Results go through a bounded queue and are yielded in
+    completion order, each tagged with the index of its item. Items may be
+    a list or an async iterable (e.g. a request body being read): workers
+    only take the next item when they are free and the queue has room, so a
+    stream of any length is processed in constant memory. If the consumer
+    stops early the workers are cancelled.
+    """
+
+    def __init__(self, analyze: Callable[[Any], Awaitable[Dict[str, Any]]],
+                 max_concurrency: int = 32, max_files: int = 5000):
+        self.analyze = analyze
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_files = max_files
+        self.batches = 0
+        self.files = 0
+        self.errors = 0
+        self.last_files_per_second = 0.0
+
+    @classmethod
+    def from_env(cls, analyze: Callable[[Any], Awaitable[Dict[str, Any]]]) -> "BatchRunner":
+        return cls(
+            analyze,
+            max_concurrency=int(os.getenv("BATCH_MAX_CONCURRENCY", "32")),
+            max_files=int(os.getenv("BATCH_MAX_FILES", "5000")),
+        )
+
+    def concurrency(self, requested: Optional[int]) -> int:
+        """Requested concurrency clamped to 1..max_concurrency (the maximum when not given)"""
+        return self.max_concurrency if not requested else max(1, min(requested, self.max_concurrency))
+
+    async def _run_all(self, items: Items, concurrency: int, results: asyncio.Queue,
+                       describe: Optional[Callable[[Any], Dict[str, Any]]]) -> None:
+        pending = _as_async(items)
+        taking = asyncio.Lock()  # An async generator can only be advanced by one worker at a time
+        counter = itertools.count()
+
+        async def worker():
+            while True:
+                async with taking:
+                    try:
+                        item = await pending.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    except Exception as e:
+                        # The input itself failed (malformed stream, client gone): report it, take no more
+                        await results.put({"type": "error", "index": None, "error": str(e) or type(e).__name__})
+                        return
+                    index = next(counter)
+                try:
+                    event = {"type": "result", "index": index, "result": await self.analyze(item)}
+                except Exception as e:
+                    event = {"type": "error", "index": index, "error": str(e) or type(e).__name__}
+                if describe:
+                    event.update(describe(item))
+                await results.put(event)
+
+        if isinstance(items, list):
+            concurrency = min(concurrency, len(items)) or 1
+        cancelled = False
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # A cancelled run has no consumer left, and waiting for room in a full queue would never end
+            if not cancelled:
+                await results.put(None)
+
+    async def run(self, items: Items, max_concurrency: Optional[int] = None,
+                  describe: Optional[Callable[[Any], Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Result or error events in completion order (plus `describe(item)` fields), then a summary"""
+        concurrency = self.concurrency(max_concurrency)
+        started = time.perf_counter()
+        done = errors = 0
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        task = asyncio.create_task(self._run_all(items, concurrency, results, describe))
+        try:
+            while True:
+                event = await results.get()
+                if event is None:
+                    break
+                done += 1
+                errors += event["type"] == "error"
+                yield event
+            await task
+        finally:
+            # Client went away mid-batch: stop the workers
+            task.cancel()
+
+        elapsed = time.perf_counter() - started
+        self.batches += 1
+        self.files += done
+        self.errors += errors
+        self.last_files_per_second = round(done / elapsed, 1) if elapsed > 0 else 0.0
+        yield {
+            "type": "summary",
+            "files": done,
+            "errors": errors,
+            "max_concurrency": concurrency,
+            "elapsed_ms": int(elapsed * 1000),
+            "files_per_second": self.last_files_per_second,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batches": self.batches, "files": self.files, "errors": self.errors,
+                "max_concurrency": self.max_concurrency, "last_files_per_second": self.last_files_per_second}
+
+
+class ResultSpool:
+    """NDJSON output between a producer and a reader that may fall behind.
+
+    Lines are kept in memory up to `max_memory_bytes`; past that they go to
+    an anonymous temporary file until the reader has caught up again. The
+    producer therefore never waits for the reader, which matters when the
+    client only reads the response after it has sent the whole request body
+    (most HTTP/1.1 clients): results keep flowing to disk and input keeps
+    being read, in constant memory.
+    """
+
+    def __init__(self, max_memory_bytes: int = 1 << 20):
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: List[bytes] = []
+        self._memory_bytes = 0
+        self._file = None
+        self._spilling = False
+        self._written = 0
+        self._read = 0
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.spilled_bytes = 0
+
+    def write(self, data: bytes) -> None:
+        if not self._spilling and self._memory_bytes + len(data) <= self.max_memory_bytes:
+            self._memory.append(data)
+            self._memory_bytes += len(data)
+        else:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile()
+            self._spilling = True
+            self._file.seek(self._written)
+            self._file.write(data)
+            self._written += len(data)
+            self.spilled_bytes += len(data)
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def chunks(self, read_size: int = 1 << 16) -> AsyncIterator[bytes]:
+        """Everything written, in order, until closed"""
+        try:
+            while True:
+                if self._memory:
+                    data, self._memory, self._memory_bytes = b"".join(self._memory), [], 0
+                    yield data
+                elif self._spilling:
+                    self._file.seek(self._read)
+                    data = self._file.read(min(read_size, self._written - self._read))
+                    self._read += len(data)
+                    if self._read == self._written:
+                        # Caught up: reuse the file from the start and go back to memory
+                        self._read = self._written = 0
+                        self._spilling = False
+                    yield data
+                elif self._closed:
+                    return
+                else:
+                    self._ready.clear()
+                    await self._ready.wait()
+        finally:
+            if self._file is not None:
+                self._file.close()
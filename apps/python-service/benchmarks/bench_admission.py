@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Admission control benchmark
+Floods the analysis path with a background batch while interactive requests
+arrive at a steady rate, and reports interactive latency percentiles with a
+plain FIFO concurrency limit versus the AdmissionController priority lanes.
+
+Usage: python benchmarks/bench_admission.py [--batch 10000] [--service-ms 5]
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from admission import AdmissionController, AdmissionRejected, BACKGROUND, INTERACTIVE
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def simulate(args, use_lanes: bool) -> List[float]:
+    """Return interactive request latencies in ms"""
+    fifo = asyncio.Semaphore(args.concurrency)
+    controller = AdmissionController(
+        max_concurrency=args.concurrency,
+        background_max_concurrency=max(1, args.concurrency - args.reserved),
+        background_queue_size=args.background_queue,
+    )
+
+    async def work():
+        await asyncio.sleep(random.uniform(0.5, 1.5) * args.service_ms / 1000)
+
+    async def handle(lane: str):
+        if not use_lanes:
+            async with fifo:
+                await work()
+            return
+        while True:
+            try:
+                async with controller.admit(lane):
+                    await work()
+                return
+            except AdmissionRejected:
+                # A real client honours Retry-After (whole seconds); the simulation
+                # backs off for the unrounded time the full queue needs to drain
+                drain_s = args.background_queue * args.service_ms / 1000 / args.concurrency
+                await asyncio.sleep(drain_s * random.uniform(0.5, 1.5))
+
+    async def background_batch():
+        # The bulk client keeps a bounded number of requests in flight
+        client_slots = asyncio.Semaphore(args.client_concurrency)
+
+        async def submit():
+            async with client_slots:
+                await handle(BACKGROUND)
+
+        await asyncio.gather(*(submit() for _ in range(args.batch)))
+
+    interactive_latencies: List[float] = []
+
+    async def interactive_user(done: asyncio.Event):
+        while not done.is_set():
+            started = time.perf_counter()
+            await handle(INTERACTIVE)
+            interactive_latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(args.interactive_interval_ms / 1000)
+
+    done = asyncio.Event()
+    users = asyncio.create_task(interactive_user(done))
+    await background_batch()
+    done.set()
+    await users
+    return interactive_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch", type=int, default=10000, help="background files in the bulk run")
+    parser.add_argument("--service-ms", type=float, default=5.0, help="simulated analysis time")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--reserved", type=int, default=2, help="slots kept free for interactive requests")
+    parser.add_argument("--background-queue", type=int, default=256)
+    parser.add_argument("--client-concurrency", type=int, default=512,
+                        help="requests the bulk client keeps in flight")
+    parser.add_argument("--interactive-interval-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    random.seed(7)
+    for label, use_lanes in (("fifo semaphore", False), ("priority lanes", True)):
+        latencies = asyncio.run(simulate(args, use_lanes))
+        print(f"{label:<16} interactive n={len(latencies):<5} "
+              f"p50={percentile(latencies, 0.50):8.1f}ms "
+              f"p95={percentile(latencies, 0.95):8.1f}ms "
+              f"max={max(latencies):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Batch throughput benchmark
+Sends the same 1,000 files through /analyze-batch (mock LLM with a rate
+limit) at increasing max_concurrency and reports files per second, which
+should grow with concurrency until the LLM rate limit caps it.
+
+Usage: python benchmarks/bench_batch.py [--files 1000] [--concurrency 1,4,16,64] [--latency-ms 50] [--max-rps 200]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Naming and categorization run in parallel after content analysis
+LLM_CALLS_PER_FILE = 3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--max-rps", type=float, default=200, help="mock LLM rate limit (calls per second)")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": str(args.latency_ms),
+        "MOCK_LLM_MAX_RPS": str(args.max_rps),
+        "BATCH_MAX_CONCURRENCY": str(max(levels)),
+        # Batch files run in the background lane; let the batch's concurrency, not admission, limit them
+        "ADMISSION_MAX_CONCURRENCY": str(max(levels)),
+        "ADMISSION_BACKGROUND_MAX_CONCURRENCY": str(max(levels)),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    from fastapi.testclient import TestClient
+    import main as service
+
+    ceiling = args.max_rps / LLM_CALLS_PER_FILE
+    print(f"{args.files} files, {args.latency_ms:.0f}ms mock latency, rate limit {args.max_rps:.0f} calls/s "
+          f"(at most {ceiling:.0f} files/s)")
+    print(f"{'concurrency':>11} {'files/s':>8} {'elapsed':>8} {'errors':>7}")
+    with TestClient(service.app) as client:
+        for level in levels:
+            files = [{
+                "file_path": f"/bench/batch/c{level}/report-{i}.txt",
+                "original_name": f"report-{i}.txt",
+                "file_size": 2048,
+                "file_extension": ".txt",
+                "content_preview": f"Quarterly report {i} for the finance team, revenue and costs by region.",
+            } for i in range(args.files)]
+
+            with client.stream("POST", "/analyze-batch", json={"files": files, "max_concurrency": level}) as response:
+                for line in response.iter_lines():
+                    event = json.loads(line)
+                    if event["type"] == "summary":
+                        summary = event
+            print(f"{level:>11d} {summary['files_per_second']:>8.1f} {summary['elapsed_ms'] / 1000:>7.1f}s "
+                  f"{summary['errors']:>7d}")
+
+
+if __name__ == "__main__":
+    main()
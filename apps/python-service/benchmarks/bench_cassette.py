@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+LLM cassette benchmark
+Records one run of the main workflow (mock LLM by default) to a cassette,
+then replays it twice with recorded latencies and once without, and checks
+that every replay returns the recorded results. With --cassette an existing
+recording (e.g. from the real API) is replayed instead.
+
+Usage: python benchmarks/bench_cassette.py [--files 200] [--latency-ms 50] [--cassette run.jsonl.gz]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def requests(count: int):
+    topics = ["invoice from Acme", "meeting notes for the design review", "quarterly revenue report",
+              "employment contract", "travel receipt"]
+    return [{
+        "file_path": f"/bench/cassette/{i}/file-{i}.txt",
+        "original_name": f"file-{i}.txt",
+        "file_size": 2048,
+        "file_extension": ".txt",
+        "content_preview": f"This document is a {topics[i % len(topics)]} (#{i}).",
+    } for i in range(count)]
+
+
+def run(client, bodies):
+    results, latencies = [], []
+    for body in bodies:
+        started = time.perf_counter()
+        result = client.post("/analyze-file", json=body).json()
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append((result["suggested_name"], result["category"], result["alternatives"]))
+    return results, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--cassette", help="replay this recording instead of recording one")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": str(args.latency_ms),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    from fastapi.testclient import TestClient
+    import main as service
+    from llm_cassette import RECORD, REPLAY, Cassette, CassetteChatModel
+
+    bodies = requests(args.files)
+    path = args.cassette or os.path.join(tmp, "run.jsonl.gz")
+    with TestClient(service.app) as client:
+        workflow = service.workflow_instance
+        recorded = None
+        if not args.cassette:
+            cassette = Cassette(path, RECORD)
+            workflow._llm = CassetteChatModel(workflow._llm, cassette)
+            recorded, latencies = run(client, bodies)
+            cassette.close()
+            print(f"record             median {statistics.median(latencies):6.1f}ms, total {sum(latencies) / 1000:5.1f}s "
+                  f"({cassette.stats['recorded']} calls, {os.path.getsize(path) / 1024:.1f} KB cassette)")
+
+        for label, replay_latency in (("replay (latency)", True), ("replay (latency)", True), ("replay (instant)", False)):
+            cassette = Cassette(path, REPLAY, replay_latency=replay_latency)
+            workflow._llm = CassetteChatModel(None, cassette)
+            results, latencies = run(client, bodies)
+            recorded = recorded or results
+            print(f"{label:<18} median {statistics.median(latencies):6.1f}ms, total {sum(latencies) / 1000:5.1f}s, "
+                  f"{cassette.stats['hits']} hits, {cassette.stats['misses']} misses, "
+                  f"{'identical' if results == recorded else 'DIFFERENT'} results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Content preview benchmark
+Compares the current path (client reads the whole file, ships the preview in
+JSON) with server-side bounded reads from file_path: disk bytes read, request
+bytes transferred and latency, both for the read step alone and end to end
+through /analyze-file with a zero-latency mock LLM.
+
+Usage: python benchmarks/bench_content_read.py [--iterations 200]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_reader import read_preview
+
+SIZES = {"4KB": 4 * 1024, "256KB": 256 * 1024, "8MB": 8 * 1024 * 1024, "40MB": 40 * 1024 * 1024}
+PREVIEW_CHARS = 2000
+
+
+def make_file(directory: str, label: str, size: int) -> str:
+    path = os.path.join(directory, f"document-{label}.txt")
+    line = "Quarterly invoice for consulting services rendered to Contoso Ltd — total due €12,500.\n"
+    with open(path, "w", encoding="utf-8") as handle:
+        written = 0
+        while written < size:
+            handle.write(line)
+            written += len(line.encode("utf-8"))
+    return path
+
+
+def base_request(path: str) -> dict:
+    return {
+        "file_path": path,
+        "original_name": os.path.basename(path),
+        "file_size": os.path.getsize(path),
+        "file_extension": ".txt",
+    }
+
+
+def client_side(path: str):
+    """What the desktop does today: readFileSync, decode, substring, JSON"""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    request = base_request(path)
+    request["content_preview"] = data.decode("utf-8", "replace")[:PREVIEW_CHARS]
+    payload = json.dumps(request).encode()
+    json.loads(payload)
+    return len(data), len(payload)
+
+
+def server_side(path: str):
+    request = base_request(path)
+    request["read_from_path"] = True
+    payload = json.dumps(request).encode()
+    received = json.loads(payload)
+    _, _, bytes_read = read_preview(received["file_path"], PREVIEW_CHARS)
+    return bytes_read, len(payload)
+
+
+def measure(fn, path: str, iterations: int):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        bytes_read, bytes_sent = fn(path)
+    return (time.perf_counter() - started) / iterations * 1000, bytes_read, bytes_sent
+
+
+def end_to_end(paths, iterations: int) -> None:
+    os.environ["SILENTSORT_MOCK_LLM"] = "true"
+    os.environ["MOCK_LLM_LATENCY_MS"] = "0"
+    os.environ.setdefault("LOG_ENABLED", "false")
+    from fastapi.testclient import TestClient
+    import main
+
+    print("\nend to end through /analyze-file (mock LLM, 0ms):")
+    with TestClient(main.app) as client:
+        for label, path in paths.items():
+            timings = {}
+            for mode in ("client", "server"):
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    if mode == "client":
+                        with open(path, "rb") as handle:
+                            preview = handle.read().decode("utf-8", "replace")[:PREVIEW_CHARS]
+                        body = {**base_request(path), "content_preview": preview}
+                    else:
+                        body = {**base_request(path), "read_from_path": True}
+                    client.post("/analyze-file", json=body).raise_for_status()
+                timings[mode] = (time.perf_counter() - started) / iterations * 1000
+            print(f"  {label:>6}: client preview {timings['client']:8.2f}ms   "
+                  f"server read {timings['server']:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--skip-e2e", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {label: make_file(tmp, label, size) for label, size in SIZES.items()}
+        print(f"{'file':>6} | {'path':<7} | {'latency':>10} | {'disk read':>12} | {'request body':>12}")
+        for label, path in paths.items():
+            iterations = max(5, args.iterations // (1 + os.path.getsize(path) // (1024 * 1024)))
+            for name, fn in (("client", client_side), ("server", server_side)):
+                latency, bytes_read, bytes_sent = measure(fn, path, iterations)
+                print(f"{label:>6} | {name:<7} | {latency:8.3f}ms | {bytes_read:>12,} | {bytes_sent:>12,}")
+
+        if not args.skip_e2e:
+            end_to_end(paths, max(5, args.iterations // 10))
+
+
+if __name__ == "__main__":
+    main()
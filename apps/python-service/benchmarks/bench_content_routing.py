@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Content routing benchmark
+Runs a mixed set of real files (text, images, archives, empty and near-empty
+files) through the service (mock LLM) with content routing off and on, and
+reports the share of traffic diverted from the LLM and the latency saved.
+
+Usage: python benchmarks/bench_content_routing.py [--files 300] [--latency-ms 50]
+"""
+
+import os
+import sys
+import time
+import random
+import zipfile
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Share of each kind in a typical Downloads folder
+MIX = [("text", 0.45), ("image", 0.3), ("archive", 0.1), ("empty", 0.05), ("trivial", 0.05), ("binary", 0.05)]
+WORDS = ["quarterly", "budget", "meeting", "notes", "invoice", "contract", "proposal", "roadmap", "summary"]
+
+
+def make_files(directory: str, count: int, rng: random.Random):
+    from PIL import Image
+
+    files = []
+    kinds = [kind for kind, _ in MIX]
+    weights = [share for _, share in MIX]
+    for i in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "image":
+            path = os.path.join(directory, f"IMG_{i:05d}.jpg")
+            exif = Image.Exif()
+            exif[0x0110] = "Bench Camera"
+            exif[0x0132] = f"2024:{rng.randint(1, 12):02d}:{rng.randint(1, 28):02d} 12:00:00"
+            Image.new("RGB", (64, 48), (i % 255, 0, 0)).save(path, exif=exif)
+        elif kind == "archive":
+            path = os.path.join(directory, f"backup-{i}.zip")
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.writestr("data.txt", "payload " * 50)
+        elif kind == "binary":
+            path = os.path.join(directory, f"blob-{i}.bin")
+            Path(path).write_bytes(rng.randbytes(4096))
+        else:
+            path = os.path.join(directory, f"doc-{i}.txt")
+            text = {"empty": "", "trivial": "todo"}.get(kind)
+            if text is None:
+                text = " ".join(rng.choices(WORDS, k=60))
+            Path(path).write_text(text)
+        files.append(path)
+    return files
+
+
+def run(client, files):
+    latencies = []
+    for path in files:
+        name = os.path.basename(path)
+        started = time.perf_counter()
+        client.post("/analyze-file", json={
+            "file_path": path,
+            "original_name": name,
+            "file_size": os.path.getsize(path),
+            "file_extension": os.path.splitext(name)[1],
+            "read_from_path": True,
+        }).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    corpus = os.path.join(tmp, "downloads")
+    os.makedirs(corpus)
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": str(args.latency_ms),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+        "SERVER_SIDE_READ": "true",
+        "SERVER_READ_ROOTS": tmp,
+    })
+    from fastapi.testclient import TestClient
+    import main as service
+
+    files = make_files(corpus, args.files, random.Random(41))
+    with TestClient(service.app) as client:
+        llm = service.workflow_instance._llm
+        router = service.workflow_instance.content_router
+
+        service.workflow_instance.content_router = None
+        calls = llm.calls
+        baseline = run(client, files)
+        baseline_calls = llm.calls - calls
+
+        service.workflow_instance.content_router = router
+        calls = llm.calls
+        routed = run(client, files)
+        routed_calls = llm.calls - calls
+        routing = client.get("/metrics").json()["content_routing"]
+
+    print(f"files:            {args.files} ({', '.join(f'{share:.0%} {kind}' for kind, share in MIX)})")
+    print(f"diverted:         {routing['diverted_fraction']:.1%} of requests ({routing['kinds']})")
+    print(f"LLM calls:        {baseline_calls} without routing, {routed_calls} with")
+    for label, values in (("without routing", baseline), ("with routing", routed)):
+        values = sorted(values)
+        print(f"{label:<17} median {statistics.median(values):6.1f}ms, p95 {values[int(len(values) * 0.95)]:6.1f}ms, "
+              f"total {sum(values) / 1000:5.1f}s")
+    print(f"mean per route:   {routing['mean_ms']} (estimated {routing['estimated_ms_saved'] / 1000:.1f}s saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Engine accuracy and latency harness
+Runs a labeled corpus (corpus_generator.py) through each engine's
+/analyze-file and reports category accuracy (against the fine labels and the
+coarse document/code taxonomy), entity-extraction accuracy, latency and
+cost. --report saves the numbers; --baseline compares against a saved
+report and exits non-zero when accuracy drops. Uses the mock LLM unless
+--live, so only the rules-based fields are meaningful offline.
+
+Usage: python benchmarks/bench_engines.py [--files 1000] [--corpus corpus/] [--engines rules,enhanced,...] [--report r.json] [--baseline r.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+# Engine -> (app file, calls OpenAI directly)
+ENGINES = {
+    "simple": ("simple-main.py", True),
+    "enhanced-simple": ("enhanced-simple-main.py", True),
+    "enhanced-rules": ("enhanced-main.py", False),  # Rules path only: the LLM budget is treated as spent
+    "enhanced": ("enhanced-main.py", False),
+    "langgraph": ("main.py", False),
+    "langgraph-v2": ("langgraph-main-v2.py", False),
+}
+DEFAULT_ENGINES = "simple,enhanced-simple,enhanced-rules,enhanced,langgraph"
+
+ENTITY_FIELDS = ["budget", "company", "invoice_number", "team_size", "deadline", "technology"]
+
+
+def load_app(app_file: str):
+    name = Path(app_file).stem.replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SERVICE_DIR / app_file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class TokenCountingClient:
+    """Wraps an OpenAI client to count tokens for engines that do not report usage themselves"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = inner.models
+
+    def _create(self, **kwargs):
+        response = self.inner.chat.completions.create(**kwargs)
+        if getattr(response, "usage", None):
+            self.input_tokens += response.usage.prompt_tokens
+            self.output_tokens += response.usage.completion_tokens
+        return response
+
+
+def normalize(field: str, value):
+    if not value:
+        return None
+    if field == "technology":
+        return frozenset(str(tech).lower() for tech in value)
+    if field in ("budget", "team_size"):
+        digits = "".join(ch for ch in str(value).split(".")[0] if ch.isdigit())
+        return int(digits) if digits else None
+    return str(value).strip().lower()
+
+
+def score_entities(expected, extracted, totals):
+    for field in ENTITY_FIELDS:
+        want = normalize(field, expected.get(field))
+        got = normalize(field, extracted.get(field))
+        field_totals = totals.setdefault(field, {"labeled": 0, "correct": 0, "spurious": 0})
+        if want is not None:
+            field_totals["labeled"] += 1
+            field_totals["correct"] += want == got
+        elif got is not None:
+            field_totals["spurious"] += 1
+
+
+def run_engine(engine, documents, live, usage):
+    app_file, direct_openai = ENGINES[engine]
+    module = load_app(app_file)
+    counter = None
+    if direct_openai:
+        from mock_llm import MockOpenAIClient
+
+        client = module.openai_client if live else MockOpenAIClient()
+        if client is None:
+            return None
+        counter = module.openai_client = TokenCountingClient(client)
+    if app_file == "enhanced-main.py":
+        module.usage_tracker.over_budget = (lambda: True) if engine == "enhanced-rules" else (lambda: False)
+
+    from fastapi.testclient import TestClient
+
+    latencies, categories, costs = [], {}, []
+    coarse_correct = errors = 0
+    entity_totals, per_category = {}, {}
+    with TestClient(module.app) as client:
+        for document in documents:
+            body = {
+                "file_path": f"/bench/engines/{engine}/{document['id']}/{document['original_name']}",
+                "original_name": document["original_name"],
+                "file_size": len(document["content"]),
+                "file_extension": document["file_extension"],
+                "content_preview": document["content"],
+            }
+            before = (counter.input_tokens, counter.output_tokens) if counter else None
+            started = time.perf_counter()
+            response = client.post("/analyze-file", json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+                continue
+            result = response.json()
+
+            category = result.get("category")
+            correct = category == document["category"]
+            categories[document["category"]] = categories.get(document["category"], 0) + correct
+            bucket = per_category.setdefault(document["category"], {})
+            bucket[category] = bucket.get(category, 0) + 1
+            coarse_correct += category in (document["category"], document["coarse_category"])
+            if result.get("extracted_entities") is not None:
+                score_entities(document["entities"], result["extracted_entities"], entity_totals)
+
+            if counter:
+                costs.append(usage.cost(counter.input_tokens - before[0], counter.output_tokens - before[1]))
+            elif result.get("usage"):
+                costs.append(result["usage"]["cost_usd"])
+
+    files = len(documents)
+    labeled = sum(field["labeled"] for field in entity_totals.values())
+    latencies.sort()
+    return {
+        "files": files,
+        "errors": errors,
+        "category_accuracy": round(sum(categories.values()) / files, 4),
+        "coarse_accuracy": round(coarse_correct / files, 4),
+        "entity_accuracy": round(sum(f["correct"] for f in entity_totals.values()) / labeled, 4) if labeled else None,
+        "spurious_entities_per_file": round(sum(f["spurious"] for f in entity_totals.values()) / files, 3)
+        if entity_totals else None,
+        "entities": entity_totals,
+        "confusion": per_category,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "cost_per_1k_files_usd": round(sum(costs) / files * 1000, 4) if costs else None,
+    }
+
+
+def percent(value):
+    return f"{value * 100:6.1f}%" if value is not None else "     - "
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--corpus", help="directory written by corpus_generator.py (default: generate in memory)")
+    parser.add_argument("--engines", default=DEFAULT_ENGINES, help=f"any of {','.join(ENGINES)}")
+    parser.add_argument("--latency-ms", type=float, default=0, help="mock LLM latency")
+    parser.add_argument("--live", action="store_true", help="call the configured LLM instead of the mock")
+    parser.add_argument("--details", action="store_true", help="per-field entity accuracy and category confusion")
+    parser.add_argument("--report", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare against a previous --report")
+    parser.add_argument("--tolerance", type=float, default=0.005, help="allowed accuracy drop vs the baseline")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "MOCK_LLM_LATENCY_MS": str(args.latency_ms),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    if not args.live:
+        os.environ["SILENTSORT_MOCK_LLM"] = "true"
+    from corpus_generator import generate_corpus, load_corpus
+    from usage_tracker import UsageTracker
+
+    documents = load_corpus(args.corpus) if args.corpus else generate_corpus(args.files, args.seed)
+    usage = UsageTracker.from_env()
+    print(f"{len(documents)} documents, {'live LLM' if args.live else f'mock LLM ({args.latency_ms:.0f}ms)'}")
+    print(f"{'engine':<16} {'category':>8} {'coarse':>8} {'entities':>8} {'spurious':>8} "
+          f"{'p50':>8} {'p95':>8} {'$/1k':>8} {'errors':>6}")
+
+    results = {}
+    for engine in args.engines.split(","):
+        result = run_engine(engine, documents, args.live, usage)
+        if result is None:
+            print(f"{engine:<16} skipped: no OpenAI client configured")
+            continue
+        results[engine] = result
+        spurious = result["spurious_entities_per_file"]
+        cost = result["cost_per_1k_files_usd"]
+        print(f"{engine:<16} {percent(result['category_accuracy']):>8} {percent(result['coarse_accuracy']):>8} "
+              f"{percent(result['entity_accuracy']):>8} {spurious if spurious is not None else '-':>8} "
+              f"{result['p50_ms']:>6.1f}ms {result['p95_ms']:>6.1f}ms "
+              f"{f'{cost:.4f}' if cost is not None else '-':>8} {result['errors']:>6d}")
+        if args.details:
+            for field, totals in result["entities"].items():
+                accuracy = totals["correct"] / totals["labeled"] if totals["labeled"] else None
+                print(f"  {field:<16} {percent(accuracy)} of {totals['labeled']} labeled, "
+                      f"{totals['spurious']} spurious")
+            for category, predicted in result["confusion"].items():
+                print(f"  {category:<16} -> {json.dumps(dict(sorted(predicted.items(), key=lambda i: -i[1])))}")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps({"files": len(documents), "engines": results}, indent=2))
+        print(f"report: {args.report}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["engines"]
+        regressions = []
+        for engine, result in results.items():
+            previous = baseline.get(engine)
+            if not previous:
+                continue
+            for metric in ("category_accuracy", "coarse_accuracy", "entity_accuracy"):
+                if result[metric] is not None and previous[metric] is not None \
+                        and result[metric] < previous[metric] - args.tolerance:
+                    regressions.append(f"{engine} {metric} {previous[metric]:.4f} -> {result[metric]:.4f}")
+            print(f"{engine:<16} p50 {previous['p50_ms']:.1f}ms -> {result['p50_ms']:.1f}ms")
+        if regressions:
+            print("❌ Accuracy regressed vs the baseline:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("✅ No accuracy regressions vs the baseline")
+
+
+if __name__ == "__main__":
+    main()
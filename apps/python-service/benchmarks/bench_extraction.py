@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Document extraction benchmark
+Generates a folder of mixed PDF/DOCX/XLSX documents and measures preview
+extraction throughput with 1..N pool processes, plus the cached (re-seen
+document) path.
+
+Usage: python benchmarks/bench_extraction.py [--documents 300] [--max-workers 8]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import zipfile
+import argparse
+import tempfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from document_extractors import DocumentExtractor
+
+PARAGRAPH = ("Invoice {n} from Contoso Ltd for cloud consulting services. Amount due $12,500 "
+             "by March 2025. Payment terms net 30. Project Phoenix quarterly review notes.")
+
+
+def write_pdf(path: str, pages: int, n: int) -> None:
+    """Minimal multi-page PDF with one text line per row"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = " ".join(f"(Page {page + 1} line {row}: {PARAGRAPH.format(n=n)}) Tj T*" for row in range(30))
+        stream = f"BT /F1 9 Tf 11 TL 40 800 Td {lines} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as handle:
+        handle.write(out)
+
+
+def write_docx(path: str, paragraphs: int, n: int) -> None:
+    body = "".join(f'<w:p><w:r><w:t>{escape(PARAGRAPH.format(n=n))} ({i})</w:t></w:r></w:p>'
+                   for i in range(paragraphs))
+    document = ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        archive.writestr("word/document.xml", document)
+
+
+def write_xlsx(path: str, sheets: int, rows: int, n: int) -> None:
+    ns = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    labels = ["Vendor", "Contoso Ltd", "Invoice", f"INV-{n}", "Amount", "Due"]
+    shared = "".join(f"<si><t>{label}</t></si>" for label in labels)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        archive.writestr("xl/sharedStrings.xml", f'<sst xmlns="{ns}">{shared}</sst>')
+        for sheet in range(1, sheets + 1):
+            data = "".join(
+                f'<row r="{r}"><c t="s"><v>{r % len(labels)}</v></c><c><v>{r * 12.5}</v></c>'
+                f'<c t="inlineStr"><is><t>row {r} of sheet {sheet}</t></is></c></row>'
+                for r in range(1, rows + 1)
+            )
+            archive.writestr(f"xl/worksheets/sheet{sheet}.xml",
+                             f'<worksheet xmlns="{ns}"><sheetData>{data}</sheetData></worksheet>')
+
+
+def make_corpus(directory: str, count: int):
+    paths = []
+    for n in range(count):
+        kind = n % 3
+        if kind == 0:
+            path = os.path.join(directory, f"doc-{n}.pdf")
+            write_pdf(path, pages=20, n=n)
+        elif kind == 1:
+            path = os.path.join(directory, f"doc-{n}.docx")
+            write_docx(path, paragraphs=2000, n=n)
+        else:
+            path = os.path.join(directory, f"doc-{n}.xlsx")
+            write_xlsx(path, sheets=10, rows=2000, n=n)
+        paths.append(path)
+    return paths
+
+
+async def run(paths, workers: int, warm: bool = False) -> float:
+    extractor = DocumentExtractor(workers=workers, cache_size=len(paths) * 2)
+    try:
+        # Spin the pool up before timing so process start-up is not counted;
+        # the warm run primes the cache with every document instead
+        await asyncio.gather(*(extractor.extract(p) for p in (paths if warm else paths[:workers])))
+        if not warm:
+            extractor._cache.clear()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(extractor.extract(p) for p in paths))
+        elapsed = time.perf_counter() - started
+        assert all(text for text, _ in results), "empty extraction"
+        return elapsed
+    finally:
+        extractor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(tmp, args.documents)
+        megabytes = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+        print(f"{len(paths)} documents ({megabytes:.1f}MB), {os.cpu_count()} CPUs")
+
+        workers = 1
+        while workers <= args.max_workers:
+            elapsed = asyncio.run(run(paths, workers))
+            print(f"  {workers:>2} workers: {len(paths) / elapsed:8.1f} docs/s")
+            workers *= 2
+
+        elapsed = asyncio.run(run(paths, 1, warm=True))
+        print(f"  cached   : {len(paths) / elapsed:8.1f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Fingerprint index benchmark
+Grows the index to millions of entries and measures lookup latency at each
+size (a hit on a real file, a fingerprint hit and a miss), showing lookups stay
+flat as the index grows.
+
+Usage: python benchmarks/bench_fingerprint_index.py [--sizes 10000,100000,1000000]
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fingerprint_index import FingerprintIndex, file_fingerprint
+
+RESULT = json.dumps({"suggested_name": "invoice-contoso-2025-03.pdf", "confidence": 0.9,
+                     "category": "financial", "reasoning": "bench", "processing_time_ms": 1200})
+
+
+async def grow(index: FingerprintIndex, start: int, stop: int) -> None:
+    now = time.time()
+    for chunk in range(start, stop, 50_000):
+        rows = [
+            (f"{n:x}-{n:032x}", "", f"/files/doc-{n}.pdf", RESULT, now)
+            for n in range(chunk, min(stop, chunk + 50_000))
+        ]
+        await index.db.executemany(
+            "INSERT INTO file_index (fingerprint, full_hash, file_path, result, updated_at) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        await index.db.commit()
+
+
+async def timed(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def run(sizes, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        index = FingerprintIndex(os.path.join(tmp, "index.db"))
+        await index.open()
+
+        sample = os.path.join(tmp, "sample.txt")
+        with open(sample, "w") as handle:
+            handle.write("Quarterly invoice for Contoso Ltd\n" * 20_000)
+        fingerprint = file_fingerprint(sample)
+        await index.record(sample, fingerprint, json.loads(RESULT))
+
+        print(f"{'entries':>10} | {'file lookup':>12} | {'fingerprint hit':>15} | {'miss':>8}")
+        indexed = 0
+        for size in sizes:
+            await grow(index, indexed, size)
+            indexed = size
+            keys = [f"{n:x}-{n:032x}" for n in random.sample(range(size), min(size, iterations))]
+            keys_iter = iter(keys * 2)
+
+            file_us = await timed(lambda: index.lookup(sample), iterations)
+            hit_us = await timed(lambda: index.lookup_fingerprint(next(keys_iter)), iterations)
+            miss_us = await timed(lambda: index.lookup_fingerprint("0-missing"), iterations)
+            print(f"{size:>10,} | {file_us:10.1f}us | {hit_us:13.1f}us | {miss_us:6.1f}us")
+
+        megabytes = os.path.getsize(os.path.join(tmp, "index.db")) / 1024 / 1024
+        print(f"database size: {megabytes:.1f}MB")
+        await index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run([int(s) for s in args.sizes.split(",")], args.iterations))
+
+
+if __name__ == "__main__":
+    main()
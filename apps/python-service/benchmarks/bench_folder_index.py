@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Folder index benchmark
+Builds a synthetic tree (default 100k folders, files in every 10th), then times
+the initial build, lookups, and incremental refreshes with and without changes.
+
+Usage: python benchmarks/bench_folder_index.py [--folders 100000] [--lookups 10000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from folder_index import FolderIndex
+
+NAMES = ["Invoices", "Receipts", "Contracts", "Reports", "Meeting-Notes", "Photos", "Projects", "Archive"]
+FILES = ["invoice-{}.pdf", "receipt-{}.jpg", "contract-{}.docx", "report-{}.xlsx", "notes-{}.md", "IMG_{}.png"]
+
+
+def build_tree(root: str, folders: int, fanout: int = 10) -> list:
+    """Breadth-first tree of `folders` directories; every 10th gets three files"""
+    created = [""]
+    queue = deque([""])
+    while len(created) < folders + 1:
+        parent = queue.popleft()
+        for i in range(fanout):
+            if len(created) > folders:
+                break
+            rel = f"{parent}/{NAMES[i % len(NAMES)]}-{len(created)}" if parent else f"{NAMES[i % len(NAMES)]}-{len(created)}"
+            os.mkdir(os.path.join(root, rel))
+            if len(created) % 10 == 0:
+                for j in range(3):
+                    open(os.path.join(root, rel, FILES[(len(created) + j) % len(FILES)].format(j)), "w").close()
+            created.append(rel)
+            queue.append(rel)
+    return created[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--folders", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        started = time.perf_counter()
+        created = build_tree(root, args.folders)
+        print(f"tree:     {len(created)} folders created in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        index = FolderIndex(root, max_depth=32).build()
+        print(f"build:    {(time.perf_counter() - started) * 1000:8.0f}ms ({len(index.folders)} folders)")
+
+        rng = random.Random(7)
+        candidates = [(f"Files/{rng.choice(NAMES)}", "invoice") for _ in range(args.lookups // 2)]
+        candidates += [(rng.choice(created), None) for _ in range(args.lookups // 4)]
+        candidates += [(f"Brand-New/Folder-{i}", "report") for i in range(args.lookups // 4)]
+        latencies = []
+        for candidate, category in candidates:
+            lookup_started = time.perf_counter()
+            index.find(candidate, category)
+            latencies.append((time.perf_counter() - lookup_started) * 1_000_000)
+        latencies.sort()
+        print(f"find:     p50 {statistics.median(latencies):6.1f}us  "
+              f"p99 {latencies[int(len(latencies) * 0.99)]:6.1f}us")
+
+        started = time.perf_counter()
+        rescanned = index.refresh()
+        print(f"refresh:  {(time.perf_counter() - started) * 1000:8.0f}ms no changes ({rescanned} rescanned)")
+
+        for rel in rng.sample(created, 20):
+            os.mkdir(os.path.join(root, rel, "New-Invoices"))
+        started = time.perf_counter()
+        rescanned = index.refresh()
+        print(f"refresh:  {(time.perf_counter() - started) * 1000:8.0f}ms after adding 20 folders "
+              f"({rescanned} rescanned, {len(index.folders)} indexed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+File grouping benchmark
+Indexes a generated corpus (corpus_generator.py) into FileGrouper, clusters
+it cold, adds a batch of new files and clusters again (warm start, no
+rebuild of what was indexed), and reports timings and how pure the groups
+are with respect to the corpus categories.
+
+Usage: python benchmarks/bench_grouping.py [--files 50000] [--new 1000] [--k 0]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def purity(result, labels) -> float:
+    """Fraction of grouped files whose group's most common category is their own"""
+    grouped = sum(group["size"] for group in result["groups"])
+    majority = sum(Counter(labels[path] for path in group["files"]).most_common(1)[0][1]
+                   for group in result["groups"])
+    return majority / grouped if grouped else 0.0
+
+
+async def run(args):
+    from corpus_generator import generate_corpus
+    from file_grouping import FileGrouper
+
+    documents = generate_corpus(args.files + args.new, args.seed)
+    labels = {f"/bench/grouping/{doc['id']}/{doc['original_name']}": doc["category"] for doc in documents}
+    paths = list(labels)
+    grouper = FileGrouper()
+
+    started = time.perf_counter()
+    for path, doc in zip(paths[:args.files], documents[:args.files]):
+        grouper.add(path, doc["original_name"], doc["content"])
+    indexed = time.perf_counter() - started
+    print(f"indexed {args.files} files in {indexed:.2f}s ({args.files / indexed:,.0f} files/s), "
+          f"{len(grouper.terms)} terms")
+
+    k = args.k or None
+    result = await grouper.group(k=k)
+    print(f"cold      {result['elapsed_ms']:>6d}ms  {result['clusters']} clusters, {len(result['groups'])} groups, "
+          f"{len(result['ungrouped'])} ungrouped, purity {purity(result, labels):.3f}  (includes numpy/scipy import)")
+    result = await grouper.group(k=k)
+    print(f"repeat    {0 if result['cached'] else result['elapsed_ms']:>6d}ms  cached={result['cached']}")
+
+    started = time.perf_counter()
+    for path, doc in zip(paths[args.files:], documents[args.files:]):
+        grouper.add(path, doc["original_name"], doc["content"])
+    added_ms = (time.perf_counter() - started) * 1000
+    result = await grouper.group(k=k)
+    print(f"+{args.new:<8} {result['elapsed_ms']:>6d}ms  (adding took {added_ms:.0f}ms), "
+          f"{len(result['groups'])} groups, purity {purity(result, labels):.3f}")
+    for group in result["groups"][:args.show]:
+        print(f"  {group['label']:<40} {group['size']:>6d} files  cohesion {group['cohesion']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=50_000)
+    parser.add_argument("--new", type=int, default=1000, help="files added after the first grouping")
+    parser.add_argument("--k", type=int, default=0, help="clusters (default sqrt(files / 2))")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--show", type=int, default=10, help="largest groups to print")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Job queue benchmark
+Runs a synthetic organization job through the LangGraph workflow backed by the
+mock LLM and reports job throughput, then interrupts a second job half way,
+restarts the workers on the same database and reports resume time.
+
+Usage: python benchmarks/bench_jobs.py [--files 2000] [--workers 16] [--latency-ms 50]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_files(count: int, offset: int = 0):
+    return [
+        {
+            "file_path": f"/bench/file-{offset + i}.txt",
+            "original_name": f"file-{offset + i}.txt",
+            "file_size": 1024,
+            "file_extension": ".txt",
+            "content_preview": f"Invoice #{offset + i} for consulting services",
+        }
+        for i in range(count)
+    ]
+
+
+async def wait_for_job(store, job_id: str) -> dict:
+    while True:
+        status = await store.job_status(job_id)
+        if status["status"] in ("completed", "cancelled"):
+            return status
+        await asyncio.sleep(0.05)
+
+
+async def run(args, db_path: str) -> None:
+    import main
+    from jobs import JobManager, JobStore
+
+    def manager() -> JobManager:
+        return JobManager(JobStore(db_path), main.analyze_job_item, workers=args.workers)
+
+    # Throughput
+    jobs = manager()
+    await jobs.start()
+    started = time.perf_counter()
+    job_id, total, _ = await jobs.submit(make_files(args.files))
+    await wait_for_job(jobs.store, job_id)
+    elapsed = time.perf_counter() - started
+    print(f"throughput: {total} files in {elapsed:.2f}s -> {total / elapsed:.1f} files/s "
+          f"({args.workers} workers, {args.latency_ms}ms mock latency)")
+
+    # Interrupt half way, then resume on the same database
+    job_id, total, _ = await jobs.submit(make_files(args.files, offset=args.files))
+    while (await jobs.store.job_status(job_id))["counts"]["done"] < total // 2:
+        await asyncio.sleep(0.05)
+    await jobs.stop()
+    done_before = (await _status(db_path, job_id))["counts"]["done"]
+
+    restarted = time.perf_counter()
+    jobs = manager()
+    await jobs.start()
+    resume_ms = (time.perf_counter() - restarted) * 1000
+    while (await jobs.store.job_status(job_id))["counts"]["done"] <= done_before:
+        await asyncio.sleep(0.005)
+    first_result_ms = (time.perf_counter() - restarted) * 1000
+    status = await wait_for_job(jobs.store, job_id)
+    remaining_s = time.perf_counter() - restarted
+    await jobs.stop()
+
+    print(f"resume: {done_before}/{total} done before restart, workers resumed in {resume_ms:.1f}ms, "
+          f"first new result after {first_result_ms:.1f}ms, remaining {total - done_before} "
+          f"finished in {remaining_s:.2f}s, final status {status['status']}")
+
+
+async def _status(db_path: str, job_id: str) -> dict:
+    from jobs import JobStore
+    store = JobStore(db_path)
+    await store.open()
+    try:
+        return await store.job_status(job_id)
+    finally:
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    os.environ["SILENTSORT_MOCK_LLM"] = "true"
+    os.environ["MOCK_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ.setdefault("LOG_ENABLED", "false")
+    # Let the benchmark's workers, not admission control, set the concurrency
+    os.environ.setdefault("ADMISSION_MAX_CONCURRENCY", str(args.workers))
+    os.environ.setdefault("ADMISSION_BACKGROUND_MAX_CONCURRENCY", str(args.workers))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(args, os.path.join(tmp, "jobs.db")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Logging overhead benchmark
+Measures the per-request cost of the log lines emitted by one /analyze-file call
+with logging off, with the legacy synchronous file sink, and with the queued
+structured sinks from service_logging.
+
+Usage: python benchmarks/bench_logging.py [--requests 20000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+
+import service_logging
+
+NODES = ["load_state", "content_analysis", "parallel_processing", "decision_routing",
+         "human_approval", "finalize_result"]
+
+
+def legacy_request(i: int) -> None:
+    """Log lines as main.py emitted them before structured logging"""
+    for node in NODES:
+        logger.info(f"🚀 {node} for file: document-{i}.pdf")
+
+
+def structured_request(i: int) -> None:
+    """Log lines as main.py emits them now"""
+    with logger.contextualize(workflow_id=f"workflow_{i}"):
+        for node in NODES:
+            logger.debug("🚀 {node} for file: {file}", node=node, file=f"document-{i}.pdf")
+        service_logging.sampled().info("Analyzed {file} in {processing_time_ms}ms",
+                                       file=f"document-{i}.pdf", processing_time_ms=1200)
+
+
+def run(label: str, fn, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    per_request_us = elapsed / requests * 1_000_000
+    print(f"{label:<28} {per_request_us:8.2f} µs/request")
+    return per_request_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["LOG_FILE"] = os.path.join(tmp, "bench.log")
+        os.environ["LOG_CONSOLE"] = "false"
+
+        logger.remove()
+        baseline = run("logging off", structured_request, args.requests)
+
+        logger.remove()
+        logger.add(os.path.join(tmp, "legacy.log"), rotation="10 MB", level="INFO")
+        legacy = run("legacy sync INFO sink", legacy_request, args.requests)
+
+        service_logging.configure_logging("bench")
+        structured = run("queued JSON sink (INFO)", structured_request, args.requests)
+        logger.complete()
+
+        os.environ["LOG_LEVEL"] = "debug"
+        service_logging.configure_logging("bench")
+        debug = run("queued JSON sink (DEBUG)", structured_request, args.requests)
+        logger.complete()
+        logger.remove()
+
+    print()
+    print(f"legacy overhead:     {legacy - baseline:8.2f} µs/request")
+    print(f"structured overhead: {structured - baseline:8.2f} µs/request")
+    print(f"debug overhead:      {debug - baseline:8.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
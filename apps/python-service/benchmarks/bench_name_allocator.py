@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Name allocator benchmark
+Allocates 100k names into one directory for three name distributions (all
+identical, a few hundred distinct, all distinct), checks every result is
+unique and compares the cost of the first and last 10% of allocations,
+which stays flat when allocation is O(1).
+
+Usage: python benchmarks/bench_name_allocator.py [--names 100000] [--existing 1000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from name_allocator import NameAllocator
+
+ENTITIES = ["acme", "globex", "initech", "umbrella", None]
+
+
+def distributions(n: int):
+    rng = random.Random(11)
+    yield "identical", ["invoice.pdf"] * n
+    yield "300 distinct", [f"report-{rng.randrange(300)}.pdf" for _ in range(n)]
+    yield "all distinct", [f"scan-{i}.pdf" for i in range(n)]
+
+
+def run(directory: str, names, entities: bool) -> dict:
+    allocator = NameAllocator()
+    rng = random.Random(5)
+    tenth = max(1, len(names) // 10)
+    allocated = []
+    started = time.perf_counter()
+    first_tenth = 0.0
+    for i, name in enumerate(names):
+        if i == tenth:
+            first_tenth = time.perf_counter() - started
+        if i == len(names) - tenth:
+            last_started = time.perf_counter()
+        entity = rng.choice(ENTITIES) if entities else None
+        allocated.append(allocator.allocate(directory, name, source=os.path.join(directory, f"src-{i}"),
+                                            entity=entity))
+    total = time.perf_counter() - started
+    last_tenth = time.perf_counter() - last_started
+    unique = len({name.lower() for name in allocated}) == len(allocated)
+    return {"total_s": total, "per_name_us": total / len(names) * 1e6,
+            "first_us": first_tenth / tenth * 1e6, "last_us": last_tenth / tenth * 1e6,
+            "unique": unique, "collisions": allocator.collisions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--existing", type=int, default=1000, help="files already in the directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(args.existing):
+            open(os.path.join(directory, "invoice.pdf" if i == 0 else f"invoice-{i + 1}.pdf"), "w").close()
+
+        print(f"{'names':<13} | {'entities':>8} | {'total':>7} | {'per name':>9} | "
+              f"{'first 10%':>9} | {'last 10%':>9} | {'collisions':>10} | unique")
+        for label, names in distributions(args.names):
+            for entities in (False, True):
+                r = run(directory, names, entities)
+                print(f"{label:<13} | {'yes' if entities else 'no':>8} | {r['total_s']:6.2f}s | "
+                      f"{r['per_name_us']:7.1f}us | {r['first_us']:7.1f}us | {r['last_us']:7.1f}us | "
+                      f"{r['collisions']:>10} | {'✅' if r['unique'] else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
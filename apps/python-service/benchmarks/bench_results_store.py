@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Results store benchmark
+Measures what the columnar results store costs a request: record() alone,
+then /analyze-file latency with the store on and off (alternating blocks,
+with flushes happening during the run). Then writes --rows synthetic
+results and compares bytes per row against one SQLite row per result, and
+times exports of all columns and of two.
+
+Usage: python benchmarks/bench_results_store.py [--files 2000] [--rows 200000]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def synthetic_row(i: int) -> dict:
+    categories = ["document", "code", "image", "data", "media", "other"]
+    sources = ["llm", "llm", "llm", "metadata", "learned_pattern", "rules", "fingerprint_index"]
+    return {
+        "workflow_id": f"workflow_{1700000000 + i // 50}_{i % 10000}",
+        "original_name": f"scan-{i:07d}.pdf",
+        "file_extension": ".pdf",
+        "file_size": random.randint(1_000, 5_000_000),
+        "suggested_name": f"invoice-acme-corp-{i % 365:03d}-2025.pdf",
+        "category": random.choice(categories),
+        "confidence": round(random.uniform(0.4, 0.98), 2),
+        "source": random.choice(sources),
+        "route": "llm",
+        "processing_time_ms": random.randint(5, 4000),
+        "llm_calls": 3,
+        "input_tokens": random.randint(200, 900),
+        "output_tokens": random.randint(50, 300),
+        "cost_usd": round(random.uniform(0.0001, 0.0008), 6),
+        "topics": '["invoice", "finance"]',
+        "entities": None,
+    }
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)]
+
+
+def request_latency(files: int, block: int):
+    from fastapi.testclient import TestClient
+    import main as service
+
+    store = service.result_store
+    store.flush_batch = 200  # Flush often so writes overlap with requests
+    latencies = {"on": [], "off": []}
+    with TestClient(service.app) as client:
+        for i in range(100):  # Warm-up, not measured
+            client.post("/analyze-file", json={"file_path": f"/bench/results/warmup-{i}.txt",
+                                               "original_name": f"warmup-{i}.txt", "file_size": 0,
+                                               "file_extension": ".txt", "content_preview": "Warm-up invoice"})
+        for start in range(0, files, block):
+            mode = "on" if (start // block) % 2 == 0 else "off"
+            service.result_store = store if mode == "on" else None
+            for i in range(start, min(start + block, files)):
+                body = {"file_path": f"/bench/results/file-{i}.txt", "original_name": f"file-{i}.txt",
+                        "file_size": 2048, "file_extension": ".txt",
+                        "content_preview": f"Invoice INV-{i} from Acme Corp, amount due $1,200.00"}
+                started = time.perf_counter()
+                client.post("/analyze-file", json=body)
+                latencies[mode].append((time.perf_counter() - started) * 1000)
+        service.result_store = store
+        flushes = store.stats["flushes"]
+    return latencies, flushes
+
+
+async def storage(rows: int, directory: str):
+    from results_store import COLUMNS, ResultStore
+
+    store = ResultStore(os.path.join(directory, "columnar.db"), flush_seconds=3600, flush_batch=rows + 1)
+    await store.open()
+    data = [synthetic_row(i) for i in range(rows)]
+    started = time.perf_counter()
+    for start in range(0, rows, 2000):
+        for row in data[start:start + 2000]:
+            store.record(row)
+        await store.flush()
+    write_seconds = time.perf_counter() - started
+
+    timings = {}
+    for label, columns in (("all columns", list(COLUMNS)), ("category,cost_usd", ["category", "cost_usd"])):
+        for format in ("ndjson", "parquet"):
+            from results_store import PYARROW_AVAILABLE
+            if format == "parquet" and not PYARROW_AVAILABLE:
+                continue
+            started = time.perf_counter()
+            size = 0
+            async for chunk in store.export(format, columns):
+                size += len(chunk)
+            timings[f"{format} {label}"] = (time.perf_counter() - started, size)
+    await store.close()
+
+    # The same rows one per SQLite row, for comparison
+    row_path = os.path.join(directory, "rows.db")
+    db = sqlite3.connect(row_path)
+    db.execute(f"CREATE TABLE results ({', '.join(COLUMNS)})")
+    db.executemany(f"INSERT INTO results VALUES ({','.join('?' * len(COLUMNS))})",
+                   [(time.time(), *(row.get(name) for name in list(COLUMNS)[1:])) for row in data])
+    db.commit()
+    db.execute("VACUUM")
+    db.close()
+    return write_seconds, timings, os.path.getsize(os.path.join(directory, "columnar.db")), os.path.getsize(row_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--block", type=int, default=10, help="requests per on/off block")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": "0",
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "RESULTS_STORE_PATH": os.path.join(tmp, "results.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    from results_store import ResultStore
+
+    store = ResultStore(os.path.join(tmp, "record.db"))
+    row = synthetic_row(0)
+    started = time.perf_counter()
+    for _ in range(200_000):
+        store.record(row)
+    print(f"record(): {(time.perf_counter() - started) / 200_000 * 1e6:.2f}µs per result")
+
+    latencies, flushes = request_latency(args.files, args.block)
+    print(f"/analyze-file over {args.files} requests ({flushes} flushes during the run):")
+    for mode in ("off", "on"):
+        values = latencies[mode]
+        print(f"  store {mode:<3}  p50 {statistics.median(values):6.2f}ms  p95 {percentile(values, 0.95):6.2f}ms  "
+              f"p99 {percentile(values, 0.99):6.2f}ms")
+
+    write_seconds, timings, columnar_bytes, row_bytes = asyncio.run(storage(args.rows, tmp))
+    print(f"{args.rows} rows written in {write_seconds:.2f}s ({args.rows / write_seconds:,.0f} rows/s)")
+    print(f"  columnar {columnar_bytes / args.rows:6.1f} bytes/row, one row per result {row_bytes / args.rows:6.1f} bytes/row")
+    for label, (seconds, size) in timings.items():
+        print(f"  export {label:<28} {seconds:6.2f}s  {args.rows / seconds:>10,.0f} rows/s  {size / 1e6:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Retry benchmark
+Runs files through the workflow (mock LLM failing a fraction of calls) with
+and without stage retries, and reports the fallback rate, LLM calls and
+wasted LLM calls per request, and latency.
+
+Usage: python benchmarks/bench_retry.py [--files 300] [--failure-rates 0.05,0.1,0.3] [--latency-ms 20]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--failure-rates", default="0.05,0.1,0.3")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--base-ms", type=float, default=20, help="backoff base delay")
+    parser.add_argument("--budget-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": str(args.latency_ms),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_PATH": os.path.join(tmp, "index.db"),
+        "USER_PATTERNS_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    from fastapi.testclient import TestClient
+    import main as service
+    from retry_policy import RetryPolicy
+
+    rng = random.Random(40)
+    print(f"{'failure':>7} {'retries':>7} {'fallback':>9} {'llm/req':>8} {'wasted/req':>10} "
+          f"{'retries/req':>11} {'p50 ms':>7} {'p95 ms':>7}")
+    with TestClient(service.app) as client:
+        llm = service.workflow_instance._llm
+        for failure_rate in (float(rate) for rate in args.failure_rates.split(",")):
+            for max_retries in (0, args.max_retries):
+                llm.failure_rate = failure_rate
+                service.workflow_instance.retry_policy = RetryPolicy(
+                    max_retries=max_retries, base_delay_ms=args.base_ms,
+                    max_delay_ms=args.base_ms * 10, budget_ratio=args.budget_ratio,
+                )
+                for key in service.workflow_stats:
+                    service.workflow_stats[key] = 0
+
+                latencies = []
+                for i in range(args.files):
+                    name = f"report-{rng.randint(0, 10**9)}.pdf"
+                    started = time.perf_counter()
+                    client.post("/analyze-file", json={
+                        "file_path": f"/bench/retry/{name}",
+                        "original_name": name,
+                        "file_size": 2048,
+                        "file_extension": ".pdf",
+                        "content_preview": "Quarterly report for " + name,
+                    }).raise_for_status()
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+                workflow = client.get("/metrics").json()["workflow"]
+                latencies.sort()
+                print(f"{failure_rate:>7.0%} {max_retries:>7d} {workflow['fallback_rate']:>9.1%} "
+                      f"{workflow['llm_calls'] / args.files:>8.2f} {workflow['wasted_llm_calls_per_request']:>10.2f} "
+                      f"{workflow['retries_per_request']:>11.2f} {statistics.median(latencies):>7.1f} "
+                      f"{latencies[int(len(latencies) * 0.95)]:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark
+Profiles each service app in a fresh interpreter with startup_profiler.py,
+compares against the previous reports and exits non-zero when a cold start
+(imports + app construction + startup + ready + first request) exceeds the budget.
+
+Usage: python benchmarks/bench_startup.py [--budget-ms 5000] [--report-dir startup-reports]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from startup_profiler import run_profile
+
+# App file -> endpoint timed as the first request
+APPS = {
+    "main.py": "/analyze-file",
+    "langgraph-main-v2.py": "/analyze-file",
+    "enhanced-main.py": "/health",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "5000")))
+    parser.add_argument("--report-dir", default="startup-reports")
+    parser.add_argument("--apps", default=",".join(APPS))
+    args = parser.parse_args()
+
+    report_dir = Path(args.report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+
+    over_budget = []
+    print(f"{'app':<22} | {'imports':>9} | {'construct':>9} | {'ready':>7} | {'first req':>9} | "
+          f"{'cold start':>10} | {'vs last':>8}")
+    for app in args.apps.split(","):
+        report = run_profile(app, APPS.get(app, "/health"))
+        path = report_dir / f"{Path(app).stem}.json"
+        previous = json.loads(path.read_text()) if path.exists() else None
+        path.write_text(json.dumps(report, indent=2))
+
+        delta = f"{report['cold_start_ms'] - previous['cold_start_ms']:+7.0f}ms" if previous else "       -"
+        print(f"{app:<22} | {report['imports']['total_ms']:7.0f}ms | {report['app_construction_ms']:7.0f}ms | "
+              f"{report['ready_ms']:5.0f}ms | {report['first_request_ms']:7.1f}ms | "
+              f"{report['cold_start_ms']:8.0f}ms | {delta}")
+        if report["cold_start_ms"] > args.budget_ms:
+            over_budget.append(app)
+
+    print(f"reports: {report_dir}/")
+    if over_budget:
+        print(f"❌ Over the {args.budget_ms:.0f}ms cold-start budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print(f"✅ All apps within the {args.budget_ms:.0f}ms cold-start budget")
+
+
+if __name__ == "__main__":
+    main()
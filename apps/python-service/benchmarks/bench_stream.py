@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+NDJSON streaming ingest benchmark
+Starts the service under uvicorn (mock LLM) and sends the same files once as
+individual /analyze-file POSTs over a pool of keep-alive connections and once
+as a single /analyze-stream request whose body is generated on the fly, at
+the same concurrency. Reports files/s for both and the server's peak RSS
+after each; streaming should add nothing on top of what the per-file run
+uses, however large --files is.
+
+Usage: python benchmarks/bench_stream.py [--files 100000] [--concurrency 32] [--latency-ms 0]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+import httpx
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+
+def record(i: int) -> dict:
+    return {
+        "file_path": f"/bench/stream/file-{i}.txt",
+        "original_name": f"file-{i}.txt",
+        "file_size": 512,
+        "file_extension": ".txt",
+        "content_preview": f"Invoice INV-{i} from Acme Corp, amount due ${i % 900 + 100}.00, payable by March 2025.",
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb(pid: int):
+    """Peak resident memory of the server (Linux only)"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_server(port: int, latency_ms: float) -> subprocess.Popen:
+    tmp = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "RELOAD": "false",
+        "PORT": str(port),
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": str(latency_ms),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+        "BATCH_MAX_CONCURRENCY": "1024",
+        # Per-file requests run in the interactive lane and streamed files in the background lane;
+        # give both enough slots that --concurrency alone limits them
+        "ADMISSION_MAX_CONCURRENCY": "1024",
+        "ADMISSION_BACKGROUND_MAX_CONCURRENCY": "1024",
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=SERVICE_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("service did not become ready")
+
+
+async def per_file(base_url: str, files: int, concurrency: int) -> int:
+    """Each file as its own POST, `concurrency` requests in flight"""
+    errors = 0
+    pending = iter(range(files))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=None) as client:
+        async def worker():
+            nonlocal errors
+            for i in pending:
+                response = await client.post("/analyze-file", json=record(i))
+                errors += response.status_code != 200
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return errors
+
+
+async def streamed(base_url: str, files: int, concurrency: int) -> int:
+    """All files in one NDJSON request, body generated while it is sent"""
+    async def body():
+        for i in range(files):
+            yield (json.dumps(record(i)) + "\n").encode()
+
+    results = errors = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        async with client.stream("POST", "/analyze-stream", content=body(),
+                                 params={"max_concurrency": concurrency},
+                                 headers={"Content-Type": "application/x-ndjson"}) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["type"] == "summary":
+                    continue
+                results += 1
+                errors += event["type"] == "error"
+    return errors + (files - results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=0, help="mock LLM latency")
+    args = parser.parse_args()
+
+    print(f"{args.files} files, concurrency {args.concurrency}, mock LLM {args.latency_ms:.0f}ms")
+    print(f"{'mode':<10} {'seconds':>8} {'files/s':>9} {'errors':>7} {'peak RSS':>9}")
+    for mode, run in (("per-file", per_file), ("stream", streamed)):
+        # A fresh server per mode so peak RSS belongs to that mode alone
+        port = free_port()
+        server = start_server(port, args.latency_ms)
+        try:
+            started = time.perf_counter()
+            errors = asyncio.run(run(f"http://127.0.0.1:{port}", args.files, args.concurrency))
+            elapsed = time.perf_counter() - started
+            rss = peak_rss_mb(server.pid)
+            print(f"{mode:<10} {elapsed:>8.1f} {args.files / elapsed:>9.0f} {errors:>7d} "
+                  f"{f'{rss:.0f}MB' if rss is not None else '-':>9}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Token usage benchmark
+Runs files through the main workflow (mock LLM, which reports token usage
+like the OpenAI integration) and prints tokens and cost per file for each
+node, then sets a daily budget worth half the run and checks that the
+service switches to the rules engine once it is spent.
+
+Usage: python benchmarks/bench_usage.py [--files 200]
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def requests(count: int, prefix: str):
+    topics = ["invoice from Acme Corp, amount due $1,200.00", "meeting notes for the design review",
+              "quarterly revenue report for the finance team", "employment contract for a senior engineer"]
+    return [{
+        "file_path": f"/bench/usage/{prefix}/file-{i}.txt",
+        "original_name": f"file-{i}.txt",
+        "file_size": 2048,
+        "file_extension": ".txt",
+        "content_preview": f"This document is a {topics[i % len(topics)]} (#{i}). " * 4,
+    } for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": "0",
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_ENABLED": "false",
+        "USER_PATTERNS_ENABLED": "false",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    from fastapi.testclient import TestClient
+    import main as service
+
+    with TestClient(service.app) as client:
+        usage = service.workflow_instance.usage
+        for body in requests(args.files, "unlimited"):
+            client.post("/analyze-file", json=body)
+
+        engine = usage.metrics()["engines"]["langgraph"]
+        print(f"{args.files} files at ${usage.input_price}/${usage.output_price} per M input/output tokens")
+        print(f"{'node':<16} {'calls':>6} {'in tok/file':>12} {'out tok/file':>13} {'$/1k files':>11}")
+        for node, totals in engine["nodes"].items():
+            print(f"{node:<16} {totals['calls']:>6d} {totals['input_tokens'] / args.files:>12.1f} "
+                  f"{totals['output_tokens'] / args.files:>13.1f} {totals['cost_usd'] / args.files * 1000:>11.4f}")
+        print(f"{'total':<16} {engine['calls']:>6d} {engine['input_tokens'] / args.files:>12.1f} "
+              f"{engine['output_tokens'] / args.files:>13.1f} {engine['cost_usd'] / args.files * 1000:>11.4f}"
+              f"   ({engine['requests_per_usd']:.0f} files per $)")
+
+        # A budget worth half of a second run on top of today's spend
+        usage.daily_budget_usd = usage.spent_today() + engine["cost_usd"] / 2
+        sources = {"langgraph": 0, "rules": 0}
+        for body in requests(args.files, "budget"):
+            sources[client.post("/analyze-file", json=body).json()["usage"]["engine"]] += 1
+        print(f"budget ${usage.daily_budget_usd:.4f}: {sources['langgraph']} files by the LLM, "
+              f"{sources['rules']} by the rules engine, spent ${usage.spent_today():.4f}")
+
+
+if __name__ == "__main__":
+    main()
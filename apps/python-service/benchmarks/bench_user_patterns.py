@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+User pattern benchmark
+Replays a stream of files through the service (mock LLM) while a simulated
+user renames recurring kinds of files by a fixed rule and sends /feedback,
+then reports how many requests became LLM-free and what they cost.
+
+Usage: python benchmarks/bench_user_patterns.py [--files 600] [--recurring 0.7] [--latency-ms 50]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Recurring file kinds: original name generator and the name the user always gives such files
+RECURRING = [
+    (lambda r: f"IMG_{r.randint(1000, 9999)}.jpg", lambda n: "photo-" + n[4:8] + ".jpg", "image", "Pictures/Camera"),
+    (lambda r: f"Screenshot 2024-{r.randint(1, 12):02d}-{r.randint(1, 28):02d} at {r.randint(10, 23)}.{r.randint(10, 59)}.{r.randint(10, 59)}.png",
+     lambda n: "screenshot-" + n[11:21] + ".png", "image", "Pictures/Screenshots"),
+    (lambda r: f"invoice_{r.randint(10000, 99999)}.pdf", lambda n: "invoice-" + n[8:13] + ".pdf", "document", "Finance/Invoices"),
+    (lambda r: f"scan{r.randint(100, 999)}.pdf", lambda n: "scanned-document-" + n[4:7] + ".pdf", "document", "Scans"),
+]
+RECURRING_MIN_SUPPORT = int(os.getenv("USER_PATTERNS_MIN_SUPPORT", "3"))
+ONE_OFF_WORDS = ["notes", "draft", "budget", "slides", "proposal", "agenda", "summary", "plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=600)
+    parser.add_argument("--recurring", type=float, default=0.7, help="share of files of a recurring kind")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": str(args.latency_ms),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_PATH": os.path.join(tmp, "index.db"),
+        "USER_PATTERNS_PATH": os.path.join(tmp, "patterns.db"),
+        "WARMUP_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    from fastapi.testclient import TestClient
+    import main as service
+
+    rng = random.Random(21)
+    latencies = {"llm": [], "learned_pattern": []}
+    window = []  # 1 when LLM-free, per request
+    recurring_free = []  # Same, recurring kinds only
+    with TestClient(service.app) as client:
+        llm = service.workflow_instance._llm
+        for i in range(args.files):
+            if rng.random() < args.recurring:
+                make, rename, category, folder = rng.choice(RECURRING)
+                original = make(rng)
+                accepted = rename(original)
+            else:
+                tag = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6))
+                original = f"{rng.choice(ONE_OFF_WORDS)}-{tag}.txt"  # Never the same shape twice
+                accepted, category, folder = None, "document", "Documents"
+            body = {
+                "file_path": f"/bench/inbox/{i}/{original}",
+                "original_name": original,
+                "file_size": 2048,
+                "file_extension": os.path.splitext(original)[1],
+                "content_preview": "Sample content for " + original,
+            }
+            started = time.perf_counter()
+            result = client.post("/analyze-file", json=body).json()
+            elapsed = (time.perf_counter() - started) * 1000
+            source = "learned_pattern" if result["from_pattern"] else "llm"
+            latencies[source].append(elapsed)
+            window.append(source != "llm")
+            if accepted:
+                recurring_free.append(source != "llm")
+
+            client.post("/feedback", json={
+                "original_name": original,
+                "suggested_name": result["suggested_name"],
+                "accepted_name": accepted or result["suggested_name"],
+                "category": category,
+                "chosen_folder": folder,
+            }).raise_for_status()
+
+        metrics = client.get("/metrics").json()
+
+    half = len(window) // 2
+    print(f"requests:           {args.files} ({args.recurring:.0%} of a recurring kind)")
+    print(f"LLM-free overall:   {metrics['analysis_sources']['llm_free_fraction']:.1%}")
+    print(f"LLM-free 2nd half:  {sum(window[half:]) / max(1, len(window) - half):.1%}")
+    print(f"LLM-free recurring: {sum(recurring_free) / max(1, len(recurring_free)):.1%} "
+          f"(the first {RECURRING_MIN_SUPPORT} of each kind teach the pattern)")
+    print(f"LLM calls:          {llm.calls} (vs {args.files * 3} without learned patterns)")
+    for source, values in latencies.items():
+        if values:
+            print(f"{source:<19} {len(values):5d} requests, median {statistics.median(values):7.1f}ms")
+    print(f"patterns:           {metrics['patterns']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+v2 workflow state benchmark
+Runs files through langgraph-main-v2's /analyze-file handler (mock LLM) with
+slim state off and on, and reports per-request allocations (tracemalloc),
+checkpoint bytes written per request and memory still held afterwards.
+
+Usage: python benchmarks/bench_v2_state.py [--files 200]
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+import importlib.util
+import statistics
+import tracemalloc
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+
+def load_v2():
+    spec = importlib.util.spec_from_file_location("langgraph_main_v2", SERVICE_DIR / "langgraph-main-v2.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def thread_bytes(saver, thread_id: str) -> int:
+    """Serialized size of everything a MemorySaver holds for one thread"""
+    total = 0
+    for checkpoints in saver.storage.get(thread_id, {}).values():
+        for checkpoint, metadata, _ in checkpoints.values():
+            total += len(checkpoint[1]) + len(metadata[1])
+    total += sum(len(blob[1]) for key, blob in saver.blobs.items() if key[0] == thread_id)
+    for key, writes in saver.writes.items():
+        if key[0] == thread_id:
+            total += sum(len(write[2][1]) for write in writes.values())
+    return total
+
+
+async def run(v2, slim: bool, files: int):
+    v2.workflow_instance = v2.SilentSortWorkflow(slim_state=slim)
+    workflow = v2.workflow_instance
+    sizes = []
+    release = workflow.release
+
+    def measured_release(thread_id: str) -> None:
+        sizes.append(thread_bytes(workflow.checkpointer, thread_id))
+        release(thread_id)
+
+    workflow.release = measured_release
+
+    def request(i: int):
+        name = f"quarterly-report-{i}.txt"
+        return v2.FileAnalysisRequest(
+            file_path=f"/bench/v2/{i}/{name}",
+            original_name=name,
+            file_size=4096,
+            file_extension=".txt",
+            content_preview=("Quarterly revenue report for Contoso Ltd. " * 40)[:2000],
+        )
+
+    await v2.analyze_file(request(-1))  # First-run costs are not per request
+    sizes.clear()
+
+    peaks = []
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for i in range(files):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        await v2.analyze_file(request(i))
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "peak_kb": statistics.median(peaks) / 1024,
+        "retained_kb": (retained - baseline) / files / 1024,
+        "checkpoint_kb": statistics.median(sizes) / 1024,
+        "held_threads": len(workflow.checkpointer.storage),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": "0",
+        "NAME_ALLOCATOR_ENABLED": "false",
+        "LOG_ENABLED": "false",
+    })
+    v2 = load_v2()
+
+    print(f"{'mode':<6} {'peak alloc/req':>15} {'retained/req':>13} {'checkpoints/req':>16} {'threads held':>13}")
+    for label, slim in (("full", False), ("slim", True)):
+        result = asyncio.run(run(v2, slim, args.files))
+        print(f"{label:<6} {result['peak_kb']:>12.1f} KB {result['retained_kb']:>10.1f} KB "
+              f"{result['checkpoint_kb']:>13.1f} KB {result['held_threads']:>13d}")
+
+
+if __name__ == "__main__":
+    main()
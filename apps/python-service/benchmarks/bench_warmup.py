@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Warm-up benchmark
+Starts the service in a fresh process with and without the startup warm-up and
+compares first-request latency against steady-state latency (mock LLM).
+
+Usage: python benchmarks/bench_warmup.py [--runs 5] [--requests 20]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+
+def child(requests: int) -> None:
+    """One cold process: wait for /ready, then time requests"""
+    sys.path.insert(0, str(SERVICE_DIR))
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        started = time.perf_counter()
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        ready_ms = (time.perf_counter() - started) * 1000
+
+        latencies = []
+        for i in range(requests):
+            body = {
+                "file_path": f"/bench/report-{i}.txt",
+                "original_name": f"report-{i}.txt",
+                "file_size": 2048,
+                "file_extension": ".txt",
+                "content_preview": "Quarterly report for Contoso Ltd, revenue up 12%",
+            }
+            request_started = time.perf_counter()
+            client.post("/analyze-file", json=body).raise_for_status()
+            latencies.append((time.perf_counter() - request_started) * 1000)
+
+    print(json.dumps({"ready_ms": ready_ms, "first_ms": latencies[0],
+                      "steady_ms": statistics.median(latencies[len(latencies) // 2:])}))
+
+
+def run(warmup: bool, requests: int, tmp: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "WARMUP_ENABLED": "true" if warmup else "false",
+        "SILENTSORT_MOCK_LLM": "true",
+        "MOCK_LLM_LATENCY_MS": env.get("MOCK_LLM_LATENCY_MS", "0"),
+        "JOB_DB_PATH": os.path.join(tmp, "jobs.db"),
+        "FINGERPRINT_INDEX_PATH": os.path.join(tmp, "index.db"),
+        "LOG_ENABLED": "false",
+    })
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", __file__, "--child", "--requests", str(requests)],
+        env=env, cwd=SERVICE_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.requests)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'warm-up':>8} | {'to ready':>9} | {'first request':>13} | {'steady state':>12}")
+        for warmup in (False, True):
+            results = [run(warmup, args.requests, tmp) for _ in range(args.runs)]
+            median = {key: statistics.median(r[key] for r in results) for key in results[0]}
+            print(f"{'on' if warmup else 'off':>8} | {median['ready_ms']:7.1f}ms | "
+                  f"{median['first_ms']:11.1f}ms | {median['steady_ms']:10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
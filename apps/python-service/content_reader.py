@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+SilentSort Content Reader
+Bounded, buffer-reusing reads of file previews on the service side
+"""
+
+import os
+import threading
+from typing import List, Optional, Tuple
+
+# A UTF-8 character is at most 4 bytes, so this many bytes always covers the preview
+MAX_BYTES_PER_CHAR = 4
+# Bytes inspected for NUL characters before a file is treated as binary
+BINARY_SNIFF_BYTES = 1024
+
+_local = threading.local()
+
+
+class ContentReadError(ValueError):
+    """The file cannot be previewed (missing, not a regular file, or too large)"""
+
+
+class ReadNotAllowedError(ContentReadError):
+    """Server-side reads are off, or the path is outside SERVER_READ_ROOTS"""
+
+
+def preview_chars() -> int:
+    return int(os.getenv("CONTENT_PREVIEW_CHARS", "2000"))
+
+
+def max_file_size_bytes() -> int:
+    return int(float(os.getenv("MAX_FILE_SIZE_MB", "50")) * 1024 * 1024)
+
+
+def server_side_read_enabled() -> bool:
+    return os.getenv("SERVER_SIDE_READ", "false").lower() == "true"
+
+
+def server_read_roots() -> List[str]:
+    """Directories clients may have the service read from: SERVER_READ_ROOTS, else WATCH_FOLDERS"""
+    roots = os.getenv("SERVER_READ_ROOTS") or os.getenv("WATCH_FOLDERS", "")
+    return [os.path.realpath(os.path.expanduser(root.strip())) for root in roots.split(",") if root.strip()]
+
+
+def resolve_readable_path(path: str) -> str:
+    """`path` with symlinks resolved, if clients may have the service read it; ReadNotAllowedError otherwise"""
+    if not server_side_read_enabled():
+        raise ReadNotAllowedError("Server-side reads are disabled (SERVER_SIDE_READ=false)")
+    resolved = os.path.realpath(os.path.expanduser(path))
+    for root in server_read_roots():
+        if os.path.commonpath([resolved, root]) == root:
+            return resolved
+    raise ReadNotAllowedError(f"{path} is outside SERVER_READ_ROOTS")
+
+
+def _buffer(size: int) -> bytearray:
+    """Per-thread read buffer, grown on demand and reused across reads"""
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(max(size, 64 * 1024))
+        _local.buffer = buffer
+    return buffer
+
+
+def read_preview(path: str, max_chars: Optional[int] = None,
+                 max_file_bytes: Optional[int] = None) -> Tuple[str, int, int]:
+    """Read at most enough bytes of `path` for `max_chars` characters of text.
+
+    Returns (preview, file_size, bytes_read). Bytes are read straight into a
+    reusable per-thread buffer and only as much of it is decoded as the preview
+    needs. Binary files yield an empty preview.
+    """
+    max_chars = preview_chars() if max_chars is None else max_chars
+    max_file_bytes = max_file_size_bytes() if max_file_bytes is None else max_file_bytes
+
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise ContentReadError(f"Cannot read {path}: {e.strerror}") from e
+    if not os.path.isfile(path):
+        raise ContentReadError(f"Not a regular file: {path}")
+    if stat.st_size > max_file_bytes:
+        raise ContentReadError(
+            f"File is {stat.st_size} bytes, above MAX_FILE_SIZE_MB ({max_file_bytes} bytes)"
+        )
+
+    limit = min(stat.st_size, max_chars * MAX_BYTES_PER_CHAR)
+    if limit == 0:
+        return "", stat.st_size, 0
+
+    view = memoryview(_buffer(limit))[:limit]
+    read = 0
+    with open(path, "rb", buffering=0) as handle:
+        while read < limit:
+            n = handle.readinto(view[read:])
+            if not n:
+                break
+            read += n
+
+    data = view[:read]
+    if b"\0" in data[:BINARY_SNIFF_BYTES].tobytes():
+        return "", stat.st_size, read
+
+    # Mostly-ASCII text needs ~1 byte per character: decode that first and only
+    # widen the window when multi-byte characters leave the preview short
+    window = min(read, max_chars)
+    while True:
+        text = str(data[:window], "utf-8", "ignore")
+        if len(text) >= max_chars or window == read:
+            return text[:max_chars], stat.st_size, read
+        window = min(read, window * 2)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+SilentSort Content Router
+Classifies a file by MIME sniffing and size before any LLM call, so images,
+archives, empty and near-empty files are named from their metadata alone
+"""
+
+import os
+import re
+import mimetypes
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from document_extractors import is_document
+from folder_index import classify_filename
+
+try:
+    import magic
+    MAGIC_AVAILABLE = True
+except (ImportError, OSError):  # python-magic missing, or libmagic not installed
+    MAGIC_AVAILABLE = False
+
+try:
+    from PIL import Image, UnidentifiedImageError
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+# Bytes read for MIME sniffing (libmagic needs only the header)
+SNIFF_BYTES = 2048
+
+ARCHIVE_MIME_TYPES = {
+    "application/zip", "application/x-tar", "application/gzip", "application/x-gzip",
+    "application/x-bzip2", "application/x-xz", "application/x-7z-compressed",
+    "application/x-rar", "application/vnd.rar", "application/x-rar-compressed",
+    "application/zstd", "application/x-iso9660-image", "application/x-apple-diskimage",
+}
+
+# Route kind -> category reported for it (None: guessed from the file name)
+KIND_CATEGORIES = {"image": "image", "media": "media", "archive": "other", "binary": "other",
+                   "empty": None, "trivial": None, "no_content": None}
+
+# EXIF tags: DateTimeOriginal lives in the Exif IFD, DateTime and Model in IFD0
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_DATETIME = 0x0132
+EXIF_MODEL = 0x0110
+
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def _slug(value: str) -> str:
+    return _NON_SLUG.sub("-", value.lower()).strip("-")
+
+
+def image_metadata(path: str) -> Dict[str, Any]:
+    """Format, dimensions and EXIF capture date/camera, read from the header only (no pixel decode)"""
+    if not PILLOW_AVAILABLE:
+        return {}
+    try:
+        with Image.open(path) as image:
+            metadata: Dict[str, Any] = {"format": image.format, "width": image.width, "height": image.height}
+            exif = image.getexif()
+            taken = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+            if exif.get(EXIF_MODEL):
+                metadata["camera"] = str(exif[EXIF_MODEL]).strip("\0 ")
+    except (OSError, UnidentifiedImageError, ValueError):
+        return {}
+    if taken:
+        try:
+            metadata["taken"] = datetime.strptime(str(taken).strip("\0 "), "%Y:%m:%d %H:%M:%S").date().isoformat()
+        except ValueError:
+            pass
+    return metadata
+
+
+class ContentRouter:
+    """Decides whether a file is worth an LLM analysis.
+
+    The MIME type comes from libmagic on the first `SNIFF_BYTES` of files the
+    service may read (callers pass no path for the others, see
+    content_reader.resolve_readable_path), and from the extension otherwise. Empty files, images,
+    audio/video, archives and other binaries, and text shorter than
+    `min_text_chars` take the metadata path; documents and real text go to
+    the LLM. Per-route counts and latencies show how much traffic was
+    diverted and roughly how much time that saved.
+    """
+
+    def __init__(self, min_text_chars: int = 20):
+        self.min_text_chars = min_text_chars
+        self._lock = threading.Lock()
+        self.kinds: Dict[str, int] = {}
+        self.routes = {"llm": 0, "metadata": 0}
+        self.route_ms = {"llm": 0.0, "metadata": 0.0}
+        self.completed = {"llm": 0, "metadata": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["ContentRouter"]:
+        """None when CONTENT_ROUTING_ENABLED=false"""
+        if os.getenv("CONTENT_ROUTING_ENABLED", "true").lower() != "true":
+            return None
+        return cls(min_text_chars=int(os.getenv("CONTENT_ROUTING_MIN_TEXT_CHARS", "20")))
+
+    def sniff_mime(self, path: Optional[str], name: str) -> Optional[str]:
+        if MAGIC_AVAILABLE and path and os.path.isfile(path):
+            try:
+                with open(path, "rb") as handle:
+                    head = handle.read(SNIFF_BYTES)
+                if head:
+                    return magic.from_buffer(head, mime=True)
+            except (OSError, magic.MagicException):
+                pass
+        return mimetypes.guess_type(name)[0]
+
+    def _kind(self, mime: Optional[str], name: str, file_size: int, content_preview: str) -> str:
+        if file_size == 0:
+            return "empty"
+        if is_document(name):
+            # Extracted text decides: a scanned PDF with no text layer has nothing for the LLM
+            return "text" if content_preview.strip() else "no_content"
+        mime = mime or ""
+        if mime.startswith("image/"):
+            return "image"
+        if mime.startswith(("audio/", "video/")):
+            return "media"
+        if mime in ARCHIVE_MIME_TYPES:
+            return "archive"
+        text = content_preview.strip()
+        if not text:
+            return "binary" if mime and not mime.startswith("text/") else "no_content"
+        if len(text) < self.min_text_chars:
+            return "trivial"
+        return "text"
+
+    def classify(self, path: Optional[str], name: str, file_size: int, content_preview: str,
+                 record: bool = True) -> Dict[str, Any]:
+        """Route for one file: {"route": "llm"|"metadata", "kind", "mime", "metadata"}; `record=False` leaves the counters alone"""
+        mime = self.sniff_mime(path, name)
+        kind = self._kind(mime, name, file_size, content_preview or "")
+        metadata: Dict[str, Any] = {}
+        if kind == "image" and PILLOW_AVAILABLE and path and os.path.isfile(path):
+            metadata = image_metadata(path)
+            if not metadata:
+                kind = "binary"  # libmagic guessed an image format Pillow cannot read (e.g. TGA false positives)
+        route = "llm" if kind == "text" else "metadata"
+        if not record:
+            return {"route": route, "kind": kind, "mime": mime, "metadata": metadata}
+        with self._lock:
+            self.kinds[kind] = self.kinds.get(kind, 0) + 1
+            self.routes[route] += 1
+        return {"route": route, "kind": kind, "mime": mime, "metadata": metadata}
+
+    def record_latency(self, route: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.route_ms[route] += elapsed_ms
+            self.completed[route] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.routes.values())
+            mean = {route: self.route_ms[route] / self.completed[route] if self.completed[route] else None
+                    for route in self.route_ms}
+            saved = None
+            if mean["llm"] is not None and mean["metadata"] is not None:
+                saved = int(self.completed["metadata"] * max(0.0, mean["llm"] - mean["metadata"]))
+            return {
+                "routes": dict(self.routes),
+                "kinds": dict(self.kinds),
+                "diverted_fraction": round(self.routes["metadata"] / total, 4) if total else 0.0,
+                "mean_ms": {route: round(value, 1) if value is not None else None for route, value in mean.items()},
+                "estimated_ms_saved": saved,
+                "magic_available": MAGIC_AVAILABLE,
+            }
+
+
+def metadata_analysis(route: Dict[str, Any], original_name: str, file_extension: str) -> Dict[str, Any]:
+    """Workflow results for a file on the metadata path: analysis, names, category and confidence"""
+    kind = route["kind"]
+    metadata = route.get("metadata") or {}
+    stem = _slug(os.path.splitext(original_name)[0]) or "file"
+
+    if kind == "image":
+        prefix = "photo" if metadata.get("camera") else "image"
+        parts = [prefix, metadata.get("taken"), stem if prefix not in stem else None]
+        primary = "-".join(part for part in parts if part)
+        alternatives = [f"{stem}-{metadata['width']}x{metadata['height']}"] if metadata.get("width") else []
+        confidence = 0.8 if metadata.get("taken") else 0.6
+        summary = ", ".join(f"{key}: {value}" for key, value in metadata.items()) or f"{route.get('mime')} image"
+    elif kind in ("media", "archive"):
+        label = (route.get("mime") or "").split("/")[0] if kind == "media" else "archive"
+        primary = stem if label in stem else f"{stem}-{label}"
+        alternatives = [stem] if primary != stem else []
+        confidence = 0.6
+        summary = f"{route.get('mime') or kind} file"
+    else:
+        primary = stem
+        alternatives = [f"{stem}-empty"] if kind == "empty" else []
+        confidence = 0.4 if kind in ("empty", "trivial") else 0.5
+        summary = {"empty": "Empty file", "trivial": "Almost no text content",
+                   "no_content": "No readable content", "binary": f"Binary {route.get('mime') or 'data'}"}[kind]
+
+    return {
+        "content_analysis": {
+            "content_type": kind,
+            "key_topics": [],
+            "document_purpose": f"{kind} file metadata",
+            "business_context": "unknown",
+            "content_summary": summary,
+        },
+        "naming_suggestions": [name + file_extension for name in [primary, *alternatives]],
+        "category_analysis": KIND_CATEGORIES.get(kind) or (
+            "code" if classify_filename(original_name) == "code" else "document"
+        ),
+        "confidence_scores": {"overall": confidence, "content_analysis": confidence, "naming": confidence},
+    }
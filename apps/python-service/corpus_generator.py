@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+SilentSort Benchmark Corpus
+Generates labeled synthetic documents (invoices, resumes, proposals, meeting
+notes, contracts, code docs, reports) with their ground-truth category and
+entities, for the engine accuracy and latency harness
+
+Usage: python corpus_generator.py --files 5000 --output corpus/ [--seed 7]
+"""
+
+import os
+import json
+import random
+import argparse
+from typing import Any, Dict, List, Optional
+
+CATEGORIES = ["invoice", "resume", "project-proposal", "meeting-notes", "contract", "code", "report"]
+
+# Category in the coarse taxonomy the LLM prompts use (document, image, code, data, media, other)
+COARSE_CATEGORIES = {category: "code" if category == "code" else "document" for category in CATEGORIES}
+
+COMPANIES = ["Acme Corp", "Globex Inc", "Initech LLC", "Umbrella Ltd", "Stark Industries", "Wayne Corp",
+             "Hooli Inc", "Contoso Ltd", "Fabrikam Inc", "Northwind Corp", "Tyrell Corp", "Soylent Inc"]
+
+PEOPLE = ["Maria Garcia", "James Chen", "Aisha Khan", "Lukas Novak", "Priya Sharma", "Daniel Okafor",
+          "Sofia Rossi", "Kenji Watanabe", "Emma Johansson", "Carlos Mendes"]
+
+# Spelled the way the rules engine reports them
+TECHNOLOGIES = ["Python", "React", "AWS", "Docker", "Kubernetes", "Typescript", "Angular", "GCP",
+                "Machine Learning", "Analytics", "Blockchain", "Azure"]
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September",
+          "October", "November", "December"]
+
+PRODUCTS = ["Cloud hosting", "Software license", "Consulting services", "Support plan", "Hardware lease",
+            "Data storage", "Security audit", "Training workshop"]
+
+FILLER = [
+    "Please refer to the attached appendix for additional context.",
+    "All figures are subject to final review by the finance team.",
+    "Questions regarding this document should be directed to the project office.",
+    "This document supersedes all previous drafts circulated by email.",
+    "Copies have been shared with the relevant stakeholders for their records.",
+    "Further details will be provided in the next revision.",
+]
+
+GENERIC_NAMES = ["scan{n}", "Document ({n})", "untitled-{n}", "final_v{n}", "IMG_{n}", "download ({n})",
+                 "file{n}", "new document {n}", "draft-{n}"]
+
+DESCRIPTIVE_NAMES = {
+    "invoice": "invoice_{company}_{month}",
+    "resume": "{person}_cv",
+    "project-proposal": "proposal_{company}",
+    "meeting-notes": "meeting-notes-{month}",
+    "contract": "{company}_agreement",
+    "code": "README_{tech}",
+    "report": "report_{month}_{year}",
+}
+
+
+def _money(rng: random.Random, low: int, high: int) -> int:
+    return rng.randrange(low, high, 50)
+
+
+def _slug(text: str) -> str:
+    return text.lower().replace(" ", "_")
+
+
+class DocumentGenerator:
+    """Builds one labeled document per call.
+
+    Every document gets the entities its category naturally carries, phrased
+    in one of several ways (so extractors are exercised beyond their exact
+    patterns), padded with filler to a random length. At `plain_rate` a
+    document avoids its category's stock phrases ("amount due", "executive
+    summary", "meeting"), as real files often do. Names are descriptive,
+    generic or (at `misleading_rate`) named after a different category.
+    """
+
+    def __init__(self, seed: int = 0, misleading_rate: float = 0.15, plain_rate: float = 0.25,
+                 max_filler: int = 12):
+        self.rng = random.Random(seed)
+        self.misleading_rate = misleading_rate
+        self.plain_rate = plain_rate
+        self.max_filler = max_filler
+        self.plain = False
+
+    def generate(self, index: int, category: Optional[str] = None) -> Dict[str, Any]:
+        category = category or CATEGORIES[index % len(CATEGORIES)]
+        self.plain = self.rng.random() < self.plain_rate
+        lines, entities = getattr(self, f"_{category.replace('-', '_')}")()
+        lines.extend(self.rng.sample(FILLER, self.rng.randint(0, min(self.max_filler, len(FILLER)))))
+        extension = ".py" if category == "code" and self.rng.random() < 0.3 else self.rng.choice([".txt", ".md", ".txt"])
+        return {
+            "id": index,
+            "original_name": self._name(index, category, entities) + extension,
+            "file_extension": extension,
+            "content": "\n".join(lines) + "\n",
+            "category": category,
+            "coarse_category": COARSE_CATEGORIES[category],
+            "entities": entities,
+        }
+
+    def _name(self, index: int, category: str, entities: Dict[str, Any]) -> str:
+        roll = self.rng.random()
+        if roll < self.misleading_rate:
+            category = self.rng.choice([c for c in CATEGORIES if c != category])
+        elif roll < 0.5:
+            return self.rng.choice(GENERIC_NAMES).format(n=index)
+        return DESCRIPTIVE_NAMES[category].format(
+            company=_slug(entities.get("company") or self.rng.choice(COMPANIES)),
+            person=_slug(self.rng.choice(PEOPLE)),
+            month=self.rng.choice(MONTHS).lower(),
+            year=self.rng.randint(2022, 2025),
+            tech=_slug((entities.get("technology") or [self.rng.choice(TECHNOLOGIES)])[0]),
+        )
+
+    def _technologies(self, low: int, high: int) -> List[str]:
+        return self.rng.sample(TECHNOLOGIES, self.rng.randint(low, high))
+
+    def _invoice(self):
+        rng = self.rng
+        company = rng.choice(COMPANIES)
+        number = f"INV-{rng.randint(2022, 2025)}-{rng.randint(1, 9999):04d}"
+        items = rng.sample(PRODUCTS, rng.randint(1, 4))
+        prices = [_money(rng, 300, 9000) for _ in items]
+        total = sum(prices)
+        lines = [
+            rng.choice([f"Vendor: {company}", f"From: {company}", f"{company.upper()}"]),
+            rng.choice([f"Invoice #: {number}", f"Invoice Number: {number}", f"Reference {number}"]),
+            f"Invoice Date: {rng.choice(MONTHS)} {rng.randint(1, 28)}, {rng.randint(2022, 2025)}",
+            f"{'Customer' if self.plain else 'Bill To'}: {rng.choice(PEOPLE)}",
+            "",
+            "Item | Qty | Price" if self.plain else "Description | Quantity | Unit Price",
+        ]
+        lines += [f"{item} | 1 | ${price:,}.00" for item, price in zip(items, prices)]
+        if self.plain:
+            lines += ["", f"Balance: ${total:,}.00", "Please pay within 30 days."]
+        else:
+            lines += ["", f"Subtotal: ${total:,}.00", f"Total Amount Due: ${total:,}.00",
+                      rng.choice(["Payment terms: Net 30", "Payment Method: bank transfer", "Due Date: on receipt"])]
+        entities = {"company": company, "invoice_number": number}
+        if total >= 1000:
+            entities["budget"] = f"${total}"
+        return lines, entities
+
+    def _resume(self):
+        rng = self.rng
+        person = rng.choice(PEOPLE)
+        years = rng.randint(2, 15)
+        role = rng.choice(["Software Engineer", "Data Scientist", "Frontend Developer", "Platform Engineer"])
+        technologies = self._technologies(2, 4)
+        lines = [
+            person,
+            f"{role} | {_slug(person).replace('_', '.')}@example.com",
+            "",
+            "Profile" if self.plain else rng.choice(["PROFESSIONAL SUMMARY", "Summary"]),
+            f"{role}, {years} years in industry, building production systems." if self.plain
+            else f"{role} with {years} years of experience building production systems.",
+            "",
+            "Jobs" if self.plain else rng.choice(["WORK EXPERIENCE", "Employment History"]),
+            f"{rng.choice(COMPANIES)} — {role} ({2025 - years}–present)",
+            "- Led delivery of customer-facing features and mentored junior engineers",
+            "",
+            "Skills" if self.plain else "TECHNICAL SKILLS",
+            ", ".join(technologies),
+            "",
+            "Studies" if self.plain else "EDUCATION",
+            rng.choice(["BSc Computer Science, 2012", "MEng, 2015"]) if self.plain
+            else rng.choice(["Bachelor of Science in Computer Science", "Master of Engineering"]),
+        ]
+        return lines, {"technology": technologies}
+
+    def _project_proposal(self):
+        rng = self.rng
+        company = rng.choice(COMPANIES)
+        budget = _money(rng, 20000, 400000)
+        team = rng.randint(2, 20)
+        deadline = f"{rng.choice(MONTHS)} {rng.randint(2025, 2027)}"
+        technologies = self._technologies(1, 3)
+        lines = [
+            rng.choice([f"Project Proposal: {rng.choice(PRODUCTS)} platform", "PROJECT PROPOSAL"]),
+            rng.choice([f"Client: {company}", f"Prepared for {company}"]),
+            "",
+            f"We propose to build the platform using {', '.join(technologies)}.",
+            rng.choice([f"Budget: ${budget:,}", f"The estimated project budget is ${budget:,}."]),
+            rng.choice([f"Team: {team} developers", f"A team of {team} developers will be assigned."]),
+            rng.choice([f"Deadline: {deadline}", f"Target completion: {deadline}"]),
+        ]
+        return lines, {"company": company, "budget": f"${budget}", "team_size": f"{team} developers",
+                       "deadline": deadline, "technology": technologies}
+
+    def _meeting_notes(self):
+        rng = self.rng
+        month = rng.choice(MONTHS)
+        lines = [
+            rng.choice(["# Sync notes", "Minutes", "Notes from today's catch-up"]) if self.plain
+            else rng.choice([f"# {rng.choice(['Weekly', 'Quarterly', 'Sprint'])} Meeting Notes",
+                             "Team standup notes", "Agenda and minutes"]),
+            f"Date: {month} {rng.randint(1, 28)}, {rng.randint(2023, 2025)}",
+            f"Attendees: {', '.join(rng.sample(PEOPLE, 3))}",
+            "",
+            "## Discussion",
+            "- Roadmap priorities for the next quarter",
+            "- Customer feedback review",
+            "",
+            "## Action Items",
+            f"- [ ] {rng.choice(PEOPLE)} to follow up with the design team",
+        ]
+        return lines, {}
+
+    def _contract(self):
+        rng = self.rng
+        company = rng.choice(COMPANIES)
+        counterparty = rng.choice([c for c in COMPANIES if c != company])
+        value = _money(rng, 5000, 250000)
+        lines = [
+            rng.choice(["SERVICES AGREEMENT", "MASTER SERVICES CONTRACT", "Consulting Agreement"]),
+            "",
+            rng.choice([f"This agreement is entered into between {company} and {counterparty}.",
+                        f"Company: {company}\nCounterparty: {counterparty}"]),
+            "1. Scope. The provider shall deliver the services described in Schedule A.",
+            f"2. Fees. The total contract value is ${value:,}, payable monthly.",
+            "3. Term. This agreement remains in force for twelve months unless terminated.",
+            "4. Governing law. The terms and conditions are governed by the laws of the State of Delaware.",
+        ]
+        return lines, {"company": company, "budget": f"${value}"}
+
+    def _code(self):
+        rng = self.rng
+        technologies = self._technologies(1, 2)
+        module = rng.choice(["billing", "auth", "search", "ingest", "reports"])
+        lines = [
+            f"# {module} module",
+            "",
+            f"Implementation notes ({', '.join(technologies)}).",
+            "",
+            f"import {module}",
+            "",
+            f"def handle_{module}(request):",
+            f"    \"\"\"Entry point for the {module} service\"\"\"",
+            f"    return {module}.process(request)",
+            "",
+            f"class {module.title()}Client:",
+            "    pass",
+        ]
+        return lines, {"technology": technologies}
+
+    def _report(self):
+        rng = self.rng
+        quarter = rng.choice(["Q1", "Q2", "Q3", "Q4"])
+        revenue = _money(rng, 100000, 5000000)
+        lines = [
+            rng.choice([f"{quarter} Quarterly Business Report", "Annual Performance Report", "Market Research Report"]),
+            "",
+            "Overview" if self.plain else "Executive Summary",
+            f"Revenue for the period reached ${revenue:,}, ahead of plan.",
+            "",
+            "Highlights" if self.plain else "Key Findings",
+            "- Customer retention improved across all regions",
+            "- Operating costs remained within forecast",
+        ]
+        return lines, {"budget": f"${revenue}"}
+
+
+def generate_corpus(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """`count` labeled documents, the categories in rotation; the same seed gives the same corpus"""
+    generator = DocumentGenerator(seed)
+    return [generator.generate(index) for index in range(count)]
+
+
+def write_corpus(documents: List[Dict[str, Any]], directory: str) -> str:
+    """Write each document under `directory`/files and their labels to `directory`/labels.jsonl"""
+    os.makedirs(os.path.join(directory, "files"), exist_ok=True)
+    labels_path = os.path.join(directory, "labels.jsonl")
+    with open(labels_path, "w", encoding="utf-8") as labels:
+        for document in documents:
+            path = os.path.join("files", f"{document['id']:05d}{document['file_extension']}")
+            with open(os.path.join(directory, path), "w", encoding="utf-8") as handle:
+                handle.write(document["content"])
+            label = {key: value for key, value in document.items() if key != "content"}
+            labels.write(json.dumps({**label, "path": path}) + "\n")
+    return labels_path
+
+
+def load_corpus(directory: str) -> List[Dict[str, Any]]:
+    """Documents written by write_corpus, content included"""
+    documents = []
+    with open(os.path.join(directory, "labels.jsonl"), encoding="utf-8") as labels:
+        for line in labels:
+            document = json.loads(line)
+            with open(os.path.join(directory, document["path"]), encoding="utf-8") as handle:
+                document["content"] = handle.read()
+            documents.append(document)
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="corpus")
+    args = parser.parse_args()
+
+    labels_path = write_corpus(generate_corpus(args.files, args.seed), args.output)
+    print(f"✅ {args.files} documents in {args.output}/files, labels in {labels_path}")
+
+
+if __name__ == "__main__":
+    main()
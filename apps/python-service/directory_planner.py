@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+SilentSort Directory Planner
+Scans a directory, analyzes every file and turns the results into one
+rename/move plan: folders to create (parents first), moves with name
+collisions resolved, and identical files merged into a single target
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from fingerprint_index import file_fingerprint, file_full_hash
+from folder_index import SKIP_DIRS, FolderIndex
+from name_allocator import NameAllocator
+
+# Analysis category -> folder created under the planned directory
+CATEGORY_FOLDERS = {
+    "document": "Documents",
+    "image": "Images",
+    "code": "Code",
+    "data": "Data",
+    "media": "Media",
+    "other": "Other",
+}
+UNSORTED_FOLDER = "Unsorted"
+
+_UNSAFE_NAME_CHARS = str.maketrans({c: "-" for c in '/\\:*?"<>|'})
+
+
+class PlannedFile:
+    """Compact per-file record; previews and full results are not kept"""
+    __slots__ = ("source", "size", "fingerprint", "full_hash", "name", "folder", "category", "confidence", "error")
+
+    def __init__(self, source: str, size: int):
+        self.source = source
+        self.size = size
+        self.fingerprint: Optional[str] = None
+        self.full_hash: Optional[str] = None
+        self.name: Optional[str] = None
+        self.folder: Optional[str] = None
+        self.category: Optional[str] = None
+        self.confidence = 0.0
+        self.error: Optional[str] = None
+
+
+def clean_name(suggested: Optional[str], original: str) -> str:
+    """Suggested name usable as a single path component, keeping the original extension"""
+    name = os.path.basename((suggested or "").strip()).translate(_UNSAFE_NAME_CHARS).strip(" .")
+    if not name:
+        return original
+    extension = os.path.splitext(original)[1]
+    if extension and not name.lower().endswith(extension.lower()):
+        name += extension
+    return name
+
+
+class DirectoryPlanner:
+    """Builds an organization plan for one directory.
+
+    Files are analyzed by `concurrency` workers pulling from the scan list,
+    so at most that many analyses (and their previews) are in flight no
+    matter how large the directory is; each finished file is reduced to a
+    PlannedFile. Targets are assigned only after every file is analyzed,
+    in source-path order, so the plan is deterministic.
+    """
+
+    def __init__(self, analyze: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                 concurrency: int = 4, max_files: int = 50000, max_depth: int = 8):
+        self.analyze = analyze
+        self.concurrency = concurrency
+        self.max_files = max_files
+        self.max_depth = max_depth
+        self.plans = 0
+        self.files_planned = 0
+
+    @classmethod
+    def from_env(cls, analyze: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> "DirectoryPlanner":
+        return cls(
+            analyze,
+            concurrency=int(os.getenv("PLAN_CONCURRENCY", "4")),
+            max_files=int(os.getenv("PLAN_MAX_FILES", "50000")),
+            max_depth=int(os.getenv("FOLDER_INDEX_MAX_DEPTH", "8")),
+        )
+
+    # ========================================================================
+    # SCAN
+    # ========================================================================
+
+    def scan(self, directory: str, recursive: bool = False) -> List[Tuple[str, int]]:
+        """(relative path, size) of every visible file, sorted; stops one past max_files"""
+        files: List[Tuple[str, int]] = []
+        stack = [("", 0)]
+        while stack and len(files) <= self.max_files:
+            rel, depth = stack.pop()
+            try:
+                entries = list(os.scandir(os.path.join(directory, rel) if rel else directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                path = f"{rel}/{entry.name}" if rel else entry.name
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        files.append((path, entry.stat(follow_symlinks=False).st_size))
+                    elif (recursive and depth < self.max_depth and entry.name not in SKIP_DIRS
+                          and entry.is_dir(follow_symlinks=False)):
+                        stack.append((path, depth + 1))
+                except OSError:
+                    continue
+        files.sort()
+        return files
+
+    # ========================================================================
+    # ANALYSIS
+    # ========================================================================
+
+    async def _analyze_file(self, directory: str, record: PlannedFile, use_index: Optional[bool]) -> None:
+        path = os.path.join(directory, record.source)
+        original = os.path.basename(record.source)
+        try:
+            record.fingerprint = await asyncio.to_thread(file_fingerprint, path)
+            result = await self.analyze({
+                "file_path": path,
+                "original_name": original,
+                "file_size": record.size,
+                "file_extension": os.path.splitext(original)[1],
+                "read_from_path": True,
+                "use_index": use_index,
+            })
+        except Exception as e:
+            record.error = str(e) or type(e).__name__
+            return
+        record.name = clean_name(result.get("suggested_name"), original)
+        record.category = result.get("category") or "unknown"
+        record.confidence = result.get("confidence", 0.0)
+
+    async def _analyze_all(self, directory: str, records: List[PlannedFile], use_index: Optional[bool],
+                           events: asyncio.Queue) -> None:
+        total = len(records)
+        report_every = max(1, total // 100)
+        pending = iter(records)
+        done = errors = 0
+
+        async def worker():
+            nonlocal done, errors
+            for record in pending:
+                await self._analyze_file(directory, record, use_index)
+                done += 1
+                errors += record.error is not None
+                if done % report_every == 0 or done == total:
+                    await events.put({"type": "progress", "analyzed": done, "total": total, "errors": errors})
+
+        cancelled = False
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, total) or 1)))
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # A cancelled run has no consumer left, and waiting for room in a full queue would never end
+            if not cancelled:
+                await events.put(None)
+
+    # ========================================================================
+    # PLAN
+    # ========================================================================
+
+    def _target_folder(self, category: str, folder_index: FolderIndex) -> str:
+        folder = CATEGORY_FOLDERS.get(category, UNSORTED_FOLDER)
+        existing = folder_index.find(folder, category)
+        return existing["path"] if existing else folder
+
+    async def _same_content(self, directory: str, a: PlannedFile, b: PlannedFile) -> bool:
+        """Full-file comparison, only for records whose fingerprints already match"""
+        for record in (a, b):
+            if record.full_hash is None:
+                record.full_hash = await asyncio.to_thread(file_full_hash, os.path.join(directory, record.source))
+        return a.full_hash == b.full_hash
+
+    async def _build_plan(self, directory: str, records: List[PlannedFile],
+                          folder_index: FolderIndex) -> AsyncIterator[Dict[str, Any]]:
+        # Plan-local: names are reserved against files on disk and earlier moves in this plan only
+        allocator = NameAllocator(max_directories=1024)
+        merged: Dict[Tuple[str, str], PlannedFile] = {}  # (fingerprint, folder) -> file kept
+        new_folders: Set[str] = set()
+        operations: List[Dict[str, Any]] = []
+        counts = {"moves": 0, "kept": 0, "duplicates": 0, "errors": 0, "renamed_for_collision": 0}
+
+        for record in records:
+            if record.error is not None:
+                counts["errors"] += 1
+                operations.append({"type": "error", "source": os.path.join(directory, record.source),
+                                   "error": record.error})
+                continue
+
+            record.folder = self._target_folder(record.category, folder_index)
+            source = os.path.join(directory, record.source)
+
+            key = (record.fingerprint, record.folder)
+            kept = merged.get(key)
+            if kept is not None and await self._same_content(directory, kept, record):
+                counts["duplicates"] += 1
+                operations.append({"type": "duplicate", "source": source,
+                                   "duplicate_of": os.path.join(directory, kept.folder, kept.name)})
+                continue
+            merged.setdefault(key, record)
+
+            name = allocator.allocate(os.path.join(directory, record.folder), record.name, source=source)
+            if os.path.join(directory, record.folder, name) == source:
+                # Already organized: its own name is not a collision
+                record.name = name
+                counts["kept"] += 1
+                operations.append({"type": "keep", "source": source})
+                continue
+            if name != record.name:
+                counts["renamed_for_collision"] += 1
+            record.name = name
+
+            if not folder_index.exists(record.folder):
+                new_folders.add(record.folder)
+            counts["moves"] += 1
+            operations.append({
+                "type": "move",
+                "source": source,
+                "target": os.path.join(directory, record.folder, name),
+                "category": record.category,
+                "confidence": record.confidence,
+            })
+
+        # Parents before children: every missing ancestor, shallowest first
+        to_create: Set[str] = set()
+        for folder in new_folders:
+            parts = folder.split("/")
+            for depth in range(1, len(parts) + 1):
+                ancestor = "/".join(parts[:depth])
+                if not folder_index.exists(ancestor):
+                    to_create.add(ancestor)
+        for folder in sorted(to_create, key=lambda f: (f.count("/"), f)):
+            yield {"type": "mkdir", "path": os.path.join(directory, folder)}
+
+        for operation in operations:
+            yield operation
+        yield {"type": "summary", "files": len(records), "folders_created": len(to_create), **counts}
+
+    async def plan(self, directory: str, files: List[Tuple[str, int]],
+                   use_index: Optional[bool] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Progress events while files are analyzed, then the plan operations and a summary"""
+        started = time.perf_counter()
+        yield {"type": "scanned", "directory": directory, "files": len(files)}
+
+        folder_index = await asyncio.to_thread(FolderIndex(directory, self.max_depth).build)
+        records = [PlannedFile(source, size) for source, size in files]
+
+        events: asyncio.Queue = asyncio.Queue(maxsize=100)
+        task = asyncio.create_task(self._analyze_all(directory, records, use_index, events))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            await task
+        finally:
+            # Client went away mid-analysis: stop the workers
+            task.cancel()
+
+        async for operation in self._build_plan(directory, records, folder_index):
+            if operation["type"] == "summary":
+                operation["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+            yield operation
+
+        self.plans += 1
+        self.files_planned += len(records)
+        logger.info("🗂️ Planned {files} files under {directory} in {ms}ms", files=len(records),
+                    directory=directory, ms=int((time.perf_counter() - started) * 1000))
+
+    def stats(self) -> Dict[str, int]:
+        return {"plans": self.plans, "files_planned": self.files_planned}
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+SilentSort Document Extractors
+PDF, DOCX and XLSX text extraction in a process pool, cached by content hash
+"""
+
+import os
+import asyncio
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from content_reader import ContentReadError, max_file_size_bytes, preview_chars
+from fingerprint_index import file_fingerprint
+
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+        from PyPDF2.errors import PyPdfError
+    except ImportError:
+        PdfReader = None
+        PyPdfError = ContentReadError
+
+DOCUMENT_EXTENSIONS = {".pdf", ".docx", ".xlsx"}
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_S_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def is_document(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in DOCUMENT_EXTENSIONS
+
+
+# ============================================================================
+# EXTRACTORS (run inside pool processes; must stay module-level and picklable)
+# ============================================================================
+
+def _extract_pdf(path: str, max_chars: int, max_pages: int) -> str:
+    if PdfReader is None:
+        raise ContentReadError("PDF extraction requires pypdf")
+    reader = PdfReader(path)
+    parts: List[str] = []
+    total = 0
+    for page in reader.pages[:max_pages]:
+        text = page.extract_text() or ""
+        parts.append(text)
+        total += len(text)
+        if total >= max_chars:
+            break
+    return "\n".join(parts)
+
+
+def _extract_docx(path: str, max_chars: int, max_pages: int) -> str:
+    """Paragraph text from word/document.xml, streamed until the preview is full"""
+    parts: List[str] = []
+    total = 0
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+        for _, element in ElementTree.iterparse(xml, events=("end",)):
+            if element.tag == f"{_W_NS}t" and element.text:
+                parts.append(element.text)
+                total += len(element.text)
+            elif element.tag == f"{_W_NS}p":
+                parts.append("\n")
+                element.clear()
+                if total >= max_chars:
+                    break
+    return "".join(parts)
+
+
+def _xlsx_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings: List[str] = []
+    with archive.open("xl/sharedStrings.xml") as xml:
+        for _, element in ElementTree.iterparse(xml, events=("end",)):
+            if element.tag == f"{_S_NS}si":
+                strings.append("".join(t.text or "" for t in element.iter(f"{_S_NS}t")))
+                element.clear()
+    return strings
+
+
+def _extract_xlsx(path: str, max_chars: int, max_sheets: int) -> str:
+    """Cell values of the first sheets as tab-separated rows"""
+    lines: List[str] = []
+    total = 0
+    with zipfile.ZipFile(path) as archive:
+        shared = _xlsx_shared_strings(archive)
+        sheets = sorted(
+            (name for name in archive.namelist()
+             if name.startswith("xl/worksheets/sheet") and name.endswith(".xml")),
+            key=lambda name: int("".join(ch for ch in name if ch.isdigit()) or 0),
+        )
+        for sheet in sheets[:max_sheets]:
+            with archive.open(sheet) as xml:
+                for _, row in ElementTree.iterparse(xml, events=("end",)):
+                    if row.tag != f"{_S_NS}row":
+                        continue
+                    values = []
+                    for cell in row.iter(f"{_S_NS}c"):
+                        kind = cell.get("t")
+                        if kind == "inlineStr":
+                            values.append("".join(t.text or "" for t in cell.iter(f"{_S_NS}t")))
+                            continue
+                        value = cell.find(f"{_S_NS}v")
+                        if value is None or value.text is None:
+                            continue
+                        if kind == "s":
+                            index = int(value.text)
+                            values.append(shared[index] if index < len(shared) else "")
+                        else:
+                            values.append(value.text)
+                    row.clear()
+                    line = "\t".join(values)
+                    lines.append(line)
+                    total += len(line) + 1
+                    if total >= max_chars:
+                        return "\n".join(lines)
+    return "\n".join(lines)
+
+
+_EXTRACTORS = {".pdf": _extract_pdf, ".docx": _extract_docx, ".xlsx": _extract_xlsx}
+
+
+def extract_document_text(path: str, max_chars: int, max_pages: int) -> str:
+    """Text of the first `max_pages` pages/sheets of a document, cut to `max_chars`"""
+    extractor = _EXTRACTORS[os.path.splitext(path)[1].lower()]
+    try:
+        return extractor(path, max_chars, max_pages)[:max_chars]
+    except ContentReadError:
+        raise
+    # Malformed documents surface as any of these, depending on where the parser gives up
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, PyPdfError, ValueError, OSError) as e:
+        raise ContentReadError(f"Cannot extract text from {path}: {e}") from e
+
+
+# ============================================================================
+# PROCESS POOL + CACHE
+# ============================================================================
+
+class DocumentExtractor:
+    """Runs document extraction in worker processes so parsing never blocks the event loop.
+
+    Results are cached by content fingerprint, so the same document seen again
+    (re-analysis, a copy in another folder) costs one hash instead of a parse.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pages: int = 5, cache_size: int = 2048):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_pages = max(1, max_pages)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats: Dict[str, int] = {"extracted": 0, "cache_hits": 0}
+
+    @classmethod
+    def from_env(cls) -> "DocumentExtractor":
+        workers = int(os.getenv("EXTRACTION_WORKERS", "0")) or None
+        return cls(
+            workers=workers,
+            max_pages=int(os.getenv("EXTRACTION_MAX_PAGES", "5")),
+            cache_size=int(os.getenv("EXTRACTION_CACHE_SIZE", "2048")),
+        )
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def warm(self) -> None:
+        """Start the worker processes now instead of on the first document"""
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        await asyncio.gather(*(loop.run_in_executor(pool, os.getpid) for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def extract(self, path: str, max_chars: Optional[int] = None) -> Tuple[str, int]:
+        """Return (preview text, file size) for a PDF/DOCX/XLSX file"""
+        max_chars = preview_chars() if max_chars is None else max_chars
+        try:
+            size = os.path.getsize(path)
+        except OSError as e:
+            raise ContentReadError(f"Cannot read {path}: {e.strerror}") from e
+        if size > max_file_size_bytes():
+            raise ContentReadError(f"File is {size} bytes, above MAX_FILE_SIZE_MB")
+
+        try:
+            key = (await asyncio.to_thread(file_fingerprint, path), max_chars)
+        except OSError as e:
+            raise ContentReadError(f"Cannot read {path}: {e.strerror}") from e
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return cached, size
+
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(
+            self._executor(), extract_document_text, path, max_chars, self.max_pages
+        )
+        self.stats["extracted"] += 1
+        self._cache[key] = text
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text, size
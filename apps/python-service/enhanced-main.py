@@ -8,10 +8,12 @@ import os
 import json
 import time
 import re
+import asyncio
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
@@ -21,6 +23,21 @@ import openai
 from dotenv import load_dotenv
 load_dotenv()
 
+from loguru import logger
+from service_logging import configure_logging
+from warmup import Warmup
+from folder_index import FolderIndexRegistry
+from name_allocator import NameAllocator, allocate_suggested_name
+from llm_cassette import Cassette, CassetteOpenAIClient
+from mock_llm import MockOpenAIClient, mock_llm_enabled
+from rules_engine import (
+    extract_entities, generate_technical_tags, determine_category, generate_smart_filename, generate_folder_suggestions
+)
+from usage_tracker import UsageTracker
+
+# Configure logging
+configure_logging("enhanced-ai-entity-extraction")
+
 # FastAPI app setup
 app = FastAPI(
     title="SilentSort Enhanced AI Service",
@@ -68,6 +85,7 @@ class FileAnalysisResponse(BaseModel):
     extracted_entities: ExtractedEntities
     folder_suggestions: List[Dict[str, Any]] = []  # NEW: Folder suggestions
     processing_time_ms: int
+    usage: Optional[Dict[str, Any]] = None  # LLM calls, tokens and cost of this analysis
 
 class HealthResponse(BaseModel):
     status: str
@@ -75,463 +93,29 @@ class HealthResponse(BaseModel):
     openai_configured: bool
     service_type: str
 
-# Initialize OpenAI
+# Initialize OpenAI (wrapped in a cassette when LLM_CASSETTE is set; replay needs no API key)
 openai_client = None
-if os.getenv("OPENAI_API_KEY"):
+if mock_llm_enabled():
+    openai_client = MockOpenAIClient()
+elif os.getenv("OPENAI_API_KEY"):
     openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+llm_cassette = Cassette.from_env()
+if llm_cassette and (openai_client or llm_cassette.replaying):
+    openai_client = CassetteOpenAIClient(openai_client, llm_cassette)
 
-def extract_entities(content: str) -> Dict[str, Any]:
-    """Extract technical entities from content dynamically"""
-    entities = {}
-    content_lower = content.lower()
-    
-    # Budget extraction - multiple patterns
-    budget_patterns = [
-        r'budget[:\s-]*\$?([0-9,]+)',
-        r'project budget[:\s-]*\$?([0-9,]+)',
-        r'total[:\s-]*\$?([0-9,]+)',
-        r'\$([0-9,]+)',
-    ]
-    for pattern in budget_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            amount = match.group(1).replace(',', '')
-            if amount.isdigit() and int(amount) >= 1000:  # Only meaningful amounts
-                entities['budget'] = f"${amount}"
-                entities['amount'] = f"${amount}"
-                break
-    
-    # Team size extraction
-    team_patterns = [
-        r'team[:\s-]*([0-9]+)\s*developers?',
-        r'([0-9]+)\s*developers?',
-        r'team size[:\s-]*([0-9]+)',
-    ]
-    for pattern in team_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            size = int(match.group(1))
-            if 1 <= size <= 100:  # Reasonable team size
-                entities['team_size'] = f"{size} developers"
-                break
-    
-    # Dynamic deadline extraction
-    deadline_patterns = [
-        r'deadline[:\s-]*([A-Za-z]+ \d{4})',
-        r'due[:\s-]*([A-Za-z]+ \d{4})',
-        r'completion[:\s-]*([A-Za-z]+ \d{4})',
-    ]
-    for pattern in deadline_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            entities['deadline'] = match.group(1)
-            break
-    
-    # Dynamic technology extraction
-    tech_keywords = ['ai', 'artificial intelligence', 'machine learning', 'ml', 'react', 'python', 
-                     'javascript', 'typescript', 'node', 'angular', 'vue', 'docker', 'kubernetes',
-                     'aws', 'azure', 'gcp', 'blockchain', 'data science', 'analytics']
-    found_tech = []
-    for tech in tech_keywords:
-        if tech in content_lower:
-            tech_name = tech.upper() if len(tech) <= 3 else tech.title()
-            if tech_name not in found_tech:
-                found_tech.append(tech_name)
-    
-    if found_tech:
-        entities['technology'] = found_tech[:4]  # Limit to most relevant
-    
-    # Dynamic company extraction (from content, not hard-coded)
-    # Look for company patterns
-    company_patterns = [
-        r'client[:\s-]*([A-Z][a-zA-Z\s]+(?:Inc|Corp|Corporation|Ltd|LLC)?)',
-        r'company[:\s-]*([A-Z][a-zA-Z\s]+(?:Inc|Corp|Corporation|Ltd|LLC)?)',
-        r'vendor[:\s-]*([A-Z][a-zA-Z\s]+(?:Inc|Corp|Corporation|Ltd|LLC)?)',
-    ]
-    for pattern in company_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            company_name = match.group(1).strip()
-            if len(company_name) <= 20:  # Reasonable company name length
-                entities['company'] = company_name
-                break
-    
-    # Invoice number extraction
-    invoice_patterns = [
-        r'invoice[:\s#-]*([A-Z0-9-]+)',
-        r'inv[:\s#-]*([A-Z0-9-]+)',
-        r'#([A-Z0-9-]{3,})',
-    ]
-    for pattern in invoice_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            inv_num = match.group(1)
-            if len(inv_num) >= 3:
-                entities['invoice_number'] = inv_num
-                break
-    
-    return entities
-
-def generate_technical_tags(content: str, entities: Dict[str, Any]) -> List[str]:
-    """Generate technical, actionable tags"""
-    tags = []
-    
-    # Budget-based tags
-    if entities.get('budget'):
-        amount = entities['budget'].replace('$', '').replace(',', '')
-        if amount.isdigit() and int(amount) >= 1000:
-            tags.append(f"budget-{int(amount)//1000}k")
-    
-    # Team tags
-    if entities.get('team_size'):
-        size = re.search(r'(\d+)', entities['team_size'])
-        if size:
-            tags.append(f"team-{size.group(1)}-developers")
-    
-    # Deadline tags
-    if entities.get('deadline'):
-        if 'march 2024' in entities['deadline'].lower():
-            tags.append("deadline-march-2024")
-    
-    # Technology tags
-    for tech in entities.get('technology', []):
-        tags.append(f"tech-{tech.lower()}")
-    
-    # Document type tags
-    content_lower = content.lower()
-    if 'proposal' in content_lower:
-        tags.append("document-type-proposal")
-    if 'invoice' in content_lower:
-        tags.append("document-type-invoice")
-    if 'budget' in content_lower:
-        tags.append("contains-financial-data")
-    
-    # Company tags
-    if entities.get('company'):
-        tags.append(f"vendor-{entities['company'].lower()}")
-    
-    return tags
-
-def determine_category(content: str, entities: Dict[str, Any]) -> Tuple[str, str]:
-    """Determine domain-specific category and subcategory with content-first analysis"""
-    content_lower = content.lower()
-    
-    # RESUME DETECTION (HIGHEST PRIORITY - should override misleading filenames)
-    resume_indicators = [
-        'professional summary', 'work experience', 'education', 'technical skills',
-        'employment history', 'career objective', 'achievements', 'certifications',
-        'software engineer', 'years of experience', 'bachelor', 'master', 'degree',
-        'programming languages', 'frameworks', 'databases', 'contact information'
-    ]
-    resume_score = sum(1 for indicator in resume_indicators if indicator in content_lower)
-    
-    # Strong resume detection (3+ indicators = definitely a resume)
-    if resume_score >= 3:
-        if any('software' in tech.lower() or 'engineer' in content_lower for tech in entities.get('technology', [])):
-            return "resume", "software-engineer"
-        return "resume", "professional"
-    
-    # Medium resume detection (2 indicators = likely resume, especially if filename is misleading)
-    if resume_score >= 2:
-        return "resume", "professional"
-    
-    # Project proposal detection (high priority)
-    if 'project proposal' in content_lower or 'proposal:' in content_lower:
-        if any('ai' in tech.lower() for tech in entities.get('technology', [])):
-            return "project-proposal", "ai-development"
-        return "project-proposal", "software-development"
-    
-    # REAL Invoice detection (check for actual invoice content, not just filename)
-    invoice_content_indicators = [
-        'bill to', 'amount due', 'payment terms', 'invoice date', 'due date',
-        'subtotal', 'tax amount', 'total amount', 'payment method', 'vendor',
-        'line items', 'quantity', 'unit price', 'description'
-    ]
-    invoice_score = sum(1 for indicator in invoice_content_indicators if indicator in content_lower)
-    
-    # Only classify as invoice if content actually looks like an invoice (2+ indicators)
-    if invoice_score >= 2:
-        return "invoice", "vendor-invoice"
-    
-    # Meeting notes detection
-    if 'meeting' in content_lower or 'standup' in content_lower or 'agenda' in content_lower:
-        return "meeting-notes", "team-meeting"
-    
-    # Report detection
-    if ('report' in content_lower and 'executive summary' in content_lower) or 'findings' in content_lower:
-        if 'quarterly' in content_lower:
-            return "report", "quarterly-report"
-        return "report", "business-report"
-    
-    # Contract/Legal document detection
-    if any(term in content_lower for term in ['contract', 'agreement', 'terms and conditions', 'legal']):
-        return "contract", "legal-document"
-    
-    # Code documentation detection
-    if any(term in content_lower for term in ['function', 'class', 'import', 'def ', 'const ', 'var ']):
-        return "code", "documentation"
-    
-    # Default fallback (when content doesn't clearly indicate specific type)
-    return "document", "general"
+# Tokens and cost of every OpenAI response, with the daily budget cap
+usage_tracker = UsageTracker.from_env()
 
-def generate_smart_filename(content: str, entities: Dict[str, Any], category: str, original_extension: str) -> str:
-    """Generate semantic filenames based on actual content analysis"""
-    
-    parts = []
-    content_lower = content.lower()
-    
-    # Start with document type based on content analysis (IGNORE MISLEADING FILENAMES)
-    if category == "resume":
-        parts.append("resume")
-        
-        # Extract person's name from content
-        name_patterns = [
-            r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b',  # First Last
-            r'\b([A-Z][A-Z]+ [A-Z][a-z]+)\b',  # FIRST Last  
-            r'^([A-Z][a-z]+ [A-Z][a-z]+)',     # At start of content
-        ]
-        
-        person_name = None
-        for pattern in name_patterns:
-            match = re.search(pattern, content)
-            if match:
-                name = match.group(1)
-                # Avoid common false positives
-                if not any(word in name.lower() for word in ['professional', 'technical', 'work', 'experience', 'software']):
-                    person_name = name.lower().replace(' ', '-')
-                    break
-        
-        if person_name:
-            parts.append(person_name)
-        
-        # Add profession/role
-        if 'software engineer' in content_lower:
-            parts.append('software-engineer')
-        elif 'data scientist' in content_lower:
-            parts.append('data-scientist')
-        elif 'developer' in content_lower:
-            parts.append('developer')
-        elif 'engineer' in content_lower:
-            parts.append('engineer')
-        
-        # Add key technology
-        if entities.get('technology'):
-            main_tech = entities['technology'][0].lower().replace(' ', '-').replace('machine-learning', 'ml')
-            parts.append(main_tech)
-        
-        # Add experience level if found
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*of\s*experience',
-            r'(\d+)\+?\s*years?\s*experience',
-            r'(\d+)\+?\s*yrs?\s*experience'
-        ]
-        for pattern in experience_patterns:
-            match = re.search(pattern, content_lower)
-            if match:
-                years = int(match.group(1))
-                if 1 <= years <= 20:  # Reasonable range
-                    parts.append(f"{years}yrs")
-                break
-    
-    elif category == "project-proposal":
-        parts.append("project-proposal")
-        
-        # Add main technology focus
-        if entities.get('technology'):
-            # Use most relevant tech (first 2)
-            tech_terms = [t.lower().replace(' ', '-').replace('machine-learning', 'ml') 
-                         for t in entities['technology'][:2]]
-            parts.extend(tech_terms)
-        
-        # Add company name if found
-        if entities.get('company'):
-            company_clean = entities['company'].lower().replace(' ', '-').replace('corporation', 'corp')
-            parts.append(company_clean)
-        
-        # Add budget context
-        if entities.get('budget'):
-            budget_clean = entities['budget'].replace('$', '').replace(',', '')
-            if budget_clean.isdigit():
-                budget_k = int(budget_clean) // 1000
-                if budget_k > 0:
-                    parts.append(f"{budget_k}k")
-    
-    elif category == "invoice":
-        parts.append("invoice")
-        
-        # Add company if available
-        if entities.get('company'):
-            company_clean = entities['company'].lower().replace(' ', '-')
-            parts.append(company_clean)
-        
-        # Detect product/service from content
-        product_terms = []
-        if 'macbook' in content_lower:
-            product_terms.append('macbook')
-        elif 'software' in content_lower and 'license' in content_lower:
-            product_terms.append('software-license')
-        elif 'consulting' in content_lower:
-            product_terms.append('consulting')
-        elif 'development' in content_lower:
-            product_terms.append('development')
-        
-        if product_terms:
-            parts.extend(product_terms)
-        
-        # Add invoice number if meaningful
-        if entities.get('invoice_number') and len(entities['invoice_number']) <= 10:
-            parts.append(entities['invoice_number'].lower())
-    
-    elif category == "meeting-notes":
-        parts.append("meeting-notes")
-        
-        # Add meeting type from content
-        if 'standup' in content_lower:
-            parts.append('standup')
-        elif 'planning' in content_lower:
-            parts.append('planning')
-        elif 'review' in content_lower:
-            parts.append('review')
-        elif 'kickoff' in content_lower:
-            parts.append('kickoff')
-        
-        # Add technology context
-        if entities.get('technology'):
-            tech = entities['technology'][0].lower().replace(' ', '-')
-            parts.append(tech)
-    
-    elif category == "report":
-        # Add report type
-        if 'quarterly' in content_lower:
-            parts.append('quarterly-report')
-        elif 'annual' in content_lower:
-            parts.append('annual-report')
-        elif 'status' in content_lower:
-            parts.append('status-report')
-        else:
-            parts.append('report')
-        
-        # Add subject matter
-        if entities.get('technology'):
-            tech = entities['technology'][0].lower().replace(' ', '-')
-            parts.append(tech)
-    
-    else:
-        # Generic document - extract key terms from content
-        parts.append("document")
-        
-        # Extract meaningful terms from content
-        important_words = []
-        
-        # Look for key business terms
-        business_terms = ['budget', 'proposal', 'agreement', 'contract', 'specification', 
-                         'requirements', 'analysis', 'strategy', 'plan', 'guide']
-        for term in business_terms:
-            if term in content_lower:
-                important_words.append(term)
-                break
-        
-        # Add technology if present
-        if entities.get('technology'):
-            tech = entities['technology'][0].lower().replace(' ', '-')
-            important_words.append(tech)
-        
-        parts.extend(important_words[:2])
-    
-    # If we still don't have enough meaningful parts, extract from content
-    if len(parts) <= 2:
-        # Extract key nouns and meaningful terms
-        content_words = re.findall(r'\b[A-Z][a-zA-Z]{3,}\b', content)  # Capitalized words
-        meaningful_words = [w.lower() for w in content_words[:3] 
-                           if w.lower() not in ['this', 'that', 'with', 'from', 'they', 'have', 'will', 'the']]
-        parts.extend(meaningful_words[:2])
-    
-    # Add time context for time-sensitive documents
-    if any(word in content_lower for word in ['2024', '2025', 'q1', 'q2', 'q3', 'q4']):
-        if '2024' in content_lower:
-            parts.append('2024')
-        elif '2025' in content_lower:
-            parts.append('2025')
-    
-    # Clean up and join parts
-    if not parts:
-        # Last resort: use category + descriptive term
-        parts = [category, "document"]
-    
-    # Remove empty parts and clean
-    parts = [p for p in parts if p and len(p) > 1]
-    filename = "-".join(parts)
-    
-    # Clean filename
-    filename = re.sub(r'[^a-zA-Z0-9-]', '', filename)  # Remove special chars
-    filename = re.sub(r'-+', '-', filename)  # Remove multiple dashes
-    filename = filename.strip('-')  # Remove leading/trailing dashes
-    
-    # Ensure reasonable length
-    if len(filename) > 60:
-        filename = filename[:60].rstrip('-')
-    
-    # Ensure minimum length
-    if len(filename) < 8:
-        filename = f"{category}-document"
-    
-    return f"{filename}{original_extension}"
+# Cached index of the folders that already exist under each base directory
+folder_indexes = FolderIndexRegistry.from_env()
 
-def generate_folder_suggestions(original_name: str, category: str, entities: Dict[str, Any], base_directory: str) -> List[Dict[str, Any]]:
-    """Generate intelligent folder suggestions based on content analysis"""
-    suggestions = []
-    
-    # Category-based folder mapping
-    folder_map = {
-        'invoice': 'Finance/Invoices',
-        'receipt': 'Finance/Receipts',
-        'contract': 'Legal/Contracts',
-        'resume': 'Career/Resume',
-        'meeting-notes': 'Work/Meetings',
-        'report': 'Work/Reports',
-        'code': 'Projects/Code',
-        'image': 'Media/Images',
-        'document': 'Files'
-    }
-    
-    # Primary suggestion based on category
-    primary_folder = folder_map.get(category, 'Files')
-    full_path = f"{base_directory}/{primary_folder}"
-    
-    suggestions.append({
-        "path": full_path,
-        "confidence": 0.95,
-        "reasoning": f"AI detected content type: {category}. Files of this type belong in {primary_folder}",
-        "category": category
-    })
-    
-    # Entity-based suggestions
-    if entities.get('company') and category in ['invoice', 'receipt', 'contract']:
-        company_folder = f"{base_directory}/{primary_folder}/{entities['company']}"
-        suggestions.append({
-            "path": company_folder,
-            "confidence": 0.90,
-            "reasoning": f"Company-specific organization for {entities['company']} documents",
-            "category": f"{category}-company"
-        })
-    
-    # Date-based suggestions for time-sensitive documents
-    if category in ['invoice', 'receipt', 'report'] and entities.get('deadline'):
-        year = "2024" if "2024" in entities['deadline'] else "2025"
-        date_folder = f"{base_directory}/{primary_folder}/{year}"
-        suggestions.append({
-            "path": date_folder,
-            "confidence": 0.85,
-            "reasoning": f"Date-based organization for {year} documents",
-            "category": f"{category}-date"
-        })
-    
-    return suggestions
+# Names handed out per directory, so suggestions never collide (None when disabled)
+name_allocator = NameAllocator.from_env()
 
-async def analyze_file_enhanced(request: FileAnalysisRequest) -> FileAnalysisResponse:
-    """Enhanced file analysis with entity extraction and folder intelligence"""
+async def analyze_file_enhanced(request: FileAnalysisRequest, use_llm: bool = True) -> FileAnalysisResponse:
+    """Enhanced file analysis with entity extraction and folder intelligence (rules only without `use_llm`)"""
     
-    if not openai_client:
+    if use_llm and not openai_client:
         raise HTTPException(status_code=500, detail="OpenAI not configured")
     
     content = request.content_preview or ""
@@ -548,11 +132,26 @@ async def analyze_file_enhanced(request: FileAnalysisRequest) -> FileAnalysisRes
     # Generate folder suggestions if requested
     folder_suggestions = []
     if request.include_folder_suggestions:
+        base_directory = request.base_directory or "/Users/pranjal/Downloads/silentsort-test"
         folder_suggestions = generate_folder_suggestions(
             request.original_name,
             category,
             entities,
-            request.base_directory or "/Users/pranjal/Downloads/silentsort-test"
+            base_directory,
+            await folder_indexes.get(base_directory)
+        )
+    
+    if not use_llm:
+        return FileAnalysisResponse(
+            suggested_name=generate_smart_filename(content, entities, category, request.file_extension),
+            confidence=0.85,
+            category=category,
+            subcategory=subcategory,
+            reasoning="Smart semantic naming: daily LLM budget reached",
+            technical_tags=technical_tags,
+            extracted_entities=ExtractedEntities(**entities),
+            folder_suggestions=folder_suggestions,
+            processing_time_ms=0
         )
     
     # Enhanced prompt with entity context and naming examples
@@ -586,8 +185,12 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
 }}"""
 
     try:
-        print(f"🔍 DEBUG: Calling OpenAI for {request.original_name}")
-        print(f"🔍 DEBUG: Category: {category}, Entities: {entities}")
+        logger.debug(
+            "🔍 Calling OpenAI for {file} (category={category})",
+            file=request.original_name,
+            category=category,
+            entities=entities,
+        )
         
         response = openai_client.chat.completions.create(
             model="gpt-4o-mini",
@@ -598,16 +201,18 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
             max_tokens=500,
             temperature=0.3,
         )
+        usage_tracker.record("naming", response)
         
         response_content = response.choices[0].message.content.strip()
-        print(f"🔍 DEBUG: OpenAI raw response: {response_content[:200]}")
+        # Raw responses are only rendered when debug output is enabled
+        logger.opt(lazy=True).debug("🔍 OpenAI raw response: {}", lambda: response_content[:200])
         
         # Clean response if it has markdown formatting
         if response_content.startswith('```json'):
             response_content = response_content.replace('```json', '').replace('```', '').strip()
         
         result = json.loads(response_content)
-        print(f"✅ DEBUG: OpenAI succeeded with: {result.get('suggestedName')}")
+        logger.debug("✅ OpenAI suggested {suggested_name}", suggested_name=result.get("suggestedName"))
         
         return FileAnalysisResponse(
             suggested_name=result.get("suggestedName", request.original_name),
@@ -624,11 +229,10 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
         )
         
     except json.JSONDecodeError as e:
-        print(f"❌ DEBUG: JSON parsing failed: {str(e)}")
-        print(f"❌ DEBUG: Raw response was: {response.choices[0].message.content if 'response' in locals() else 'No response'}")
+        logger.warning("❌ JSON parsing failed for {file}: {error}", file=request.original_name, error=str(e))
         # Smart fallback using extracted entities
         smart_filename = generate_smart_filename(content, entities, category, request.file_extension)
-        print(f"🔄 DEBUG: Using smart fallback: {smart_filename}")
+        logger.debug("🔄 Using smart fallback: {suggested_name}", suggested_name=smart_filename)
         
         return FileAnalysisResponse(
             suggested_name=smart_filename,
@@ -644,10 +248,10 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
         )
         
     except Exception as e:
-        print(f"❌ DEBUG: OpenAI call failed: {str(e)}")
+        logger.warning("❌ OpenAI call failed for {file}: {error}", file=request.original_name, error=str(e))
         # Smart fallback using extracted entities
         smart_filename = generate_smart_filename(content, entities, category, request.file_extension)
-        print(f"🔄 DEBUG: Using smart fallback: {smart_filename}")
+        logger.debug("🔄 Using smart fallback: {suggested_name}", suggested_name=smart_filename)
         
         return FileAnalysisResponse(
             suggested_name=smart_filename,
@@ -662,6 +266,43 @@ IMPORTANT: Respond ONLY with valid JSON in this exact format:
             processing_time_ms=0
         )
 
+# Warm-up: regexes are compiled and cached by the first pass through the rules
+# engine, and the OpenAI client's HTTPS connection is opened before traffic arrives
+warmup = Warmup()
+
+WARMUP_SAMPLE = (
+    "Invoice INV-2024-001 from Acme Corp. Amount due: $12,500.00 by March 15, 2024. "
+    "Project Phoenix uses React, Python and AWS; team of 8 engineers."
+)
+
+@warmup.step("rules_engine")
+async def warm_rules_engine():
+    entities = extract_entities(WARMUP_SAMPLE)
+    category, _ = determine_category(WARMUP_SAMPLE, entities)
+    generate_technical_tags(WARMUP_SAMPLE, entities)
+    generate_smart_filename(WARMUP_SAMPLE, entities, category, ".pdf")
+    generate_folder_suggestions("invoice.pdf", category, entities, "")
+
+@warmup.step("llm_connection")
+async def warm_llm_connection():
+    if openai_client:
+        await asyncio.to_thread(openai_client.models.list)
+
+@app.on_event("startup")
+async def start_warmup():
+    warmup.start()
+
+@app.on_event("shutdown")
+async def stop_warmup():
+    await warmup.stop()
+
+@app.get("/ready")
+async def readiness():
+    """Readiness probe: 503 until the startup warm-up has finished"""
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=warmup.status())
+    return warmup.status()
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     return HealthResponse(
@@ -676,12 +317,26 @@ async def analyze_file(request: FileAnalysisRequest):
     start_time = time.time()
     
     try:
-        result = await analyze_file_enhanced(request)
+        # Over the daily LLM budget the rules engine answers on its own
+        over_budget = usage_tracker.over_budget()
+        with usage_tracker.request("rules" if over_budget else "enhanced") as usage:
+            result = await analyze_file_enhanced(request, use_llm=not over_budget)
+        result.usage = usage.as_dict()
+        # Unique in the file's directory; a collision is disambiguated by the company first
+        entities = result.extracted_entities
+        result.suggested_name = await asyncio.to_thread(
+            allocate_suggested_name, name_allocator, request.file_path, result.suggested_name,
+            entities.company or entities.invoice_number
+        )
         result.processing_time_ms = int((time.time() - start_time) * 1000)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.get("/metrics")
+async def metrics():
+    return {"usage": usage_tracker.metrics()}
+
 @app.get("/")
 async def root():
     return {
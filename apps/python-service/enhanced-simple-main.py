@@ -8,6 +8,7 @@ import os
 import json
 import time
 import re
+import asyncio
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -17,6 +18,10 @@ from pydantic import BaseModel, Field
 import uvicorn
 import openai
 
+from name_allocator import NameAllocator, allocate_suggested_name
+from usage_tracker import UsageTracker
+from rules_engine import analyze_with_rules
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
@@ -68,6 +73,7 @@ class FileAnalysisResponse(BaseModel):
     technical_tags: List[str] = Field(default=[], description="Technical, actionable tags")
     extracted_entities: ExtractedEntities = Field(default_factory=ExtractedEntities, description="Extracted business entities")
     processing_time_ms: int = Field(..., description="Processing time in milliseconds")
+    usage: Optional[Dict[str, Any]] = Field(None, description="LLM calls, tokens and cost of this analysis")
 
 class HealthResponse(BaseModel):
     status: str
@@ -81,6 +87,12 @@ openai_client = None
 if os.getenv("OPENAI_API_KEY"):
     openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Names handed out per directory, so suggestions never collide
+name_allocator = NameAllocator.from_env()
+
+# Tokens and cost of every OpenAI response, with the daily budget cap
+usage_tracker = UsageTracker.from_env()
+
 class EntityExtractor:
     """Extract technical entities from file content"""
     
@@ -313,10 +325,10 @@ def determine_category_and_subcategory(content: str, entities: Dict[str, Any]) -
     # Default to document
     return "document", "general"
 
-async def analyze_file_with_enhanced_ai(request: FileAnalysisRequest) -> FileAnalysisResponse:
-    """Analyze file using enhanced AI with entity extraction"""
+async def analyze_file_with_enhanced_ai(request: FileAnalysisRequest, use_llm: bool = True) -> FileAnalysisResponse:
+    """Analyze file using enhanced AI with entity extraction (rules only without `use_llm`)"""
     
-    if not openai_client:
+    if use_llm and not openai_client:
         raise HTTPException(status_code=500, detail="OpenAI not configured")
     
     content = request.content_preview or ""
@@ -335,6 +347,18 @@ async def analyze_file_with_enhanced_ai(request: FileAnalysisRequest) -> FileAna
     # Determine category and subcategory
     category, subcategory = determine_category_and_subcategory(content, all_entities)
     
+    if not use_llm:
+        return FileAnalysisResponse(
+            suggested_name=analyze_with_rules(request.original_name, content, request.file_extension)["suggested_name"],
+            confidence=0.6,
+            category=category,
+            subcategory=subcategory,
+            reasoning="Rules engine naming with entity extraction: daily LLM budget reached",
+            technical_tags=technical_tags,
+            extracted_entities=ExtractedEntities(**all_entities),
+            processing_time_ms=0
+        )
+    
     # Build enhanced analysis prompt
     prompt = f"""You are an expert file organizer with advanced entity extraction capabilities. Analyze this file and suggest a better, descriptive filename.
 
@@ -379,6 +403,7 @@ Only respond with valid JSON, no additional text."""
             max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "500")),
             temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
         )
+        usage_tracker.record("naming", response)
         
         content_response = response.choices[0].message.content
         if not content_response:
@@ -446,7 +471,17 @@ async def analyze_file(request: FileAnalysisRequest):
     start_time = time.time()
     
     try:
-        result = await analyze_file_with_enhanced_ai(request)
+        # Over the daily LLM budget the rules engine answers on its own
+        over_budget = usage_tracker.over_budget()
+        with usage_tracker.request("rules" if over_budget else "enhanced-simple") as usage:
+            result = await analyze_file_with_enhanced_ai(request, use_llm=not over_budget)
+        result.usage = usage.as_dict()
+        entities = result.extracted_entities
+        # Off the event loop: the first name in a directory lists it
+        result.suggested_name = await asyncio.to_thread(
+            allocate_suggested_name, name_allocator, request.file_path, result.suggested_name,
+            entities.company or entities.invoice_number or entities.po_number
+        )
         
         # Calculate processing time
         processing_time = int((time.time() - start_time) * 1000)
@@ -459,6 +494,11 @@ async def analyze_file(request: FileAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Enhanced analysis failed: {str(e)}")
 
+@app.get("/metrics")
+async def metrics():
+    """Token usage and cost"""
+    return {"usage": usage_tracker.metrics()}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -479,6 +519,7 @@ async def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze-file",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+SilentSort File Grouping
+Groups related files (same project, same vendor) by the similarity of their
+names and previews: a TF-IDF matrix over everything the service has seen,
+clustered with spherical k-means
+"""
+
+import os
+import re
+import time
+import asyncio
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+# Rows per sealed block of the term-count matrix
+BLOCK_ROWS = 4096
+
+# Rows of replaced or removed files, as a fraction of all rows, above which the matrix is compacted
+COMPACT_DEAD_FRACTION = 0.25
+# Once the rows reach max_documents, compact as soon as this fraction of max_documents is dead
+COMPACT_AT_CAP_FRACTION = 0.01
+
+# Directories whose last centroids are kept for warm starts
+MAX_WARM_SCOPES = 32
+
+_WORD = re.compile(r"[a-z][a-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have in into is it its of on or that the their this to was
+were will with we our you your not all any can may per via than then there these those which who
+""".split())
+
+
+def tokenize(original_name: str, content: str) -> List[str]:
+    """Words of the file name (camelCase and separators split) and of the content, without stopwords"""
+    stem = os.path.splitext(original_name)[0]
+    text = _CAMEL.sub(" ", stem).lower() + " " + content.lower()
+    return [word for word in _WORD.findall(text) if word not in STOPWORDS]
+
+
+class FileGrouper:
+    """Term counts of every file seen, and clustering of any subset of them.
+
+    `add()` tokenizes one file and appends its term counts to the current
+    block (plain arrays, so nothing is rebuilt as files arrive); full blocks
+    are sealed and never change. Files added again replace their old row,
+    or are skipped when their text is unchanged. Old rows stay in place and
+    count towards `max_documents` until more than COMPACT_DEAD_FRACTION of
+    the rows are dead, or COMPACT_AT_CAP_FRACTION of `max_documents` once
+    the index is full; then a background task rebuilds the blocks from the
+    live rows in a worker thread and drops the terms no live row uses (files
+    arriving at the limit meanwhile are skipped). `group()` snapshots the blocks and,
+    in a worker thread, turns them into a sparse matrix without copying,
+    weights it by TF-IDF over the selected files and clusters it with
+    spherical k-means, warm-started from the previous centroids. numpy and
+    scipy are only imported on the first `group()` or compaction.
+    """
+
+    def __init__(self, max_documents: int = 200_000, max_chars: int = 2000, max_clusters: int = 500,
+                 min_similarity: float = 0.2, seed: int = 7):
+        self.max_documents = max_documents
+        self.max_chars = max_chars
+        self.max_clusters = max_clusters
+        self.min_similarity = min_similarity
+        self.seed = seed
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.paths: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._digest: Dict[str, int] = {}
+        self._sealed: List[Tuple[array, array, array]] = []  # (indptr, indices, counts) per full block
+        self._indptr, self._indices, self._counts = array("q", [0]), array("i"), array("f")
+        self._version = 0
+        self._cache: Optional[Tuple[Any, Dict[str, Any]]] = None
+        self._centers: Dict[Optional[str], Any] = {}  # Last centroids per directory (None: all files)
+        self._clustering = asyncio.Lock()  # Held by group() and compact(): row ids stay put while either runs
+        self._compacting: Optional[asyncio.Task] = None
+        self.stats = {"added": 0, "replaced": 0, "unchanged": 0, "skipped": 0, "compactions": 0,
+                      "groupings": 0, "last_grouping_ms": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["FileGrouper"]:
+        """None when GROUPING_ENABLED=false"""
+        if os.getenv("GROUPING_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            max_documents=int(os.getenv("GROUPING_MAX_DOCUMENTS", "200000")),
+            max_chars=int(os.getenv("GROUPING_MAX_CHARS", "2000")),
+            max_clusters=int(os.getenv("GROUPING_MAX_CLUSTERS", "500")),
+            min_similarity=float(os.getenv("GROUPING_MIN_SIMILARITY", "0.2")),
+        )
+
+    @property
+    def documents(self) -> int:
+        return len(self._row_of)
+
+    @property
+    def dead_rows(self) -> int:
+        return len(self.paths) - len(self._row_of)
+
+    # ========================================================================
+    # INDEX (incremental)
+    # ========================================================================
+
+    def add(self, file_path: str, original_name: str, content: str) -> bool:
+        """Index one file's name and content; False when unchanged or the index is full"""
+        content = content[:self.max_chars]
+        digest = hash((original_name, content))
+        if self._digest.get(file_path) == digest:
+            self.stats["unchanged"] += 1
+            return False
+        previous = self._row_of.get(file_path)
+        if previous is None and len(self.paths) >= self.max_documents:
+            self._compact_if_sparse()
+            self.stats["skipped"] += 1
+            return False
+
+        counts: Dict[int, int] = {}
+        for word in tokenize(original_name, content):
+            term = self.vocabulary.get(word)
+            if term is None:
+                term = self.vocabulary[word] = len(self.terms)
+                self.terms.append(word)
+            counts[term] = counts.get(term, 0) + 1
+        self._append_row(counts.keys(), counts.values())
+
+        # A replaced file's old row stays in its block but is no longer selected
+        self.stats["replaced"] += previous is not None
+        self._row_of[file_path] = len(self.paths)
+        self._digest[file_path] = digest
+        self.paths.append(file_path)
+        self.stats["added"] += 1
+        self._version += 1
+        self._compact_if_sparse()
+        return True
+
+    def remove(self, file_path: str) -> bool:
+        if self._row_of.pop(file_path, None) is None:
+            return False
+        self._digest.pop(file_path, None)
+        self._version += 1
+        self._compact_if_sparse()
+        return True
+
+    def _append_row(self, indices, counts) -> None:
+        self._indices.extend(indices)
+        self._counts.extend(counts)
+        self._indptr.append(len(self._indices))
+        if len(self._indptr) > BLOCK_ROWS:
+            self._sealed.append((self._indptr, self._indices, self._counts))
+            self._indptr, self._indices, self._counts = array("q", [0]), array("i"), array("f")
+
+    def _sparse(self) -> bool:
+        dead = self.dead_rows
+        at_cap = len(self.paths) >= self.max_documents
+        return dead > COMPACT_DEAD_FRACTION * len(self.paths) or \
+            (at_cap and dead >= max(1, COMPACT_AT_CAP_FRACTION * self.max_documents))
+
+    def _compact_if_sparse(self) -> None:
+        """Start a background compaction when too many rows are dead; never compacts on the caller's stack"""
+        if self._compacting is not None or not self._sparse():
+            return
+        try:
+            self._compacting = asyncio.get_running_loop().create_task(self.compact())
+        except RuntimeError:
+            return  # No event loop: the next group() compacts first
+        self._compacting.add_done_callback(self._compaction_done)
+
+    def _compaction_done(self, task: asyncio.Task) -> None:
+        self._compacting = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Compacting the grouping index failed: {task.exception()}")
+
+    async def compact(self) -> None:
+        """Rebuild the blocks from the live rows only and drop the terms none of them uses"""
+        async with self._clustering:
+            await self._compact()
+
+    async def _compact(self) -> None:
+        """Compacts a snapshot in a worker thread; files added or removed meanwhile are carried over.
+
+        Paths, terms and blocks are replaced, not changed in place. Callers hold `_clustering`.
+        """
+        if not self._sparse():
+            return
+        live = sorted(self._row_of.items(), key=lambda item: item[1])
+        # Sealed blocks never change; the open block is copied (at most BLOCK_ROWS rows)
+        blocks = self._sealed + [(array("q", self._indptr), array("i", self._indices), array("f", self._counts))]
+        rows, width = len(self.paths), len(self.terms)
+        kept, new_id, compacted = await asyncio.to_thread(
+            compact_rows, blocks, [row for _, row in live], width
+        )
+
+        # Rows added while the thread ran keep their terms: ones added since, or used only by
+        # rows that were dead in the snapshot, get the next free ids
+        import numpy as np
+        terms = [self.terms[old] for old in kept]
+        new_id = np.concatenate([new_id, np.full(len(self.terms) - width, -1, dtype=np.int64)])
+        carried = []
+        for row in range(rows, len(self.paths)):
+            indices, counts = self._row_terms(row)
+            for term in indices:
+                if new_id[term] < 0:
+                    new_id[term] = len(terms)
+                    terms.append(self.terms[term])
+            carried.append(([int(new_id[term]) for term in indices], counts))
+
+        self._remap_centers(new_id)
+        self.terms = terms
+        self.vocabulary = {word: term for term, word in enumerate(self.terms)}
+        position = {path: new_row for new_row, (path, _) in enumerate(live)}
+        self._row_of = {path: position[path] if row < rows else len(live) + row - rows
+                        for path, row in self._row_of.items()}
+        self.paths = [path for path, _ in live] + self.paths[rows:]
+        self._sealed = compacted[:-1]
+        self._indptr, self._indices, self._counts = compacted[-1]
+        for indices, counts in carried:
+            self._append_row(indices, counts)
+        self.stats["compactions"] += 1
+        logger.debug("🗂️ Compacted grouping index to {rows} rows and {terms} terms",
+                     rows=len(self.paths), terms=len(self.terms))
+
+    def _row_terms(self, row: int) -> Tuple[array, array]:
+        """Term ids and counts of one row (sealed blocks hold exactly BLOCK_ROWS rows)"""
+        block, offset = divmod(row, BLOCK_ROWS)
+        indptr, indices, counts = self._sealed[block] if block < len(self._sealed) else \
+            (self._indptr, self._indices, self._counts)
+        start, end = indptr[offset], indptr[offset + 1]
+        return indices[start:end], counts[start:end]
+
+    def _remap_centers(self, new_id) -> None:
+        """Move the warm-start centroids onto the compacted term ids, dropping columns of removed terms"""
+        for scope, (centers, terms) in list(self._centers.items()):
+            moved = new_id[terms]
+            found = moved >= 0
+            self._centers[scope] = (centers[:, found], moved[found])
+
+    def _rows(self, paths: Optional[Sequence[str]], directory: Optional[str]) -> List[int]:
+        if paths:
+            return sorted({self._row_of[path] for path in paths if path in self._row_of})
+        if directory:
+            prefix = directory.rstrip("/") + "/"
+            return sorted(row for path, row in self._row_of.items() if path.startswith(prefix))
+        return sorted(self._row_of.values())
+
+    # ========================================================================
+    # GROUPING
+    # ========================================================================
+
+    def _auto_clusters(self, files: int, previous_centers: Any) -> int:
+        """sqrt(files / 2), kept at the previous count while within 10% so the last centroids stay usable"""
+        clusters = round((files / 2) ** 0.5)
+        if previous_centers is not None:
+            previous = previous_centers[0].shape[0]
+            if abs(clusters - previous) <= previous * 0.1:
+                return previous
+        return clusters
+
+    async def group(self, paths: Optional[Sequence[str]] = None, directory: Optional[str] = None,
+                    k: Optional[int] = None, min_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """Groups of related files among `paths`, the files under `directory`, or everything indexed"""
+        min_similarity = self.min_similarity if min_similarity is None else min_similarity
+        key = (self._version, tuple(paths or ()), directory, k, min_similarity)
+        async with self._clustering:
+            if self._cache and self._cache[0] == key:
+                return {**self._cache[1], "cached": True}
+
+            started = time.perf_counter()
+            await self._compact()  # When due: a background compaction would wait for this lock anyway
+            rows = self._rows(paths, directory)
+            if not rows:
+                return {"files": 0, "groups": [], "ungrouped": [], "clusters": 0, "elapsed_ms": 0, "cached": False}
+            # Sealed blocks never change; the open block is copied (at most BLOCK_ROWS rows)
+            blocks = self._sealed + [(array("q", self._indptr), array("i", self._indices), array("f", self._counts))]
+            # Warm starts apply to the same scope again (an explicit file list has none)
+            scope = directory if not paths else False
+            # Row and term ids below refer to this snapshot; compaction waits for the lock
+            row_paths, terms = self.paths, self.terms
+            previous_centers = self._centers.get(scope) if scope is not False else None
+            clusters = max(1, min(k or self._auto_clusters(len(rows), previous_centers), self.max_clusters, len(rows)))
+            labels, similarity, centers, top_terms = await asyncio.to_thread(
+                cluster_rows, blocks, len(terms), rows, clusters, self.seed, previous_centers
+            )
+            if scope is not False:
+                self._centers.pop(scope, None)
+                self._centers[scope] = centers
+                if len(self._centers) > MAX_WARM_SCOPES:
+                    self._centers.pop(next(iter(self._centers)))
+
+            groups: Dict[int, List[int]] = {}
+            ungrouped = []
+            for position, row in enumerate(rows):
+                if similarity[position] >= min_similarity:
+                    groups.setdefault(int(labels[position]), []).append(position)
+                else:
+                    ungrouped.append(row_paths[row])
+            result_groups = []
+            for cluster, members in groups.items():
+                if len(members) < 2:
+                    ungrouped.extend(row_paths[rows[position]] for position in members)
+                    continue
+                label_terms = [terms[term] for term in top_terms[cluster]]
+                result_groups.append({
+                    "label": "-".join(label_terms[:3]),
+                    "terms": label_terms,
+                    "size": len(members),
+                    "cohesion": round(float(sum(similarity[position] for position in members) / len(members)), 3),
+                    "files": [row_paths[rows[position]] for position in members],
+                })
+            result_groups.sort(key=lambda group: -group["size"])
+
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+            self.stats["groupings"] += 1
+            self.stats["last_grouping_ms"] = elapsed_ms
+            logger.info("🗂️ Grouped {files} files into {groups} groups in {elapsed_ms}ms",
+                        files=len(rows), groups=len(result_groups), elapsed_ms=elapsed_ms)
+            result = {
+                "files": len(rows),
+                "groups": result_groups,
+                "ungrouped": ungrouped,
+                "clusters": clusters,
+                "elapsed_ms": elapsed_ms,
+                "cached": False,
+            }
+            self._cache = (key, result)
+            return result
+
+
+def cluster_rows(blocks: List[Tuple[array, array, array]], width: int, rows: List[int], k: int, seed: int,
+                 previous_centers=None, max_iterations: int = 12, tolerance: float = 0.005,
+                 max_df: float = 0.5, label_terms: int = 5):
+    """Spherical k-means over the TF-IDF rows `rows` of the blocked term-count matrix.
+
+    Returns (cluster per row, cosine similarity to its centroid, centroids
+    with the term id of each column, top term ids per cluster). Terms in one
+    file only, or in more than `max_df` of them (two files always count), are
+    dropped, so centroids only span terms that can link files; weights are
+    sublinear tf times smooth idf.
+    """
+    # numpy/scipy load on first use, not at service start
+    import numpy as np
+    from scipy import sparse
+
+    counts = sparse.vstack([
+        sparse.csr_matrix(
+            (np.frombuffer(data, dtype=np.float32), np.frombuffer(indices, dtype=np.int32),
+             np.frombuffer(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, width),
+        )
+        for indptr, indices, data in blocks
+    ], format="csr")[np.asarray(rows, dtype=np.int64)]
+    n = counts.shape[0]
+
+    # TF-IDF over the selected files, L2-normalized so dot products are cosines
+    df = np.bincount(counts.indices, minlength=width)
+    kept = np.flatnonzero((df >= 2) & (df <= max(max_df * n, 2)))
+    matrix = counts[:, kept]
+    idf = (np.log((1 + n) / (1 + df[kept])) + 1).astype(np.float32)
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    matrix = sparse.diags(1 / np.maximum(norms, 1e-12).astype(np.float32)) @ matrix
+
+    rng = np.random.default_rng(seed)
+    if previous_centers is not None and previous_centers[0].shape[0] == k:
+        # Previous centroids, moved onto this run's columns (terms no longer kept are dropped)
+        old_centers, old_terms = previous_centers
+        centers = np.zeros((k, len(kept)), dtype=np.float32)
+        position = np.searchsorted(kept, old_terms)
+        found = (position < len(kept)) & (kept[np.minimum(position, len(kept) - 1)] == old_terms)
+        centers[:, position[found]] = old_centers[:, found]
+        lengths = np.linalg.norm(centers, axis=1)
+        if (lengths == 0).any():
+            centers = _kmeans_plus_plus(matrix, k, rng)
+        else:
+            centers /= lengths[:, None]
+    else:
+        centers = _kmeans_plus_plus(matrix, k, rng)
+
+    labels = None
+    for _ in range(max_iterations):
+        similarities = np.asarray(matrix @ centers.T)
+        assigned = similarities.argmax(axis=1)
+        if labels is not None and np.mean(assigned != labels) < tolerance:
+            labels = assigned
+            break
+        labels = assigned
+        membership = sparse.csr_matrix((np.ones(n, dtype=np.float32), (labels, np.arange(n))), shape=(k, n))
+        centers = np.asarray((membership @ matrix).todense())
+        lengths = np.linalg.norm(centers, axis=1)
+        empty = lengths == 0
+        if empty.any():
+            # Reseed empty clusters with the files that fit their cluster worst
+            worst = np.argsort(similarities[np.arange(n), labels])[:int(empty.sum())]
+            centers[empty] = matrix[worst].toarray()
+            lengths[empty] = np.maximum(np.linalg.norm(centers[empty], axis=1), 1e-12)
+        centers /= lengths[:, None]
+
+    similarity = np.asarray(matrix @ centers.T)[np.arange(n), labels]
+    top_columns = np.argsort(-centers, axis=1)[:, :label_terms]
+    terms = [[int(kept[column]) for column in row if centers[cluster, column] > 0]
+             for cluster, row in enumerate(top_columns)]
+    return labels, similarity, (centers, kept), terms
+
+
+def compact_rows(blocks: List[Tuple[array, array, array]], rows: List[int], width: int):
+    """Only `rows` of the blocked term-count matrix, with term ids renumbered to the terms they use.
+
+    Returns (old id of each kept term, new id per old id or -1, blocks of
+    BLOCK_ROWS rows with the last one open). Kept terms stay in their old
+    order, so sorted term id lists stay sorted.
+    """
+    import numpy as np
+
+    offsets = np.cumsum([0] + [len(indices) for _, indices, _ in blocks])
+    indptr = np.concatenate([np.frombuffer(block_indptr, dtype=np.int64)[:-1] + offset
+                             for (block_indptr, _, _), offset in zip(blocks, offsets)] + [offsets[-1:]])
+    indices = np.concatenate([np.frombuffer(block_indices, dtype=np.int32) for _, block_indices, _ in blocks])
+    counts = np.concatenate([np.frombuffer(block_counts, dtype=np.float32) for _, _, block_counts in blocks])
+
+    rows = np.asarray(rows, dtype=np.int64)
+    starts, lengths = indptr[rows], indptr[rows + 1] - indptr[rows]
+    new_indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    positions = np.arange(new_indptr[-1]) - np.repeat(new_indptr[:-1] - starts, lengths)
+    indices, counts = indices[positions], counts[positions]
+
+    kept = np.unique(indices)
+    new_id = np.full(width, -1, dtype=np.int64)
+    new_id[kept] = np.arange(len(kept))
+    indices = new_id[indices].astype(np.int32)
+
+    compacted = []
+    for first in range(0, len(rows) + 1, BLOCK_ROWS):
+        block_indptr = new_indptr[first:first + BLOCK_ROWS + 1]
+        begin, end = block_indptr[0], block_indptr[-1]
+        compacted.append((array("q", (block_indptr - begin).tobytes()),
+                          array("i", indices[begin:end].tobytes()), array("f", counts[begin:end].tobytes())))
+    return kept.tolist(), new_id, compacted
+
+
+def _kmeans_plus_plus(matrix, k: int, rng):
+    """k-means++ seeding on cosine distance"""
+    import numpy as np
+
+    n = matrix.shape[0]
+    chosen = [int(rng.integers(n))]
+    closest = np.asarray(matrix @ matrix[chosen[0]].T.toarray()).ravel()
+    for _ in range(1, k):
+        weights = np.maximum(1 - closest, 0) ** 2
+        total = weights.sum()
+        candidate = int(rng.choice(n, p=weights / total)) if total > 0 else int(rng.integers(n))
+        chosen.append(candidate)
+        closest = np.maximum(closest, np.asarray(matrix @ matrix[candidate].T.toarray()).ravel())
+    return matrix[chosen].toarray()
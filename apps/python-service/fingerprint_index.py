@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+SilentSort Fingerprint Index
+Persistent map from file content fingerprints to the last analysis result and
+the name/folder the user approved, so moved or renamed files are recognized
+without re-analysis
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+SAMPLE_BYTES = 64 * 1024
+FULL_HASH_CHUNK = 1024 * 1024
+
+# full_hash stays '' until two different files share a sampled fingerprint;
+# WITHOUT ROWID keeps each lookup a single primary-key B-tree probe
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_index (
+    fingerprint     TEXT NOT NULL,
+    full_hash       TEXT NOT NULL DEFAULT '',
+    file_path       TEXT NOT NULL,
+    result          TEXT,
+    approved_name   TEXT,
+    approved_folder TEXT,
+    updated_at      REAL NOT NULL,
+    PRIMARY KEY (fingerprint, full_hash)
+) WITHOUT ROWID;
+"""
+
+
+def file_fingerprint(path: str) -> str:
+    """Cheap content identity: size plus a hash of the first and last 64KB"""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode())
+    with open(path, "rb") as handle:
+        digest.update(handle.read(SAMPLE_BYTES))
+        if size > SAMPLE_BYTES * 2:
+            handle.seek(-SAMPLE_BYTES, os.SEEK_END)
+            digest.update(handle.read(SAMPLE_BYTES))
+        elif size > SAMPLE_BYTES:
+            digest.update(handle.read())
+    return f"{size:x}-{digest.hexdigest()}"
+
+
+def file_full_hash(path: str) -> str:
+    """Hash of the whole file, only computed to tell colliding fingerprints apart"""
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(FULL_HASH_CHUNK)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as handle:
+        while True:
+            n = handle.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    return digest.hexdigest()
+
+
+def _entry(row: aiosqlite.Row) -> Dict[str, Any]:
+    return {
+        "fingerprint": row["fingerprint"],
+        "file_path": row["file_path"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "approved_name": row["approved_name"],
+        "approved_folder": row["approved_folder"],
+        "updated_at": row["updated_at"],
+    }
+
+
+class FingerprintIndex:
+    """Fingerprint -> last result / approved name and folder, backed by SQLite.
+
+    Lookups hash 128KB of the file and probe the primary key, so their cost does
+    not grow with the number of indexed files. The full file is only hashed when
+    two different files share a sampled fingerprint (same size, same first and
+    last 64KB): both rows then carry their full hash and lookups for that
+    fingerprint compare full hashes.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.db: Optional[aiosqlite.Connection] = None
+        self.stats = {"lookups": 0, "hits": 0, "moves": 0, "recorded": 0, "collisions": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["FingerprintIndex"]:
+        """None when FINGERPRINT_INDEX_ENABLED=false"""
+        if os.getenv("FINGERPRINT_INDEX_ENABLED", "true").lower() != "true":
+            return None
+        return cls(os.getenv("FINGERPRINT_INDEX_PATH", "silentsort-index.db"))
+
+    async def open(self) -> None:
+        self.db = await aiosqlite.connect(self.db_path)
+        self.db.row_factory = aiosqlite.Row
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.executescript(SCHEMA)
+        await self.db.commit()
+
+    async def close(self) -> None:
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+
+    async def fingerprint(self, path: str) -> Optional[str]:
+        """Fingerprint of a local file, or None when the service cannot read it"""
+        try:
+            return await asyncio.to_thread(file_fingerprint, path)
+        except OSError:
+            return None
+
+    async def _rows(self, fingerprint: str) -> List[aiosqlite.Row]:
+        cursor = await self.db.execute(
+            "SELECT * FROM file_index WHERE fingerprint = ?", (fingerprint,)
+        )
+        return list(await cursor.fetchall())
+
+    async def _compare(self, row: aiosqlite.Row, path: str, fingerprint: str) -> Tuple[Optional[bool], Optional[str]]:
+        """Whether `path` holds the same bytes as the file `row` was indexed from.
+
+        Returns (same, full hash of `path`); `same` is None when the indexed file
+        moved away or changed, leaving nothing to compare against. Different bytes
+        are a collision: the existing row gets its full hash so both files can be
+        stored side by side.
+        """
+        try:
+            if await asyncio.to_thread(file_fingerprint, row["file_path"]) != fingerprint:
+                return None, None
+            existing_hash = await asyncio.to_thread(file_full_hash, row["file_path"])
+        except OSError:
+            return None, None
+        full_hash = await asyncio.to_thread(file_full_hash, path)
+        if full_hash == existing_hash:
+            return True, full_hash
+
+        self.stats["collisions"] += 1
+        logger.warning("⚠️ Fingerprint collision between {a} and {b}", a=row["file_path"], b=path)
+        await self.db.execute(
+            "UPDATE file_index SET full_hash = ? WHERE fingerprint = ? AND full_hash = ''",
+            (existing_hash, fingerprint),
+        )
+        await self.db.commit()
+        return False, full_hash
+
+    async def _match(self, path: str, fingerprint: str) -> Optional[aiosqlite.Row]:
+        """The row describing the content at `path`, resolving collisions by full hash"""
+        rows = await self._rows(fingerprint)
+        if not rows:
+            return None
+        if len(rows) == 1 and not rows[0]["full_hash"]:
+            row = rows[0]
+            if row["file_path"] != path:
+                same, _ = await self._compare(row, path, fingerprint)
+                if same is False:
+                    return None
+            return row
+        full_hash = await asyncio.to_thread(file_full_hash, path)
+        return next((row for row in rows if row["full_hash"] == full_hash), None)
+
+    async def lookup(self, path: str, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Index entry for the file at `path`; a hit whose old path is gone records the move"""
+        fingerprint = fingerprint or await self.fingerprint(path)
+        if fingerprint is None:
+            return None
+        self.stats["lookups"] += 1
+        row = await self._match(path, fingerprint)
+        if row is None:
+            return None
+        self.stats["hits"] += 1
+
+        entry = _entry(row)
+        if row["file_path"] != path:
+            entry["file_path"] = path
+            if os.path.exists(row["file_path"]):
+                entry["copy_of"] = row["file_path"]
+            else:
+                self.stats["moves"] += 1
+                entry["previous_path"] = row["file_path"]
+                await self.db.execute(
+                    "UPDATE file_index SET file_path = ?, updated_at = ? WHERE fingerprint = ? AND full_hash = ?",
+                    (path, time.time(), fingerprint, row["full_hash"]),
+                )
+                await self.db.commit()
+        return entry
+
+    async def _resolve_key(self, path: str, fingerprint: str) -> str:
+        """full_hash to store `path` under, splitting rows when a collision appears"""
+        rows = await self._rows(fingerprint)
+        if not rows:
+            return ""
+        if len(rows) == 1 and not rows[0]["full_hash"]:
+            if rows[0]["file_path"] == path:
+                return ""  # The same file analyzed again
+            same, full_hash = await self._compare(rows[0], path, fingerprint)
+            return full_hash if same is False else ""
+        return await asyncio.to_thread(file_full_hash, path)
+
+    async def record(self, path: str, fingerprint: str, result: Optional[Dict[str, Any]] = None,
+                     approved_name: Optional[str] = None,
+                     approved_folder: Optional[str] = None) -> None:
+        """Store the latest analysis result and/or the user's decision for a file"""
+        full_hash = await self._resolve_key(path, fingerprint)
+        await self.db.execute(
+            """
+            INSERT INTO file_index (fingerprint, full_hash, file_path, result, approved_name, approved_folder, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (fingerprint, full_hash) DO UPDATE SET
+                file_path = excluded.file_path,
+                result = COALESCE(excluded.result, result),
+                approved_name = COALESCE(excluded.approved_name, approved_name),
+                approved_folder = COALESCE(excluded.approved_folder, approved_folder),
+                updated_at = excluded.updated_at
+            """,
+            (fingerprint, full_hash, path, json.dumps(result) if result is not None else None,
+             approved_name, approved_folder, time.time()),
+        )
+        await self.db.commit()
+        self.stats["recorded"] += 1
+
+    async def lookup_fingerprint(self, fingerprint: str) -> List[Dict[str, Any]]:
+        """All entries stored under a fingerprint (more than one only after a collision)"""
+        return [_entry(row) for row in await self._rows(fingerprint)]
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+SilentSort Folder Index
+Cached, incrementally refreshed index of the folders under a base directory,
+so folder suggestions prefer folders the user already has
+"""
+
+import os
+import re
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from content_reader import server_read_roots
+
+# Never descended into: VCS metadata, dependency caches, virtualenvs
+SKIP_DIRS = {"node_modules", "__pycache__", "venv", ".venv", "site-packages", "$RECYCLE.BIN"}
+
+CODE_EXTENSIONS = {".py", ".js", ".ts", ".tsx", ".jsx", ".java", ".go", ".rs", ".c", ".cpp", ".h", ".rb", ".sh"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".heic", ".webp", ".svg", ".bmp", ".tiff"}
+
+# Filename keywords -> category (same vocabulary as the folder maps in the services)
+CATEGORY_KEYWORDS = [
+    ("invoice", ("invoice", "inv-", "bill")),
+    ("receipt", ("receipt",)),
+    ("contract", ("contract", "agreement", "nda")),
+    ("resume", ("resume", "cv")),
+    ("meeting-notes", ("meeting", "minutes", "notes")),
+    ("report", ("report",)),
+]
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """Folder-name key: lowercase alphanumerics, crude singular ("Invoices" == "invoice")"""
+    key = _NON_ALNUM.sub("", name.lower())
+    return key[:-1] if len(key) > 3 and key.endswith("s") else key
+
+
+def classify_filename(name: str) -> str:
+    """Cheap category guess from a file name alone (no content is read)"""
+    lower = name.lower()
+    extension = os.path.splitext(lower)[1]
+    if extension in CODE_EXTENSIONS:
+        return "code"
+    if extension in IMAGE_EXTENSIONS:
+        return "image"
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in lower for keyword in keywords):
+            return category
+    return "document"
+
+
+class FolderEntry:
+    __slots__ = ("depth", "mtime_ns", "files", "categories", "children")
+
+    def __init__(self, depth: int, mtime_ns: int):
+        self.depth = depth
+        self.mtime_ns = mtime_ns
+        self.files = 0
+        self.categories: Dict[str, int] = {}
+        self.children: List[str] = []
+
+    def dominant_category(self) -> Optional[str]:
+        if not self.categories:
+            return None
+        return max(self.categories.items(), key=lambda item: item[1])[0]
+
+
+class FolderIndex:
+    """Folder tree under one base directory.
+
+    `folders` maps relative paths to entries (depth, direct file count and
+    category counts). Lookups only touch `by_name` and `best_by_category`,
+    derived maps that are rebuilt and swapped in after each change, so they
+    are dict lookups regardless of tree size and never see a half-applied
+    refresh. `refresh()` stats known folders and rescans only the ones whose
+    mtime changed (entries added, removed or renamed).
+    """
+
+    def __init__(self, base: str, max_depth: int = 8):
+        self.base = os.path.abspath(os.path.expanduser(base))
+        self.max_depth = max_depth
+        self.folders: Dict[str, FolderEntry] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        self.best_by_category: Dict[str, List[Tuple[str, int]]] = {}
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def _abs(self, rel: str) -> str:
+        return os.path.join(self.base, rel) if rel else self.base
+
+    # ========================================================================
+    # SCANNING (runs in a worker thread)
+    # ========================================================================
+
+    def _scan(self, rel: str, depth: int) -> List[str]:
+        """(Re)read one folder's direct entries; returns child folders not yet indexed"""
+        path = self._abs(rel)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            entries = list(os.scandir(path))
+        except OSError:
+            self._drop(rel)
+            return []
+
+        entry = FolderEntry(depth, mtime_ns)
+        for child in entries:
+            try:
+                if child.is_dir(follow_symlinks=False):
+                    if not child.name.startswith(".") and child.name not in SKIP_DIRS and depth < self.max_depth:
+                        entry.children.append(f"{rel}/{child.name}" if rel else child.name)
+                elif child.is_file(follow_symlinks=False) and not child.name.startswith("."):
+                    entry.files += 1
+                    category = classify_filename(child.name)
+                    entry.categories[category] = entry.categories.get(category, 0) + 1
+            except OSError:
+                continue
+
+        previous = self.folders.get(rel)
+        self.folders[rel] = entry
+        if previous is not None:
+            # Children that disappeared since the last scan go with their subtrees
+            current = set(entry.children)
+            for gone in previous.children:
+                if gone not in current:
+                    self._drop(gone)
+        return [child for child in entry.children if child not in self.folders]
+
+    def _drop(self, rel: str) -> None:
+        stack = [rel]
+        while stack:
+            entry = self.folders.pop(stack.pop(), None)
+            if entry is not None:
+                stack.extend(entry.children)
+
+    def _walk(self, rel: str, depth: int) -> None:
+        stack = [(rel, depth)]
+        while stack:
+            rel, depth = stack.pop()
+            stack.extend((child, depth + 1) for child in self._scan(rel, depth))
+
+    def _rebuild_lookups(self) -> None:
+        by_name: Dict[str, List[str]] = {}
+        ranked: Dict[str, List[Tuple[str, int]]] = {}
+        for rel, entry in self.folders.items():
+            if not rel:
+                continue
+            by_name.setdefault(normalize_name(rel.rsplit("/", 1)[-1]), []).append(rel)
+            for category, count in entry.categories.items():
+                ranked.setdefault(category, []).append((rel, count))
+        for paths in by_name.values():
+            paths.sort(key=lambda rel: (rel.count("/"), rel))
+        best = {
+            category: sorted(entries, key=lambda item: (-item[1], item[0].count("/"), item[0]))[:5]
+            for category, entries in ranked.items()
+        }
+        self.by_name, self.best_by_category = by_name, best
+
+    def build(self) -> "FolderIndex":
+        started = time.perf_counter()
+        with self._refresh_lock:
+            self.folders = {}
+            self._walk("", 0)
+            self._rebuild_lookups()
+            self.built_at = self.refreshed_at = time.time()
+        logger.info("📂 Indexed {folders} folders under {base} in {ms}ms", folders=len(self.folders),
+                    base=self.base, ms=int((time.perf_counter() - started) * 1000))
+        return self
+
+    def refresh(self) -> int:
+        """Rescan folders whose mtime changed; returns how many were rescanned"""
+        if not self._refresh_lock.acquire(blocking=False):
+            return 0  # Another refresh is already running
+        try:
+            changed = 0
+            for rel, entry in list(self.folders.items()):
+                if rel not in self.folders:
+                    continue  # Dropped with a parent earlier in this pass
+                try:
+                    mtime_ns = os.stat(self._abs(rel)).st_mtime_ns
+                except OSError:
+                    self._drop(rel)
+                    changed += 1
+                    continue
+                if mtime_ns != entry.mtime_ns:
+                    changed += 1
+                    for child in self._scan(rel, entry.depth):
+                        self._walk(child, entry.depth + 1)
+            if changed:
+                self._rebuild_lookups()
+            self.refreshed_at = time.time()
+            return changed
+        finally:
+            self._refresh_lock.release()
+
+    # ========================================================================
+    # LOOKUPS
+    # ========================================================================
+
+    def exists(self, rel: str) -> bool:
+        return rel.strip("/") in self.folders
+
+    def find(self, candidate: str, category: Optional[str] = None) -> Optional[Dict[str, object]]:
+        """Existing folder to use instead of `candidate` (a path relative to the base).
+
+        Preference: the candidate itself, then a folder with the same name (the
+        one holding most files of `category`), then the folder holding most
+        files of `category`. None when nothing suitable exists yet.
+        """
+        candidate = candidate.strip("/")
+        if candidate in self.folders:
+            return {"path": candidate, "reason": "exists"}
+
+        same_name = self.by_name.get(normalize_name(candidate.rsplit("/", 1)[-1]))
+        if same_name:
+            best = max(same_name[:50], key=lambda rel: self._count(rel, category))
+            return {"path": best, "reason": "same-name"}
+
+        if category and self.best_by_category.get(category):
+            rel, count = self.best_by_category[category][0]
+            return {"path": rel, "reason": "dominant-category", "files": count}
+        return None
+
+    def _count(self, rel: str, category: Optional[str]) -> int:
+        entry = self.folders.get(rel)
+        if entry is None or not category:
+            return 0
+        return entry.categories.get(category, 0)
+
+    def describe(self, rel: str) -> Optional[Dict[str, object]]:
+        entry = self.folders.get(rel.strip("/"))
+        if entry is None:
+            return None
+        return {"depth": entry.depth, "files": entry.files, "dominant_category": entry.dominant_category()}
+
+
+class FolderIndexRegistry:
+    """One FolderIndex per base directory, built once and refreshed in the background.
+
+    The first request for a base directory waits for the initial build; after
+    that requests always use the current index, and one that arrives after
+    `ttl_seconds` schedules an incremental refresh without waiting for it.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_bases: int = 8, max_depth: int = 8):
+        self.ttl_seconds = ttl_seconds
+        self.max_bases = max_bases
+        self.max_depth = max_depth
+        self._indexes: "OrderedDict[str, FolderIndex]" = OrderedDict()
+        self._building: Dict[str, asyncio.Future] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls) -> "FolderIndexRegistry":
+        return cls(
+            ttl_seconds=float(os.getenv("FOLDER_INDEX_TTL_SECONDS", "30")),
+            max_bases=int(os.getenv("FOLDER_INDEX_MAX_BASES", "8")),
+            max_depth=int(os.getenv("FOLDER_INDEX_MAX_DEPTH", "8")),
+        )
+
+    async def get(self, base_directory: Optional[str]) -> Optional[FolderIndex]:
+        """Index for `base_directory`; None when it is empty, not a directory or outside the read roots"""
+        if not base_directory:
+            return None
+        base = os.path.abspath(os.path.expanduser(base_directory))
+        if not self.allowed(base):
+            return None
+        index = self._indexes.get(base)
+        if index is not None:
+            self._indexes.move_to_end(base)
+            if time.time() - index.refreshed_at > self.ttl_seconds and base not in self._refreshing:
+                task = asyncio.create_task(asyncio.to_thread(index.refresh))
+                self._refreshing[base] = task
+                task.add_done_callback(lambda _: self._refreshing.pop(base, None))
+            return index
+
+        if not os.path.isdir(base):
+            return None
+        # Concurrent first requests for the same base share one build
+        if base not in self._building:
+            self._building[base] = asyncio.ensure_future(
+                asyncio.to_thread(FolderIndex(base, self.max_depth).build)
+            )
+        try:
+            index = await asyncio.shield(self._building[base])
+        finally:
+            self._building.pop(base, None)
+        self._indexes[base] = index
+        while len(self._indexes) > self.max_bases:
+            self._indexes.popitem(last=False)
+        return index
+
+    @staticmethod
+    def allowed(base: str) -> bool:
+        """Only folders inside SERVER_READ_ROOTS (default: WATCH_FOLDERS) are walked for clients"""
+        resolved = os.path.realpath(base)
+        return any(os.path.commonpath([resolved, root]) == root for root in server_read_roots())
+
+    def invalidate(self, base_directory: str) -> None:
+        self._indexes.pop(os.path.abspath(os.path.expanduser(base_directory)), None)
+
+    def stats(self) -> Dict[str, object]:
+        return {base: {"folders": len(index.folders), "refreshed_at": index.refreshed_at}
+                for base, index in self._indexes.items()}
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+SilentSort Folder Watcher
+Service-side ingestion: watch folders, debounce partial writes, fingerprint files
+and feed new ones into a bounded analysis pipeline
+"""
+
+import os
+import time
+import asyncio
+from pathlib import Path
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from fingerprint_index import file_fingerprint
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# Browser/OS placeholders for downloads that are still being written
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".partial", ".download", ".tmp", ".swp")
+
+
+class FolderWatcher:
+    """Watch folders and hand each new, fully written file to `handle_file` once.
+
+    Change notifications come from watchdog (inotify/FSEvents) when it is
+    installed and from periodic directory snapshots otherwise. A file is only
+    considered complete after its size and mtime have been stable for
+    `debounce_seconds`. Completed files go through a bounded queue, so a burst
+    of downloads applies backpressure instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        folders: Iterable[str],
+        handle_file: Callable[[str, str], Awaitable[None]],
+        is_known: Optional[Callable[[str, str], Awaitable[bool]]] = None,
+        extensions: Optional[Iterable[str]] = None,
+        recursive: bool = False,
+        debounce_seconds: float = 2.0,
+        poll_interval: float = 1.0,
+        queue_size: int = 100,
+        workers: int = 2,
+        initial_scan: bool = False,
+        max_seen: int = 10_000,
+    ):
+        self.folders = [str(Path(folder).expanduser()) for folder in folders]
+        self.handle_file = handle_file
+        self.is_known = is_known
+        self.extensions = {ext.lower() for ext in extensions} if extensions else None
+        self.recursive = recursive
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.worker_count = max(1, workers)
+        self.initial_scan = initial_scan
+        self.max_seen = max(1, max_seen)
+
+        self.queue_size = max(1, queue_size)
+        self._queue: Optional[asyncio.Queue] = None
+        # path -> (size, mtime_ns, stable_since)
+        self._pending: Dict[str, Tuple[Optional[int], Optional[int], float]] = {}
+        # Fingerprints handled recently, oldest first; is_known() covers anything older
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._tasks: List[asyncio.Task] = []
+        self._observer = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"detected": 0, "analyzed": 0, "skipped_known": 0, "failed": 0}
+
+    @classmethod
+    def from_env(cls, handle_file, is_known=None) -> Optional["FolderWatcher"]:
+        """Build a watcher from WATCH_* settings; None when no folders are configured"""
+        folders = [f.strip() for f in os.getenv("WATCH_FOLDERS", "").split(",") if f.strip()]
+        if not folders:
+            return None
+        extensions = [e.strip() for e in os.getenv("SUPPORTED_EXTENSIONS", "").split(",") if e.strip()]
+        return cls(
+            folders,
+            handle_file,
+            is_known=is_known,
+            extensions=extensions or None,
+            recursive=os.getenv("WATCH_RECURSIVE", "false").lower() == "true",
+            debounce_seconds=float(os.getenv("WATCH_DEBOUNCE_SECONDS", "2")),
+            poll_interval=float(os.getenv("WATCH_POLL_INTERVAL_SECONDS", "1")),
+            queue_size=int(os.getenv("WATCH_QUEUE_SIZE", "100")),
+            workers=int(os.getenv("WATCH_WORKERS", "2")),
+            initial_scan=os.getenv("WATCH_INITIAL_SCAN", "false").lower() == "true",
+            max_seen=int(os.getenv("WATCH_SEEN_MAX", "10000")),
+        )
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        snapshot = await asyncio.to_thread(self._snapshot)
+        if self.initial_scan:
+            for path in snapshot:
+                self._mark_changed(path)
+
+        if WATCHDOG_AVAILABLE:
+            self._start_observer()
+            logger.info("👀 Watching {folders} with watchdog", folders=self.folders)
+        else:
+            self._tasks.append(asyncio.create_task(self._poll(snapshot)))
+            logger.info("👀 Watching {folders} by polling every {interval}s",
+                        folders=self.folders, interval=self.poll_interval)
+
+        self._tasks.append(asyncio.create_task(self._debounce()))
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            await asyncio.to_thread(self._observer.join)
+            self._observer = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "pending_debounce": len(self._pending),
+            "queued": self._queue.qsize() if self._queue else 0,
+            "backend": "watchdog" if WATCHDOG_AVAILABLE else "polling",
+        }
+
+    # ========================================================================
+    # CHANGE DETECTION
+    # ========================================================================
+
+    def _wanted(self, path: str) -> bool:
+        name = os.path.basename(path)
+        if name.startswith(".") or name.lower().endswith(PARTIAL_SUFFIXES):
+            return False
+        if self.extensions is None:
+            return True
+        return os.path.splitext(name)[1].lower() in self.extensions
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Map every wanted file under the watched folders to (size, mtime_ns)"""
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        stack = list(self.folders)
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive and not entry.name.startswith("."):
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and self._wanted(entry.path):
+                            stat = entry.stat(follow_symlinks=False)
+                            snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                    except OSError:
+                        continue
+        return snapshot
+
+    async def _poll(self, previous: Dict[str, Tuple[int, int]]) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._snapshot)
+            for path, signature in current.items():
+                if previous.get(path) != signature:
+                    self._mark_changed(path)
+            previous = current
+
+    def _start_observer(self) -> None:
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                path = getattr(event, "dest_path", None) or event.src_path
+                if watcher._wanted(path):
+                    watcher._loop.call_soon_threadsafe(watcher._mark_changed, path)
+
+        self._observer = Observer()
+        for folder in self.folders:
+            if os.path.isdir(folder):
+                self._observer.schedule(_Handler(), folder, recursive=self.recursive)
+        self._observer.start()
+
+    def _mark_changed(self, path: str) -> None:
+        if path not in self._pending:
+            self.stats["detected"] += 1
+        self._pending[path] = (None, None, time.monotonic())
+
+    async def _debounce(self) -> None:
+        """Promote files whose size and mtime stayed unchanged for the debounce window"""
+        interval = max(0.1, min(0.5, self.debounce_seconds / 2))
+        while True:
+            await asyncio.sleep(interval)
+            if not self._pending:
+                continue
+            signatures = await asyncio.to_thread(_signatures, list(self._pending))
+            now = time.monotonic()
+            for path, signature in signatures.items():
+                if path not in self._pending:
+                    continue
+                size, mtime_ns, stable_since = self._pending[path]
+                if signature is None:
+                    # Deleted or renamed away before it settled
+                    del self._pending[path]
+                    continue
+                if signature != (size, mtime_ns):
+                    self._pending[path] = (*signature, now)
+                elif now - stable_since >= self.debounce_seconds:
+                    del self._pending[path]
+                    # Blocks while the pipeline is full: backpressure, not unbounded growth
+                    await self._queue.put(path)
+
+    # ========================================================================
+    # ANALYSIS PIPELINE
+    # ========================================================================
+
+    async def _worker(self) -> None:
+        while True:
+            path = await self._queue.get()
+            fingerprint = None
+            try:
+                fingerprint = await asyncio.to_thread(file_fingerprint, path)
+                if fingerprint in self._seen:
+                    self.stats["skipped_known"] += 1
+                    continue
+                # Claim the fingerprint first so identical copies arriving together run once
+                self._seen[fingerprint] = None
+                while len(self._seen) > self.max_seen:
+                    self._seen.popitem(last=False)
+                if self.is_known and await self.is_known(path, fingerprint):
+                    self.stats["skipped_known"] += 1
+                    continue
+                await self.handle_file(path, fingerprint)
+                self.stats["analyzed"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._seen.pop(fingerprint, None)
+                self.stats["failed"] += 1
+                logger.error(f"❌ Watched file analysis failed for {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+def _signatures(paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+    """(size, mtime_ns) of each path, None for paths that are gone"""
+    signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signatures[path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signatures[path] = None
+    return signatures
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+SilentSort Job Queue
+Durable, resumable organization runs backed by SQLite (aiosqlite)
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+# Item / job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id      TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    total       INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id      TEXT NOT NULL,
+    item_index  INTEGER NOT NULL,
+    file_hash   TEXT NOT NULL,
+    request     TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    result      TEXT,
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (job_id, file_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (status, job_id, item_index);
+CREATE INDEX IF NOT EXISTS idx_job_items_order ON job_items (job_id, item_index);
+CREATE TABLE IF NOT EXISTS analysis_results (
+    file_hash   TEXT PRIMARY KEY,
+    result      TEXT NOT NULL,
+    created_at  REAL NOT NULL
+);
+"""
+
+
+def request_hash(request: Dict[str, Any]) -> str:
+    """Stable identity of a file analysis request (client-supplied file_hash wins)"""
+    if request.get("file_hash"):
+        return request["file_hash"]
+    digest = hashlib.sha256()
+    keys = ("original_name", "file_extension", "file_size", "content_preview")
+    if not request.get("content_preview"):
+        # Without client-sent content the path is the only distinguishing input
+        keys += ("file_path",)
+    for key in keys:
+        digest.update(str(request.get(key) or "").encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class JobStore:
+    """Persistent job and item state.
+
+    One aiosqlite connection is shared by the API and the workers; SQLite
+    serialises writes anyway, and WAL keeps readers from blocking on them.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.db: Optional[aiosqlite.Connection] = None
+
+    async def open(self) -> None:
+        self.db = await aiosqlite.connect(self.db_path)
+        self.db.row_factory = aiosqlite.Row
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.executescript(SCHEMA)
+        await self.db.commit()
+
+    async def close(self) -> None:
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+
+    async def requeue_interrupted(self) -> int:
+        """Return items that were running when the service stopped to the queue"""
+        cursor = await self.db.execute(
+            "UPDATE job_items SET status = ?, updated_at = ? WHERE status = ?",
+            (PENDING, time.time(), RUNNING),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def create_job(self, requests: List[Dict[str, Any]]) -> Tuple[str, int, int]:
+        """Persist a job; returns (job_id, items, items answered from earlier runs)"""
+        job_id = f"job_{uuid.uuid4().hex[:16]}"
+        now = time.time()
+
+        items = {}
+        for index, request in enumerate(requests):
+            # Duplicate files within one job collapse onto the first occurrence
+            items.setdefault(request_hash(request), (index, request))
+
+        cached = await self._cached_results(list(items))
+        rows = []
+        for file_hash, (index, request) in items.items():
+            result = cached.get(file_hash)
+            rows.append((
+                job_id, index, file_hash, json.dumps(request),
+                DONE if result is not None else PENDING, result, now,
+            ))
+
+        status = COMPLETED if len(cached) == len(items) else PENDING
+        await self.db.execute(
+            "INSERT INTO jobs (job_id, status, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, status, len(items), now, now),
+        )
+        await self.db.executemany(
+            "INSERT INTO job_items (job_id, item_index, file_hash, request, status, result, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        await self.db.commit()
+        return job_id, len(items), len(cached)
+
+    async def _cached_results(self, hashes: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            async with self.db.execute(
+                f"SELECT file_hash, result FROM analysis_results WHERE file_hash IN ({placeholders})",
+                chunk,
+            ) as cursor:
+                async for row in cursor:
+                    found[row["file_hash"]] = row["result"]
+        return found
+
+    async def cached_result(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Stored analysis for a file hash, if any"""
+        async with self.db.execute(
+            "SELECT result FROM analysis_results WHERE file_hash = ?", (file_hash,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return json.loads(row["result"]) if row else None
+
+    async def store_result(self, file_hash: str, result: Dict[str, Any]) -> None:
+        """Remember an analysis made outside a job (e.g. by the folder watcher)"""
+        await self.db.execute(
+            "INSERT OR REPLACE INTO analysis_results (file_hash, result, created_at) VALUES (?, ?, ?)",
+            (file_hash, json.dumps(result), time.time()),
+        )
+        await self.db.commit()
+
+    async def claim_pending(self, limit: int) -> List[Dict[str, Any]]:
+        """Mark up to `limit` pending items (oldest job first) as running and return them"""
+        async with self.db.execute(
+            "SELECT i.job_id, i.file_hash, i.request FROM job_items i JOIN jobs j USING (job_id) "
+            "WHERE i.status = ? ORDER BY j.created_at, i.item_index LIMIT ?",
+            (PENDING, limit),
+        ) as cursor:
+            rows = [dict(row) for row in await cursor.fetchall()]
+        if rows:
+            await self.db.executemany(
+                "UPDATE job_items SET status = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE job_id = ? AND file_hash = ?",
+                [(RUNNING, time.time(), row["job_id"], row["file_hash"]) for row in rows],
+            )
+            await self.db.commit()
+        return rows
+
+    async def complete_item(self, job_id: str, file_hash: str, result: Optional[Dict[str, Any]],
+                            error: Optional[str] = None) -> None:
+        now = time.time()
+        encoded = json.dumps(result) if result is not None else None
+        await self.db.execute(
+            "UPDATE job_items SET status = ?, result = ?, error = ?, updated_at = ? "
+            "WHERE job_id = ? AND file_hash = ?",
+            (DONE if error is None else FAILED, encoded, error, now, job_id, file_hash),
+        )
+        if error is None:
+            await self.db.execute(
+                "INSERT OR REPLACE INTO analysis_results (file_hash, result, created_at) VALUES (?, ?, ?)",
+                (file_hash, encoded, now),
+            )
+        await self._refresh_job_status(job_id, now)
+        await self.db.commit()
+
+    async def _refresh_job_status(self, job_id: str, now: float) -> None:
+        async with self.db.execute(
+            "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status IN (?, ?)",
+            (job_id, PENDING, RUNNING),
+        ) as cursor:
+            (open_items,) = await cursor.fetchone()
+        await self.db.execute(
+            "UPDATE jobs SET status = CASE WHEN status = ? THEN status WHEN ? = 0 THEN ? ELSE ? END, "
+            "updated_at = ? WHERE job_id = ?",
+            (CANCELLED, open_items, COMPLETED, RUNNING, now, job_id),
+        )
+
+    async def cancel_job(self, job_id: str) -> int:
+        """Cancel every item that has not started; running items are allowed to finish"""
+        now = time.time()
+        cursor = await self.db.execute(
+            "UPDATE job_items SET status = ?, updated_at = ? WHERE job_id = ? AND status = ?",
+            (CANCELLED, now, job_id, PENDING),
+        )
+        await self.db.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ? AND status != ?",
+            (CANCELLED, now, job_id, COMPLETED),
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    async def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with self.db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)) as cursor:
+            job = await cursor.fetchone()
+        if job is None:
+            return None
+        async with self.db.execute(
+            "SELECT status, COUNT(*) AS n FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+        ) as cursor:
+            counts = {row["status"]: row["n"] for row in await cursor.fetchall()}
+        return {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "total": job["total"],
+            "counts": {state: counts.get(state, 0) for state in (PENDING, RUNNING, DONE, FAILED, CANCELLED)},
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+    async def job_results(self, job_id: str, after: int = -1, limit: int = 500) -> List[Dict[str, Any]]:
+        """Finished items with item_index > `after`, in submission order"""
+        async with self.db.execute(
+            "SELECT item_index, file_hash, status, result, error FROM job_items "
+            "WHERE job_id = ? AND item_index > ? AND status IN (?, ?) ORDER BY item_index LIMIT ?",
+            (job_id, after, DONE, FAILED, limit),
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [
+            {
+                "item_index": row["item_index"],
+                "file_hash": row["file_hash"],
+                "status": row["status"],
+                "result": json.loads(row["result"]) if row["result"] else None,
+                "error": row["error"],
+            }
+            for row in rows
+        ]
+
+
+class JobManager:
+    """Worker coroutines that drain pending job items through `analyze`"""
+
+    def __init__(self, store: JobStore, analyze: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                 workers: int = 4):
+        self.store = store
+        self.analyze = analyze
+        self.worker_count = max(1, workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+
+    @classmethod
+    def from_env(cls, analyze: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> "JobManager":
+        store = JobStore(os.getenv("JOB_DB_PATH", "silentsort-jobs.db"))
+        return cls(store, analyze, workers=int(os.getenv("JOB_WORKERS", "4")))
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.worker_count * 2)
+        self._wakeup = asyncio.Event()
+        await self.store.open()
+        resumed = await self.store.requeue_interrupted()
+        if resumed:
+            logger.info("♻️ Resuming {resumed} interrupted job items", resumed=resumed)
+        self._tasks = [asyncio.create_task(self._dispatcher())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Anything claimed but unfinished is picked up again on the next start
+        await self.store.requeue_interrupted()
+        await self.store.close()
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> Tuple[str, int, int]:
+        job = await self.store.create_job(requests)
+        self._wakeup.set()
+        return job
+
+    async def _dispatcher(self) -> None:
+        """Claim pending items in small batches so the in-memory queue stays bounded"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                items = await self.store.claim_pending(self._queue.maxsize)
+                if not items:
+                    break
+                for item in items:
+                    await self._queue.put(item)
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                result = await self.analyze(json.loads(item["request"]))
+                await self.store.complete_item(item["job_id"], item["file_hash"], result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Job item failed ({item['job_id']}): {e}")
+                await self.store.complete_item(item["job_id"], item["file_hash"], None, error=str(e))
+            finally:
+                self.processed += 1
+                self._queue.task_done()
@@ -7,7 +7,9 @@ Compatible with LangGraph 0.5.0 - Advanced file organization workflow
 import os
 import json
 import time
+import uuid
 import asyncio
+import operator
 from datetime import datetime
 try:
     from typing import TypedDict, List, Optional, Dict, Any, Annotated
@@ -33,11 +35,30 @@ from langchain_core.runnables import RunnableLambda, RunnableParallel
 from dotenv import load_dotenv
 from loguru import logger
 
+from service_logging import configure_logging
+from mock_llm import MockChatModel, mock_llm_enabled
+from llm_cassette import Cassette, CassetteChatModel
+from folder_index import FolderIndex, FolderIndexRegistry
+from name_allocator import NameAllocator, allocate_suggested_name
+from usage_tracker import UsageTracker
+from rules_engine import analyze_with_rules
+
 # Load environment variables
 load_dotenv()
 
 # Configure logging
-logger.add("silentsort.log", rotation="10 MB", level="INFO")
+configure_logging("langgraph-multi-agent-v2")
+
+# Cached index of the folders that already exist under each base directory
+folder_indexes = FolderIndexRegistry.from_env()
+
+# Names handed out per directory, so suggestions never collide (None when disabled)
+name_allocator = NameAllocator.from_env()
+
+
+def slim_state_enabled() -> bool:
+    """Slim state: no diagnostic messages, one checkpoint per request, dropped once the request returns"""
+    return os.getenv("WORKFLOW_SLIM_STATE", "true").lower() == "true"
 
 # FastAPI app setup
 app = FastAPI(
@@ -68,7 +89,7 @@ class FileProcessingState(TypedDict):
     content_preview: str
     base_directory: Optional[str]  # NEW: Base directory for folder suggestions
     
-    # Processing messages (LangGraph pattern)
+    # Processing messages (LangGraph pattern; diagnostics, only written when slim state is off)
     messages: Annotated[List[BaseMessage], add_messages]
     
     # AI Analysis Results
@@ -97,7 +118,10 @@ class FileProcessingState(TypedDict):
     # Context & Learning
     folder_context: Optional[Dict[str, Any]]
     user_patterns: Optional[Dict[str, Any]]
-    operation_metadata: Dict[str, Any]
+    
+    # Appended by the reducers: nodes return only their own stage and keys
+    stages_completed: Annotated[List[str], operator.add]
+    operation_metadata: Annotated[Dict[str, Any], operator.or_]
 
 # ============================================================================
 # PYDANTIC MODELS FOR API
@@ -122,6 +146,7 @@ class FileAnalysisResponse(BaseModel):
     processing_time_ms: int
     workflow_id: Optional[str] = None
     processing_stages: List[str] = []
+    usage: Optional[Dict[str, Any]] = None  # LLM calls, tokens and cost of this analysis, by node
 
 class HealthResponse(BaseModel):
     status: str
@@ -136,23 +161,33 @@ class HealthResponse(BaseModel):
 # ============================================================================
 
 class SilentSortWorkflow:
-    def __init__(self):
+    def __init__(self, slim_state: Optional[bool] = None):
         self.llm = self._initialize_llm()
-        self.workflow = self._build_workflow()
+        self.slim_state = slim_state_enabled() if slim_state is None else slim_state
+        self.usage = UsageTracker.from_env()
         self.checkpointer = MemorySaver()
+        self.workflow = self._build_workflow()
         
     def _initialize_llm(self) -> ChatOpenAI:
-        """Initialize the LangChain LLM"""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not configured")
-            
-        return ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
-            max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "1000")),
-            openai_api_key=api_key,
-        )
+        """Initialize the LangChain LLM (wrapped in a cassette when LLM_CASSETTE is set)"""
+        cassette = Cassette.from_env()
+        if cassette and cassette.replaying:
+            return CassetteChatModel(None, cassette)
+        
+        if mock_llm_enabled():
+            llm = MockChatModel()
+        else:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY not configured")
+                
+            llm = ChatOpenAI(
+                model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+                temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
+                max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "1000")),
+                openai_api_key=api_key,
+            )
+        return CassetteChatModel(llm, cassette) if cassette else llm
     
     def _build_workflow(self) -> StateGraph:
         """Build the complete LangGraph workflow using 0.5.0 patterns"""
@@ -194,31 +229,52 @@ class SilentSortWorkflow:
         
         return workflow.compile(checkpointer=self.checkpointer)
     
+    def _trace(self, message: BaseMessage) -> Dict[str, Any]:
+        """State update carrying a diagnostic message, empty in slim state mode"""
+        return {} if self.slim_state else {"messages": [message]}
+    
+    async def _invoke_llm(self, node: str, prompt: str) -> Any:
+        """One LLM call on behalf of `node`, with its token usage recorded"""
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        self.usage.record(node, response)
+        return response
+    
+    async def run(self, state: FileProcessingState, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the graph; in slim state mode only the final state is checkpointed, not every step"""
+        if self.slim_state:
+            return await self.workflow.ainvoke(state, config=config, durability="exit")
+        return await self.workflow.ainvoke(state, config=config)
+    
+    def release(self, thread_id: str) -> None:
+        """Drop a finished request's checkpoints (slim state mode); nothing resumes them"""
+        if self.slim_state:
+            self.checkpointer.delete_thread(thread_id)
+    
     # ========================================================================
     # WORKFLOW NODES (Updated for LangGraph 0.5.0)
     # ========================================================================
     
     def load_state_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Initialize the workflow state"""
-        logger.info(f"🚀 Loading state for file: {state['original_filename']}")
+        logger.debug("🚀 Loading state for file: {file}", file=state['original_filename'])
         
         # Add initial system message
         system_msg = SystemMessage(content=f"Analyzing file: {state['original_filename']}")
         
         return {
             "processing_stage": "initialized",
-            "messages": [system_msg],
+            **self._trace(system_msg),
+            "stages_completed": ["load_state"],
             "operation_metadata": {
                 "started_at": datetime.now().isoformat(),
-                "workflow_version": "2.0.0",
-                "stages_completed": ["load_state"]
+                "workflow_version": "2.0.0"
             },
             "retry_count": 0
         }
     
     async def content_analysis_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Analyze file content using AI"""
-        logger.info(f"🔍 Analyzing content for: {state['original_filename']}")
+        logger.debug("🔍 Analyzing content for: {file}", file=state['original_filename'])
         
         try:
             prompt = f"""Analyze this file and extract key information:
@@ -238,7 +294,7 @@ Provide analysis in JSON format:
 }}"""
 
             # Use LLM to analyze content
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._invoke_llm("content_analysis", prompt)
             
             try:
                 analysis = json.loads(response.content)
@@ -258,11 +314,8 @@ Provide analysis in JSON format:
             return {
                 "content_analysis": analysis,
                 "processing_stage": "content_analysis",
-                "messages": [analysis_msg],
-                "operation_metadata": {
-                    **state.get("operation_metadata", {}),
-                    "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["content_analysis"]
-                }
+                **self._trace(analysis_msg),
+                "stages_completed": ["content_analysis"]
             }
             
         except Exception as e:
@@ -270,12 +323,12 @@ Provide analysis in JSON format:
             error_msg = HumanMessage(content=f"Content analysis failed: {str(e)}")
             return {
                 "error_message": f"Content analysis failed: {str(e)}",
-                "messages": [error_msg]
+                **self._trace(error_msg)
             }
     
     async def parallel_processing_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Run parallel AI agents for naming, categorization, confidence, and folder intelligence"""
-        logger.info(f"⚡ Running parallel processing for: {state['original_filename']}")
+        logger.debug("⚡ Running parallel processing for: {file}", file=state['original_filename'])
         
         try:
             # Prepare input for parallel agents
@@ -304,11 +357,8 @@ Provide analysis in JSON format:
                 "folder_suggestions": folder_result.get("suggestions", []),
                 "folder_analysis": folder_result.get("analysis", {}),
                 "processing_stage": "parallel_processing",
-                "messages": [parallel_msg],
-                "operation_metadata": {
-                    **state.get("operation_metadata", {}),
-                    "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["parallel_processing"]
-                }
+                **self._trace(parallel_msg),
+                "stages_completed": ["parallel_processing"]
             }
             
         except Exception as e:
@@ -316,12 +366,12 @@ Provide analysis in JSON format:
             error_msg = HumanMessage(content=f"Parallel processing failed: {str(e)}")
             return {
                 "error_message": f"Parallel processing failed: {str(e)}",
-                "messages": [error_msg]
+                **self._trace(error_msg)
             }
     
     def decision_routing_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Route based on confidence scores and rules"""
-        logger.info(f"🎯 Routing decision for: {state['original_filename']}")
+        logger.debug("🎯 Routing decision for: {file}", file=state['original_filename'])
         
         confidence_scores = state.get("confidence_scores", {})
         overall_confidence = confidence_scores.get("overall", 0.0)
@@ -351,34 +401,30 @@ Provide analysis in JSON format:
             "alternatives": alternatives,
             "reasoning": reasoning,
             "processing_stage": "decision_routing",
-            "messages": [decision_msg],
-            "operation_metadata": {
-                **state.get("operation_metadata", {}),
-                "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["decision_routing"]
-            }
+            **self._trace(decision_msg),
+            "stages_completed": ["decision_routing"]
         }
     
     def auto_executor_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Auto-execute high confidence suggestions"""
-        logger.info(f"✅ Auto-executing for: {state['original_filename']}")
+        logger.debug("✅ Auto-executing for: {file}", file=state['original_filename'])
         
         auto_msg = HumanMessage(content=f"Auto-approved: {state.get('suggested_name')}")
         
         return {
             "user_decision": "auto_approved",
             "processing_stage": "auto_executed",
-            "messages": [auto_msg],
+            **self._trace(auto_msg),
+            "stages_completed": ["auto_executor"],
             "operation_metadata": {
-                **state.get("operation_metadata", {}),
                 "auto_executed": True,
-                "execution_time": datetime.now().isoformat(),
-                "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["auto_executor"]
+                "execution_time": datetime.now().isoformat()
             }
         }
     
     def human_approval_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Handle human-in-the-loop approval"""
-        logger.info(f"👤 Human approval required for: {state['original_filename']}")
+        logger.debug("👤 Human approval required for: {file}", file=state['original_filename'])
         
         # Simulate approval based on confidence for demo
         confidence = state.get("final_confidence", 0.0)
@@ -389,16 +435,13 @@ Provide analysis in JSON format:
         return {
             "user_decision": decision,
             "processing_stage": "human_approval",
-            "messages": [approval_msg],
-            "operation_metadata": {
-                **state.get("operation_metadata", {}),
-                "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["human_approval"]
-            }
+            **self._trace(approval_msg),
+            "stages_completed": ["human_approval"]
         }
     
     def error_handler_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Handle errors and provide fallbacks"""
-        logger.warning(f"⚠️ Error handling for: {state['original_filename']}")
+        logger.warning("⚠️ Error handling for: {file}", file=state['original_filename'])
         
         # Provide basic fallback
         timestamp = int(time.time())
@@ -413,27 +456,21 @@ Provide analysis in JSON format:
             "reasoning": "Fallback naming due to processing error",
             "alternatives": [],
             "processing_stage": "error_handled",
-            "messages": [error_msg],
-            "operation_metadata": {
-                **state.get("operation_metadata", {}),
-                "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["error_handler"]
-            }
+            **self._trace(error_msg),
+            "stages_completed": ["error_handler"]
         }
     
     def finalize_result_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Finalize the workflow results"""
-        logger.info(f"🏁 Finalizing results for: {state['original_filename']}")
+        logger.debug("🏁 Finalizing results for: {file}", file=state['original_filename'])
         
         final_msg = HumanMessage(content="Workflow completed successfully")
         
         return {
             "processing_stage": "completed",
-            "messages": [final_msg],
-            "operation_metadata": {
-                **state.get("operation_metadata", {}),
-                "completed_at": datetime.now().isoformat(),
-                "stages_completed": state.get("operation_metadata", {}).get("stages_completed", []) + ["finalize_result"]
-            }
+            **self._trace(final_msg),
+            "stages_completed": ["finalize_result"],
+            "operation_metadata": {"completed_at": datetime.now().isoformat()}
         }
     
     # ========================================================================
@@ -472,7 +509,7 @@ Requirements:
 Return JSON: {{"suggestions": ["name1.ext", "name2.ext", "name3.ext"]}}"""
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._invoke_llm("naming", prompt)
             return json.loads(response.content)
         except:
             return {"suggestions": [input_data['original_filename']]}
@@ -487,7 +524,7 @@ Analysis: {json.dumps(input_data['content_analysis'], indent=2)}
 Return JSON: {{"category": "document", "subcategory": "invoice"}}"""
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._invoke_llm("categorization", prompt)
             return json.loads(response.content)
         except:
             return {"category": "document", "subcategory": "general"}
@@ -521,6 +558,7 @@ Return JSON: {{"category": "document", "subcategory": "invoice"}}"""
         content_analysis = input_data.get('content_analysis', {})
         base_dir = input_data.get('base_directory', '')
         original_filename = input_data.get('original_filename', '')
+        folder_index = await folder_indexes.get(base_dir)
         
         prompt = f"""You are a folder organization expert. Suggest the best folder structure for this file:
 
@@ -561,13 +599,19 @@ Return JSON:
 }}"""
 
         try:
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._invoke_llm("folder_intelligence", prompt)
             result = json.loads(response.content)
             
-            # Ensure paths include base directory
+            # Prefer folders that already exist, then ensure paths include base directory
+            suggestions = []
             for suggestion in result.get('suggestions', []):
+                self._prefer_existing_folder(suggestion, base_dir, folder_index)
                 if base_dir and not suggestion['path'].startswith(base_dir):
                     suggestion['path'] = f"{base_dir}/{suggestion['path']}"
+                if any(s['path'] == suggestion['path'] for s in suggestions):
+                    continue
+                suggestions.append(suggestion)
+            result['suggestions'] = suggestions
             
             return result
             
@@ -575,7 +619,7 @@ Return JSON:
             logger.error(f"❌ Folder intelligence agent failed: {e}")
             # Fallback folder suggestions
             content_type = content_analysis.get('content_type', 'document')
-            fallback_path = self._get_fallback_folder_path(content_type, base_dir)
+            fallback_path = self._get_fallback_folder_path(content_type, base_dir, folder_index)
             
             return {
                 "suggestions": [
@@ -593,8 +637,20 @@ Return JSON:
                 }
             }
     
-    def _get_fallback_folder_path(self, content_type: str, base_dir: str) -> str:
-        """Generate fallback folder path based on content type"""
+    def _prefer_existing_folder(self, suggestion: Dict[str, Any], base_dir: str,
+                                folder_index: Optional[FolderIndex]) -> None:
+        """Point a suggested path at an existing folder of the same name when there is one"""
+        path = suggestion.get('path', '')
+        if base_dir and path.startswith(base_dir):
+            path = path[len(base_dir):]
+        path = path.strip('/')
+        existing = folder_index.find(path) if folder_index and path else None
+        suggestion['path'] = existing['path'] if existing else path
+        suggestion['exists'] = existing is not None
+    
+    def _get_fallback_folder_path(self, content_type: str, base_dir: str,
+                                  folder_index: Optional[FolderIndex] = None) -> str:
+        """Generate fallback folder path based on content type, preferring an existing folder"""
         folder_map = {
             'invoice': 'Finance/Invoices',
             'receipt': 'Finance/Receipts',
@@ -608,15 +664,21 @@ Return JSON:
         }
         
         folder_path = folder_map.get(content_type, 'Files')
+        existing = folder_index.find(folder_path, content_type) if folder_index else None
+        if existing:
+            folder_path = existing['path']
         return f"{base_dir}/{folder_path}" if base_dir else folder_path
 
 # ============================================================================
 # WORKFLOW INSTANCE & API ENDPOINTS
 # ============================================================================
 
-# Initialize workflow
+# Initialize workflow (timed for startup_profiler.py)
+startup_timings: Dict[str, float] = {}
 try:
+    _init_started = time.perf_counter()
     workflow_instance = SilentSortWorkflow()
+    startup_timings["workflow_init_ms"] = round((time.perf_counter() - _init_started) * 1000, 2)
     logger.info("✅ LangGraph 0.5.0 workflow initialized successfully")
 except Exception as e:
     logger.error(f"❌ Failed to initialize LangGraph workflow: {e}")
@@ -642,9 +704,26 @@ async def analyze_file(request: FileAnalysisRequest):
         raise HTTPException(status_code=500, detail="LangGraph workflow not available")
     
     start_time = time.time()
-    workflow_id = f"workflow_{int(time.time())}_{hash(request.file_path) % 10000}"
+    workflow_id = f"workflow_{uuid.uuid4().hex}"  # Unique per run, so checkpointed reducers never add up across runs
     
     try:
+        # Daily LLM budget spent: answer with the rules engine until it resets
+        if workflow_instance.usage.over_budget():
+            with workflow_instance.usage.request("rules") as usage:
+                result = analyze_with_rules(request.original_name, request.content_preview or "",
+                                            request.file_extension)
+            return FileAnalysisResponse(
+                suggested_name=await asyncio.to_thread(
+                    allocate_suggested_name, name_allocator, request.file_path, result["suggested_name"]
+                ),
+                confidence=0.6,
+                category=result["category"],
+                reasoning=f"Rules engine ({result['category']}/{result['subcategory']}): daily LLM budget reached",
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                workflow_id=workflow_id,
+                usage=usage.as_dict()
+            )
+        
         # Initialize state
         initial_state: FileProcessingState = {
             "file_path": request.file_path,
@@ -668,6 +747,7 @@ async def analyze_file(request: FileAnalysisRequest):
             "retry_count": 0,
             "folder_context": None,
             "user_patterns": None,
+            "stages_completed": [],
             "operation_metadata": {},
             "base_directory": request.base_directory,
             "folder_suggestions": None,
@@ -676,17 +756,28 @@ async def analyze_file(request: FileAnalysisRequest):
         
         # Run workflow
         config = {"configurable": {"thread_id": workflow_id}}
-        final_state = await workflow_instance.workflow.ainvoke(initial_state, config=config)
+        with logger.contextualize(workflow_id=workflow_id):
+            try:
+                with workflow_instance.usage.request("langgraph-v2") as usage:
+                    final_state = await workflow_instance.run(initial_state, config)
+            finally:
+                workflow_instance.release(workflow_id)
         
         # Calculate processing time
         processing_time = int((time.time() - start_time) * 1000)
         
         # Extract stages completed
-        stages_completed = final_state.get("operation_metadata", {}).get("stages_completed", [])
+        stages_completed = final_state.get("stages_completed", [])
+        
+        # Unique in the file's directory (off the event loop: it may list the directory)
+        suggested_name = await asyncio.to_thread(
+            allocate_suggested_name, name_allocator, request.file_path,
+            final_state.get("suggested_name", request.original_name)
+        )
         
         # Return results
         return FileAnalysisResponse(
-            suggested_name=final_state.get("suggested_name", request.original_name),
+            suggested_name=suggested_name,
             confidence=final_state.get("final_confidence", 0.0),
             category=final_state.get("final_category", "unknown"),
             reasoning=final_state.get("reasoning", "LangGraph multi-agent analysis v2.0"),
@@ -695,13 +786,19 @@ async def analyze_file(request: FileAnalysisRequest):
             folder_suggestions=final_state.get("folder_suggestions", []),
             processing_time_ms=processing_time,
             workflow_id=workflow_id,
-            processing_stages=stages_completed
+            processing_stages=stages_completed,
+            usage=usage.as_dict()
         )
         
     except Exception as e:
         logger.error(f"❌ Workflow execution failed: {e}")
         raise HTTPException(status_code=500, detail=f"Workflow failed: {str(e)}")
 
+@app.get("/metrics")
+async def metrics():
+    """Service metrics"""
+    return {"usage": workflow_instance.usage.metrics() if workflow_instance else None}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -724,6 +821,7 @@ async def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze-file",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -7,6 +7,7 @@ Advanced file organization using LangGraph workflow orchestration
 import os
 import json
 import time
+import uuid
 import asyncio
 from datetime import datetime
 from typing import TypedDict, List, Optional, Dict, Any, Annotated
@@ -19,7 +20,6 @@ import uvicorn
 
 # LangGraph imports
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableParallel
@@ -30,6 +30,9 @@ from loguru import logger
 import sqlite3
 import aiosqlite
 
+from usage_tracker import UsageTracker
+from rules_engine import analyze_with_rules
+
 # Load environment variables
 load_dotenv()
 
@@ -117,6 +120,7 @@ class FileAnalysisResponse(BaseModel):
     content_summary: Optional[str] = None
     processing_time_ms: int
     workflow_id: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None  # LLM calls, tokens and cost of this analysis, by node
 
 class HealthResponse(BaseModel):
     status: str
@@ -132,8 +136,8 @@ class HealthResponse(BaseModel):
 class SilentSortWorkflow:
     def __init__(self):
         self.llm = self._initialize_llm()
+        self.usage = UsageTracker.from_env()
         self.workflow = self._build_workflow()
-        self.checkpointer = MemorySaver()
         
     def _initialize_llm(self) -> ChatOpenAI:
         """Initialize the LangChain LLM"""
@@ -148,6 +152,12 @@ class SilentSortWorkflow:
             openai_api_key=api_key,
         )
     
+    async def _invoke_llm(self, node: str, prompt: str) -> Any:
+        """One LLM call on behalf of `node`, with its token usage recorded"""
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        self.usage.record(node, response)
+        return response
+    
     def _build_workflow(self) -> StateGraph:
         """Build the complete LangGraph workflow"""
         workflow = StateGraph(FileProcessingState)
@@ -187,7 +197,9 @@ class SilentSortWorkflow:
         workflow.add_edge("error_handler", "finalize_result")
         workflow.add_edge("finalize_result", END)
         
-        return workflow.compile(checkpointer=self.checkpointer)
+        # No checkpointer: every run starts from a fresh state and nothing resumes a thread,
+        # so stored checkpoints would only accumulate for the life of the process
+        return workflow.compile()
     
     # ========================================================================
     # WORKFLOW NODES
@@ -227,7 +239,7 @@ Provide analysis in JSON format:
     "content_summary": "2-sentence summary"
 }}"""
 
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            response = await self._invoke_llm("content_analysis", prompt)
             
             try:
                 analysis = json.loads(response.content)
@@ -408,7 +420,7 @@ Requirements:
 
 Return JSON: {{"suggestions": ["name1.ext", "name2.ext", "name3.ext"]}}"""
 
-        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        response = await self._invoke_llm("naming", prompt)
         
         try:
             return json.loads(response.content)
@@ -424,7 +436,7 @@ Analysis: {json.dumps(input_data['content_analysis'], indent=2)}
 
 Return JSON: {{"category": "document", "subcategory": "invoice"}}"""
 
-        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        response = await self._invoke_llm("categorization", prompt)
         
         try:
             return json.loads(response.content)
@@ -486,9 +498,24 @@ async def analyze_file(request: FileAnalysisRequest):
         raise HTTPException(status_code=500, detail="LangGraph workflow not available")
     
     start_time = time.time()
-    workflow_id = f"workflow_{int(time.time())}_{hash(request.file_path) % 10000}"
+    workflow_id = f"workflow_{uuid.uuid4().hex}"  # Unique per run, so reducers never add up across runs
     
     try:
+        # Daily LLM budget spent: answer with the rules engine until it resets
+        if workflow_instance.usage.over_budget():
+            with workflow_instance.usage.request("rules") as usage:
+                result = analyze_with_rules(request.original_name, request.content_preview or "",
+                                            request.file_extension)
+            return FileAnalysisResponse(
+                suggested_name=result["suggested_name"],
+                confidence=0.6,
+                category=result["category"],
+                reasoning=f"Rules engine ({result['category']}/{result['subcategory']}): daily LLM budget reached",
+                processing_time_ms=int((time.time() - start_time) * 1000),
+                workflow_id=workflow_id,
+                usage=usage.as_dict()
+            )
+        
         # Initialize state
         initial_state: FileProcessingState = {
             "file_path": request.file_path,
@@ -515,8 +542,8 @@ async def analyze_file(request: FileAnalysisRequest):
         }
         
         # Run workflow
-        config = {"configurable": {"thread_id": workflow_id}}
-        final_state = await workflow_instance.workflow.ainvoke(initial_state, config=config)
+        with workflow_instance.usage.request("langgraph") as usage:
+            final_state = await workflow_instance.workflow.ainvoke(initial_state)
         
         # Calculate processing time
         processing_time = int((time.time() - start_time) * 1000)
@@ -530,13 +557,19 @@ async def analyze_file(request: FileAnalysisRequest):
             alternatives=final_state.get("alternatives", []),
             content_summary=final_state.get("content_analysis", {}).get("content_summary"),
             processing_time_ms=processing_time,
-            workflow_id=workflow_id
+            workflow_id=workflow_id,
+            usage=usage.as_dict()
         )
         
     except Exception as e:
         logger.error(f"❌ Workflow execution failed: {e}")
         raise HTTPException(status_code=500, detail=f"Workflow failed: {str(e)}")
 
+@app.get("/metrics")
+async def metrics():
+    """Service metrics"""
+    return {"usage": workflow_instance.usage.metrics() if workflow_instance else None}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -555,6 +588,7 @@ async def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze-file",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+SilentSort LLM Cassettes
+Records prompt -> response pairs (with latency and token usage) to a gzipped
+JSONL file and replays them deterministically, so pipeline changes can be
+benchmarked offline against real responses
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+import asyncio
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMiss(KeyError):
+    """Replay was asked for a prompt the cassette never recorded"""
+
+
+def prompt_key(messages: List[Dict[str, str]]) -> str:
+    """Stable key for a conversation: hash of every role and content, in order"""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(message["role"].encode())
+        digest.update(b"\0")
+        digest.update(message["content"].encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class Cassette:
+    """One cassette file, in record or replay mode.
+
+    Recording appends one JSON line per call to a gzip stream (closed at
+    shutdown or exit). Replay loads the file once; a prompt recorded several
+    times is answered with its recordings in order, starting over when they
+    run out, so a replay of the same run is identical. With `replay_latency`
+    each answer waits as long as the recorded call took.
+    """
+
+    def __init__(self, path: str, mode: str = REPLAY, replay_latency: bool = False):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._served: Dict[str, int] = {}
+        self._stream = None
+        self.stats = {"recorded": 0, "hits": 0, "misses": 0}
+
+        if mode == REPLAY:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+            logger.info("📼 Replaying {count} LLM responses from {path}",
+                        count=sum(len(entries) for entries in self._entries.values()), path=path)
+        else:
+            self._stream = gzip.open(path, "at", encoding="utf-8")
+            atexit.register(self.close)
+            logger.info("📼 Recording LLM responses to {path}", path=path)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """None unless LLM_CASSETTE names a file"""
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            path,
+            mode=os.getenv("LLM_CASSETTE_MODE", REPLAY).lower(),
+            replay_latency=os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "false").lower() == "true",
+        )
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def record(self, messages: List[Dict[str, str]], response: str, latency_ms: float,
+               usage: Optional[Dict[str, int]] = None) -> None:
+        entry = {
+            "key": prompt_key(messages),
+            "messages": messages,
+            "response": response,
+            "latency_ms": round(latency_ms, 1),
+            "usage": usage,
+        }
+        with self._lock:
+            self._stream.write(json.dumps(entry) + "\n")
+            self.stats["recorded"] += 1
+
+    def lookup(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        key = prompt_key(messages)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"No recorded response for this prompt in {self.path}")
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            self.stats["hits"] += 1
+            return entries[served % len(entries)]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+
+def _langchain_messages(messages: Any) -> List[Dict[str, str]]:
+    if not isinstance(messages, list):
+        return [{"role": "user", "content": str(messages)}]
+    return [{"role": message.type, "content": str(message.content)} if hasattr(message, "content")
+            else {"role": "user", "content": str(message)} for message in messages]
+
+
+class CassetteChatModel:
+    """LangChain chat model wrapper (`ainvoke`) for the LangGraph services.
+
+    Recording needs the real (or mock) model as `inner`; replay needs none.
+    Other attributes are passed through to `inner`.
+    """
+
+    def __init__(self, inner: Any, cassette: Cassette):
+        if inner is None and not cassette.replaying:
+            raise ValueError("Recording a cassette needs a model to record")
+        self.inner = inner
+        self.cassette = cassette
+
+    def __getattr__(self, name: str) -> Any:
+        if self.inner is None:
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> Any:
+        from langchain_core.messages import AIMessage  # Not loaded by the enhanced service otherwise
+
+        prompt = _langchain_messages(messages)
+        if self.cassette.replaying:
+            entry = self.cassette.lookup(prompt)
+            if self.cassette.replay_latency:
+                await asyncio.sleep(entry["latency_ms"] / 1000)
+            return AIMessage(content=entry["response"], usage_metadata=entry.get("usage"))
+
+        started = time.perf_counter()
+        response = await self.inner.ainvoke(messages, **kwargs)
+        usage = getattr(response, "usage_metadata", None)
+        self.cassette.record(prompt, str(response.content), (time.perf_counter() - started) * 1000,
+                             dict(usage) if usage else None)
+        return response
+
+
+class _CassetteCompletions:
+    def __init__(self, client: "CassetteOpenAIClient"):
+        self._client = client
+
+    def create(self, messages: List[Dict[str, str]], **kwargs: Any) -> Any:
+        cassette = self._client.cassette
+        prompt = [{"role": message["role"], "content": message["content"]} for message in messages]
+        if not cassette.replaying:
+            started = time.perf_counter()
+            response = self._client.inner.chat.completions.create(messages=messages, **kwargs)
+            usage = {
+                "input_tokens": response.usage.prompt_tokens,
+                "output_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            } if getattr(response, "usage", None) else None
+            cassette.record(prompt, response.choices[0].message.content,
+                            (time.perf_counter() - started) * 1000, usage)
+            return response
+
+        entry = cassette.lookup(prompt)
+        if cassette.replay_latency:
+            time.sleep(entry["latency_ms"] / 1000)
+        usage = entry.get("usage") or {}
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(role="assistant", content=entry["response"]))],
+            usage=SimpleNamespace(
+                prompt_tokens=usage.get("input_tokens", 0),
+                completion_tokens=usage.get("output_tokens", 0),
+                total_tokens=usage.get("total_tokens", 0),
+            ),
+        )
+
+
+class CassetteOpenAIClient:
+    """`openai.OpenAI` stand-in (chat.completions.create) for the enhanced service"""
+
+    def __init__(self, inner: Any, cassette: Cassette):
+        if inner is None and not cassette.replaying:
+            raise ValueError("Recording a cassette needs an OpenAI client to record")
+        self.inner = inner
+        self.cassette = cassette
+        self.chat = SimpleNamespace(completions=_CassetteCompletions(self))
+        self.models = inner.models if inner is not None else SimpleNamespace(list=lambda: [])
@@ -5,24 +5,28 @@ Advanced file organization using LangGraph workflow orchestration
 """
 
 import os
+import re
 import json
 import time
+import uuid
 import asyncio
+import operator
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
 from typing import TypedDict, List, Optional, Dict, Any, Annotated
 from enum import Enum
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 import uvicorn
 
 # LangGraph imports
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.runnables import RunnableParallel
 
 # Utilities
 from dotenv import load_dotenv
@@ -30,11 +34,34 @@ from loguru import logger
 import sqlite3
 import aiosqlite
 
+from service_logging import configure_logging, sampled
+from mock_llm import MockChatModel, mock_llm_enabled
+from llm_cassette import Cassette, CassetteChatModel
+from admission import AdmissionController, AdmissionRejected, BACKGROUND
+from jobs import JobManager, COMPLETED, CANCELLED
+from folder_watcher import FolderWatcher
+from content_reader import (
+    ContentReadError, ReadNotAllowedError, read_preview, resolve_readable_path, server_side_read_enabled
+)
+from document_extractors import DocumentExtractor, is_document
+from fingerprint_index import FingerprintIndex
+from directory_planner import DirectoryPlanner
+from batch_runner import BatchRunner, ResultSpool, ndjson_records
+from name_allocator import NameAllocator, allocate_suggested_name
+from user_patterns import UserPatternStore
+from retry_policy import RetryPolicy
+from content_router import ContentRouter, metadata_analysis
+from usage_tracker import UsageTracker
+from rules_engine import analyze_with_rules
+from results_store import ResultStore, export_columns
+from file_grouping import FileGrouper
+from warmup import Warmup
+
 # Load environment variables
 load_dotenv()
 
 # Configure logging
-logger.add("silentsort.log", rotation="10 MB", level="INFO")
+configure_logging("langgraph-multi-agent")
 
 # FastAPI app setup
 app = FastAPI(
@@ -43,10 +70,12 @@ app = FastAPI(
     version="2.0.0"
 )
 
-# Enable CORS
+# Enable CORS for the desktop app's origins only (CORS_ORIGINS, comma-separated)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[o.strip() for o in os.getenv(
+        "CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
+    ).split(",") if o.strip()],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -59,6 +88,7 @@ app.add_middleware(
 class FileProcessingState(TypedDict):
     # File Information
     file_path: str
+    readable_path: Optional[str]  # file_path if the service may open it (watched, or inside the read gate)
     original_filename: str
     file_extension: str
     file_size: int
@@ -82,6 +112,10 @@ class FileProcessingState(TypedDict):
     user_decision: Optional[str]
     error_message: Optional[str]
     retry_count: int
+    failed_stage: Optional[str]  # Node to re-run after a retry
+    llm_calls: Annotated[int, operator.add]
+    wasted_llm_calls: Annotated[int, operator.add]  # Failed calls, plus every call of a request that fell back
+    content_route: Optional[Dict[str, Any]]  # ContentRouter decision: llm or metadata-only
     
     # Context & Learning
     folder_context: Optional[Dict[str, Any]]
@@ -107,6 +141,11 @@ class FileAnalysisRequest(BaseModel):
     file_size: int
     file_extension: str
     content_preview: Optional[str] = None
+    priority: Optional[str] = None  # "interactive" or "background"; X-SilentSort-Priority header wins
+    file_hash: Optional[str] = None  # Optional client-side content hash used to deduplicate job items
+    read_from_path: Optional[bool] = None  # Let the service read the preview from file_path itself
+    use_index: Optional[bool] = None  # False forces a fresh analysis of an already indexed file
+    use_patterns: Optional[bool] = None  # False forces LLM naming even when a learned pattern matches
 
 class FileAnalysisResponse(BaseModel):
     suggested_name: str
@@ -117,6 +156,51 @@ class FileAnalysisResponse(BaseModel):
     content_summary: Optional[str] = None
     processing_time_ms: int
     workflow_id: Optional[str] = None
+    from_index: bool = False  # Answered from the fingerprint index without re-analysis
+    from_pattern: bool = False  # Named by a learned pattern without calling the LLM
+    suggested_folder: Optional[str] = None  # Folder the user usually picks for this category
+    usage: Optional[Dict[str, Any]] = None  # LLM calls, tokens and cost of this analysis, by node
+
+class IndexDecisionRequest(BaseModel):
+    file_path: str
+    approved_name: Optional[str] = None
+    approved_folder: Optional[str] = None
+
+class FeedbackRequest(BaseModel):
+    original_name: str
+    accepted_name: Optional[str] = None  # Name the user kept; None when the suggestion was dismissed
+    suggested_name: Optional[str] = None  # What the service suggested
+    file_path: Optional[str] = None  # The analyzed file, so an unused suggestion can be released
+    category: Optional[str] = None
+    chosen_folder: Optional[str] = None
+
+class JobSubmitRequest(BaseModel):
+    files: List[FileAnalysisRequest]
+
+class PlanDirectoryRequest(BaseModel):
+    directory: str
+    recursive: bool = False
+    use_index: Optional[bool] = None
+
+class BatchAnalysisRequest(BaseModel):
+    files: List[FileAnalysisRequest]
+    max_concurrency: Optional[int] = None  # Capped by BATCH_MAX_CONCURRENCY
+
+class GroupFile(BaseModel):
+    file_path: str
+    original_name: str
+    content_preview: Optional[str] = None
+
+class GroupFilesRequest(BaseModel):
+    files: List[GroupFile] = []  # Indexed first, then grouped; empty: group what the service has analyzed
+    directory: Optional[str] = None  # Only files under this directory (when no files are sent)
+    k: Optional[int] = None  # Number of clusters; sqrt(files / 2) when not given
+    min_similarity: Optional[float] = None  # Files less similar to their cluster stay ungrouped
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    total: int
+    cached: int  # Items answered from earlier analyses of the same file hash
 
 class HealthResponse(BaseModel):
     status: str
@@ -129,24 +213,58 @@ class HealthResponse(BaseModel):
 # LANGGRAPH WORKFLOW IMPLEMENTATION
 # ============================================================================
 
+# Model used instead of the configured LLM in the current task only (the startup
+# warm-up runs the real graph against a mock without affecting live requests)
+llm_override: ContextVar = ContextVar("llm_override", default=None)
+
+def warming_up() -> bool:
+    """True inside the warm-up run, whose retries and routes stay out of /metrics"""
+    return llm_override.get() is not None
+
 class SilentSortWorkflow:
     def __init__(self):
-        self.llm = self._initialize_llm()
+        self._llm = self._initialize_llm()
+        self.retry_policy = RetryPolicy.from_env()
+        self.content_router = ContentRouter.from_env()
+        self.usage = UsageTracker.from_env()
         self.workflow = self._build_workflow()
-        self.checkpointer = MemorySaver()
+    
+    @property
+    def llm(self):
+        return llm_override.get() or self._llm
+    
+    async def _invoke_llm(self, node: str, prompt: str) -> Any:
+        """One LLM call on behalf of `node`, with its token usage recorded"""
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        self.usage.record(node, response)
+        return response
+    
+    async def preconnect(self) -> None:
+        """Open the pooled HTTPS connection to the LLM API (listing models costs no tokens)"""
+        client = getattr(self._llm, "root_async_client", None)
+        if client is not None:
+            await client.models.list()
         
     def _initialize_llm(self) -> ChatOpenAI:
-        """Initialize the LangChain LLM"""
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not configured")
-            
-        return ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
-            max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "1000")),
-            openai_api_key=api_key,
-        )
+        """Initialize the LangChain LLM (wrapped in a cassette when LLM_CASSETTE is set)"""
+        cassette = Cassette.from_env()
+        if cassette and cassette.replaying:
+            return CassetteChatModel(None, cassette)
+        
+        if mock_llm_enabled():
+            llm = MockChatModel()
+        else:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY not configured")
+                
+            llm = ChatOpenAI(
+                model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+                temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
+                max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "1000")),
+                openai_api_key=api_key,
+            )
+        return CassetteChatModel(llm, cassette) if cassette else llm
     
     def _build_workflow(self) -> StateGraph:
         """Build the complete LangGraph workflow"""
@@ -154,11 +272,14 @@ class SilentSortWorkflow:
         
         # Add nodes
         workflow.add_node("load_state", self.load_state_node)
+        workflow.add_node("content_routing", self.content_routing_node)
+        workflow.add_node("metadata_analysis", self.metadata_analysis_node)
         workflow.add_node("content_analysis", self.content_analysis_node)
         workflow.add_node("parallel_processing", self.parallel_processing_node)
         workflow.add_node("decision_routing", self.decision_routing_node)
         workflow.add_node("auto_executor", self.auto_executor_node)
         workflow.add_node("human_approval", self.human_approval_node)
+        workflow.add_node("retry", self.retry_node)
         workflow.add_node("error_handler", self.error_handler_node)
         workflow.add_node("finalize_result", self.finalize_result_node)
         
@@ -166,9 +287,48 @@ class SilentSortWorkflow:
         workflow.set_entry_point("load_state")
         
         # Define edges
-        workflow.add_edge("load_state", "content_analysis")
-        workflow.add_edge("content_analysis", "parallel_processing")
-        workflow.add_edge("parallel_processing", "decision_routing")
+        # Files matching a learned naming pattern skip the LLM nodes entirely
+        workflow.add_conditional_edges(
+            "load_state",
+            self.route_by_patterns,
+            {
+                "learned": "decision_routing",
+                "analyze": "content_routing"
+            }
+        )
+        
+        # Empty, binary and near-empty files are named from metadata without the LLM
+        workflow.add_conditional_edges(
+            "content_routing",
+            self.route_by_content,
+            {
+                "llm": "content_analysis",
+                "metadata": "metadata_analysis"
+            }
+        )
+        workflow.add_edge("metadata_analysis", "decision_routing")
+        
+        # A failed stage goes to the retry node, which sends it back to that same
+        # stage (earlier results stay in the state) or gives up to the error handler
+        workflow.add_conditional_edges(
+            "content_analysis",
+            self.route_stage_result,
+            {"ok": "parallel_processing", "retry": "retry"}
+        )
+        workflow.add_conditional_edges(
+            "parallel_processing",
+            self.route_stage_result,
+            {"ok": "decision_routing", "retry": "retry"}
+        )
+        workflow.add_conditional_edges(
+            "retry",
+            self.route_after_retry,
+            {
+                "content_analysis": "content_analysis",
+                "parallel_processing": "parallel_processing",
+                "error": "error_handler"
+            }
+        )
         
         # Conditional routing from decision_routing
         workflow.add_conditional_edges(
@@ -187,7 +347,9 @@ class SilentSortWorkflow:
         workflow.add_edge("error_handler", "finalize_result")
         workflow.add_edge("finalize_result", END)
         
-        return workflow.compile(checkpointer=self.checkpointer)
+        # No checkpointer: every run starts from a fresh state and nothing resumes a thread,
+        # so stored checkpoints would only accumulate for the life of the process
+        return workflow.compile()
     
     # ========================================================================
     # WORKFLOW NODES
@@ -195,7 +357,9 @@ class SilentSortWorkflow:
     
     async def load_state_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Initialize the workflow state"""
-        logger.info(f"🚀 Loading state for file: {state['original_filename']}")
+        logger.debug("🚀 Loading state for file: {file}", file=state['original_filename'])
+        if not warming_up():
+            self.retry_policy.record_request()
         
         return {
             "processing_stage": ProcessingStage.INITIALIZED.value,
@@ -206,9 +370,30 @@ class SilentSortWorkflow:
             "retry_count": 0
         }
     
+    async def content_routing_node(self, state: FileProcessingState) -> Dict[str, Any]:
+        """Classify the file (MIME sniffing, size, preview) to decide whether the LLM is worth calling"""
+        if not self.content_router:
+            return {"content_route": {"route": "llm", "kind": "unclassified", "mime": None, "metadata": {}}}
+        
+        route = await asyncio.to_thread(
+            self.content_router.classify,
+            state.get("readable_path"), state["original_filename"], state["file_size"], state.get("content_preview") or "",
+            not warming_up()
+        )
+        logger.debug("🧭 {file} is {kind} ({mime}): {route} path", file=state['original_filename'],
+                     kind=route["kind"], mime=route["mime"], route=route["route"])
+        return {"content_route": route}
+    
+    async def metadata_analysis_node(self, state: FileProcessingState) -> Dict[str, Any]:
+        """Name and categorize a file from its metadata alone"""
+        return {
+            **metadata_analysis(state["content_route"], state["original_filename"], state["file_extension"]),
+            "processing_stage": ProcessingStage.PARALLEL_PROCESSING.value
+        }
+    
     async def content_analysis_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Analyze file content using AI"""
-        logger.info(f"🔍 Analyzing content for: {state['original_filename']}")
+        logger.debug("🔍 Analyzing content for: {file}", file=state['original_filename'])
         
         try:
             prompt = f"""Analyze this file and extract key information:
@@ -227,7 +412,16 @@ Provide analysis in JSON format:
     "content_summary": "2-sentence summary"
 }}"""
 
-            response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+            try:
+                response = await self._invoke_llm("content_analysis", prompt)
+            except Exception as e:
+                logger.warning(f"⚠️ Content analysis LLM call failed: {e}")
+                return {
+                    "error_message": f"Content analysis failed: {str(e)}",
+                    "failed_stage": "content_analysis",
+                    "llm_calls": 1,
+                    "wasted_llm_calls": 1
+                }
             
             try:
                 analysis = json.loads(response.content)
@@ -243,49 +437,79 @@ Provide analysis in JSON format:
             
             return {
                 "content_analysis": analysis,
-                "processing_stage": ProcessingStage.CONTENT_ANALYSIS.value
+                "processing_stage": ProcessingStage.CONTENT_ANALYSIS.value,
+                "llm_calls": 1
             }
             
         except Exception as e:
             logger.error(f"❌ Content analysis failed: {e}")
-            return {"error_message": f"Content analysis failed: {str(e)}"}
+            return {"error_message": f"Content analysis failed: {str(e)}", "failed_stage": "content_analysis"}
     
     async def parallel_processing_node(self, state: FileProcessingState) -> Dict[str, Any]:
-        """Run parallel AI agents for naming, categorization, and confidence"""
-        logger.info(f"⚡ Running parallel processing for: {state['original_filename']}")
+        """Run parallel AI agents for naming, categorization, and confidence.
+
+        Only agents without a result in the state run, so a retry repeats just
+        the ones that failed.
+        """
+        logger.debug("⚡ Running parallel processing for: {file}", file=state['original_filename'])
         
-        try:
-            # Run three agents in parallel
-            parallel_chain = RunnableParallel({
-                "naming": self._naming_agent,
-                "categorization": self._categorization_agent,
-                "confidence": self._confidence_agent
-            })
-            
-            # Prepare input for parallel processing
-            input_data = {
-                "content_analysis": state.get("content_analysis", {}),
-                "original_filename": state["original_filename"],
-                "file_extension": state["file_extension"],
-                "content_preview": state.get("content_preview", "")
-            }
-            
-            results = await parallel_chain.ainvoke(input_data)
-            
-            return {
-                "naming_suggestions": results["naming"]["suggestions"],
-                "category_analysis": results["categorization"]["category"],
-                "confidence_scores": results["confidence"]["scores"],
-                "processing_stage": ProcessingStage.PARALLEL_PROCESSING.value
-            }
-            
-        except Exception as e:
-            logger.error(f"❌ Parallel processing failed: {e}")
-            return {"error_message": f"Parallel processing failed: {str(e)}"}
+        # State key -> (agent, key in the agent's result, whether it calls the LLM)
+        agents = {
+            "naming_suggestions": (self._naming_agent, "suggestions", True),
+            "category_analysis": (self._categorization_agent, "category", True),
+            "confidence_scores": (self._confidence_agent, "scores", False),
+        }
+        pending = {key: agent for key, agent in agents.items() if state.get(key) is None}
+        
+        # Prepare input for parallel processing
+        input_data = {
+            "content_analysis": state.get("content_analysis") or {},
+            "original_filename": state["original_filename"],
+            "file_extension": state["file_extension"],
+            "content_preview": state.get("content_preview", "")
+        }
+        
+        # Run the pending agents in parallel; one failing does not discard the others
+        results = await asyncio.gather(
+            *(agent(input_data) for agent, _, _ in pending.values()), return_exceptions=True
+        )
+        
+        update: Dict[str, Any] = {"llm_calls": 0, "wasted_llm_calls": 0}
+        errors = []
+        for (key, (_, result_key, uses_llm)), result in zip(pending.items(), results):
+            update["llm_calls"] += uses_llm
+            if not isinstance(result, Exception) and not (isinstance(result, dict) and result_key in result):
+                # A reply without the expected field is that agent's failure, retried like any other
+                result = ValueError(f"response has no {result_key!r}")
+            if isinstance(result, Exception):
+                update["wasted_llm_calls"] += uses_llm
+                errors.append(f"{key}: {result}")
+            else:
+                update[key] = result[result_key]
+        
+        if errors:
+            logger.warning(f"⚠️ Parallel processing failed: {'; '.join(errors)}")
+            update["error_message"] = f"Parallel processing failed: {'; '.join(errors)}"
+            update["failed_stage"] = "parallel_processing"
+        else:
+            update["processing_stage"] = ProcessingStage.PARALLEL_PROCESSING.value
+        return update
     
     async def decision_routing_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Route based on confidence scores and rules"""
-        logger.info(f"🎯 Routing decision for: {state['original_filename']}")
+        logger.debug("🎯 Routing decision for: {file}", file=state['original_filename'])
+        
+        learned = state.get("user_patterns")
+        if learned:
+            return {
+                "suggested_name": learned["suggested_name"],
+                "final_confidence": learned["confidence"],
+                "final_category": learned.get("category") or "document",
+                "alternatives": [],
+                "reasoning": f"Learned from {learned['support']} names you accepted for files like "
+                             f"{learned['shape']}",
+                "processing_stage": ProcessingStage.DECISION_ROUTING.value
+            }
         
         confidence_scores = state.get("confidence_scores", {})
         overall_confidence = confidence_scores.get("overall", 0.0)
@@ -315,7 +539,7 @@ Provide analysis in JSON format:
     
     async def auto_executor_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Auto-execute high confidence suggestions"""
-        logger.info(f"✅ Auto-executing for: {state['original_filename']}")
+        logger.debug("✅ Auto-executing for: {file}", file=state['original_filename'])
         
         return {
             "user_decision": "auto_approved",
@@ -328,7 +552,7 @@ Provide analysis in JSON format:
     
     async def human_approval_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Handle human-in-the-loop approval"""
-        logger.info(f"👤 Human approval required for: {state['original_filename']}")
+        logger.debug("👤 Human approval required for: {file}", file=state['original_filename'])
         
         # In real implementation, this would wait for user input
         # For now, we'll simulate approval based on confidence
@@ -344,26 +568,53 @@ Provide analysis in JSON format:
             "processing_stage": ProcessingStage.HUMAN_APPROVAL.value
         }
     
+    async def retry_node(self, state: FileProcessingState) -> Dict[str, Any]:
+        """Back off and clear the error so the failed stage runs again; keep the error to give up"""
+        retry_count = state.get("retry_count", 0)
+        delay = None if warming_up() else self.retry_policy.acquire(retry_count)
+        if delay is None:
+            logger.warning("⚠️ Not retrying {stage} for {file} after {retries} retries",
+                           stage=state.get("failed_stage"), file=state['original_filename'], retries=retry_count)
+            return {}
+        
+        logger.info("🔁 Retrying {stage} for {file} in {delay_ms}ms", stage=state.get("failed_stage"),
+                    file=state['original_filename'], delay_ms=int(delay * 1000))
+        await asyncio.sleep(delay)
+        return {"retry_count": retry_count + 1, "error_message": None}
+    
     async def error_handler_node(self, state: FileProcessingState) -> Dict[str, Any]:
-        """Handle errors and provide fallbacks"""
-        logger.warning(f"⚠️ Error handling for: {state['original_filename']}")
+        """Handle errors and provide fallbacks built from whatever the workflow did learn"""
+        logger.warning("⚠️ Error handling for: {file}", file=state['original_filename'])
+        
+        # Partial results survive a failed stage: prefer them over a generic name
+        suggestions = state.get("naming_suggestions") or []
+        content_analysis = state.get("content_analysis") or {}
+        stem = re.sub(r"[^a-z0-9]+", "-", os.path.splitext(state['original_filename'])[0].lower()).strip("-")
+        if suggestions:
+            fallback_name = suggestions[0]
+        elif content_analysis.get("key_topics") and stem:
+            topic = re.sub(r"[^a-z0-9]+", "-", str(content_analysis["key_topics"][0]).lower()).strip("-")
+            fallback_name = f"{topic}-{stem}{state['file_extension']}" if topic and topic not in stem \
+                else f"{stem}{state['file_extension']}"
+        else:
+            fallback_name = f"{stem or 'file'}{state['file_extension']}"
         
-        # Provide basic fallback
-        timestamp = int(time.time())
-        fallback_name = f"processed-{timestamp}{state['file_extension']}"
+        # Calls that succeeded before the request fell back produced nothing used
+        unused_calls = state.get("llm_calls", 0) - state.get("wasted_llm_calls", 0)
         
         return {
             "suggested_name": fallback_name,
             "final_confidence": 0.3,
-            "final_category": "unknown",
-            "reasoning": "Fallback naming due to processing error",
-            "alternatives": [],
-            "processing_stage": ProcessingStage.FAILED.value
+            "final_category": state.get("category_analysis") or "unknown",
+            "reasoning": f"Fallback naming after {state.get('retry_count', 0)} retries: {state.get('error_message')}",
+            "alternatives": suggestions[1:3],
+            "processing_stage": ProcessingStage.FAILED.value,
+            "wasted_llm_calls": unused_calls
         }
     
     async def finalize_result_node(self, state: FileProcessingState) -> Dict[str, Any]:
         """Finalize the workflow results"""
-        logger.info(f"🏁 Finalizing results for: {state['original_filename']}")
+        logger.debug("🏁 Finalizing results for: {file}", file=state['original_filename'])
         
         return {
             "processing_stage": ProcessingStage.COMPLETED.value,
@@ -377,6 +628,22 @@ Provide analysis in JSON format:
     # ROUTING FUNCTIONS
     # ========================================================================
     
+    def route_by_patterns(self, state: FileProcessingState) -> str:
+        """Skip LLM naming when a trusted learned pattern matched the file"""
+        return "learned" if state.get("user_patterns") else "analyze"
+    
+    def route_by_content(self, state: FileProcessingState) -> str:
+        return (state.get("content_route") or {}).get("route", "llm")
+    
+    def route_stage_result(self, state: FileProcessingState) -> str:
+        return "retry" if state.get("error_message") else "ok"
+    
+    def route_after_retry(self, state: FileProcessingState) -> str:
+        """Back to the failed stage, or to the error handler when the retry was refused"""
+        if state.get("error_message"):
+            return "error"
+        return state.get("failed_stage") or "content_analysis"
+    
     def route_by_confidence(self, state: FileProcessingState) -> str:
         """Route based on confidence scores"""
         confidence = state.get("final_confidence", 0.0)
@@ -408,7 +675,7 @@ Requirements:
 
 Return JSON: {{"suggestions": ["name1.ext", "name2.ext", "name3.ext"]}}"""
 
-        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        response = await self._invoke_llm("naming", prompt)
         
         try:
             return json.loads(response.content)
@@ -424,7 +691,7 @@ Analysis: {json.dumps(input_data['content_analysis'], indent=2)}
 
 Return JSON: {{"category": "document", "subcategory": "invoice"}}"""
 
-        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        response = await self._invoke_llm("categorization", prompt)
         
         try:
             return json.loads(response.content)
@@ -459,14 +726,44 @@ Return JSON: {{"category": "document", "subcategory": "invoice"}}"""
 # WORKFLOW INSTANCE & API ENDPOINTS
 # ============================================================================
 
-# Initialize workflow
+# Initialize workflow (timed for startup_profiler.py)
+startup_timings: Dict[str, float] = {}
 try:
+    _init_started = time.perf_counter()
     workflow_instance = SilentSortWorkflow()
+    startup_timings["workflow_init_ms"] = round((time.perf_counter() - _init_started) * 1000, 2)
     logger.info("✅ LangGraph workflow initialized successfully")
 except Exception as e:
     logger.error(f"❌ Failed to initialize LangGraph workflow: {e}")
     workflow_instance = None
 
+# Admission control: interactive requests are never stuck behind a bulk run
+admission = AdmissionController.from_env()
+
+# PDF/DOCX/XLSX text extraction runs in a process pool, off the event loop
+document_extractor = DocumentExtractor.from_env()
+
+# Content fingerprint -> last result and approved name/folder (None when disabled)
+fingerprint_index = FingerprintIndex.from_env()
+
+# Names handed out per directory, so suggestions never collide (None when disabled)
+name_allocator = NameAllocator.from_env()
+
+# Accepted names and folders learned from /feedback (None when disabled)
+user_pattern_store = UserPatternStore.from_env()
+
+# Every analysis result, for offline analytics via /results/export (None when disabled)
+result_store = ResultStore.from_env()
+
+# Term counts of every analyzed file, clustered on demand by /group-files (None when disabled)
+file_grouper = FileGrouper.from_env()
+
+# Where each analysis came from; the LLM-free fraction is reported in /metrics
+analysis_sources = {"llm": 0, "learned_pattern": 0, "fingerprint_index": 0, "metadata": 0, "rules": 0}
+
+# Workflow runs that fell back after failed stages, and the LLM calls they wasted
+workflow_stats = {"requests": 0, "fallbacks": 0, "retries": 0, "llm_calls": 0, "wasted_llm_calls": 0}
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
@@ -478,65 +775,740 @@ async def health_check():
         service_type="langgraph-multi-agent"
     )
 
+def should_read_from_path(request: FileAnalysisRequest) -> bool:
+    """Explicit request flag wins; otherwise SERVER_SIDE_READ applies when no preview was sent.
+    
+    An explicit flag with SERVER_SIDE_READ off is rejected by resolve_readable_path.
+    """
+    if request.read_from_path is not None:
+        return request.read_from_path
+    return not request.content_preview and server_side_read_enabled()
+
+def allowed_path(path: str) -> Optional[str]:
+    """`path` resolved when clients may have the service open it (see resolve_readable_path), else None"""
+    try:
+        return resolve_readable_path(path)
+    except ReadNotAllowedError:
+        return None
+
+def indexed_response(entry: Dict[str, Any], start_time: float) -> FileAnalysisResponse:
+    """Answer from the fingerprint index; the name the user approved wins over the old suggestion"""
+    result = dict(entry["result"])
+    if entry["approved_name"]:
+        result["suggested_name"] = entry["approved_name"]
+    result["processing_time_ms"] = int((time.time() - start_time) * 1000)
+    result["workflow_id"] = None
+    result["from_index"] = True
+    result["usage"] = None  # No LLM calls this time
+    return FileAnalysisResponse(**result)
+
+def build_initial_state(request: FileAnalysisRequest, file_size: int, content_preview: str,
+                        readable_path: Optional[str] = None) -> FileProcessingState:
+    """Fresh workflow state for one file, with any learned pattern and folder preferences"""
+    learned = None
+    folder_context = None
+    if user_pattern_store:
+        if request.use_patterns is not False:
+            learned = user_pattern_store.match(request.original_name)
+        folder_context = user_pattern_store.folder_preferences()
+    return {
+        "file_path": request.file_path,
+        "readable_path": readable_path,
+        "original_filename": request.original_name,
+        "file_extension": request.file_extension,
+        "file_size": file_size,
+        "content_preview": content_preview,
+        "content_analysis": None,
+        "naming_suggestions": None,
+        "category_analysis": None,
+        "confidence_scores": None,
+        "suggested_name": None,
+        "final_confidence": None,
+        "final_category": None,
+        "reasoning": None,
+        "alternatives": None,
+        "processing_stage": ProcessingStage.INITIALIZED.value,
+        "user_decision": None,
+        "error_message": None,
+        "retry_count": 0,
+        "failed_stage": None,
+        "llm_calls": 0,
+        "wasted_llm_calls": 0,
+        "content_route": None,
+        "folder_context": folder_context,
+        "user_patterns": learned,
+        "operation_metadata": {}
+    }
+
+def record_result(request: FileAnalysisRequest, response: FileAnalysisResponse, source: str,
+                  file_size: Optional[int] = None, route: Optional[str] = None,
+                  topics: Optional[List[str]] = None, entities: Optional[Dict[str, Any]] = None) -> None:
+    """Append one analysis to the results store (buffered, written in the background)"""
+    if not result_store:
+        return
+    usage = response.usage or {}
+    result_store.record({
+        "workflow_id": response.workflow_id,
+        "original_name": request.original_name,
+        "file_extension": request.file_extension,
+        "file_size": file_size if file_size is not None else request.file_size,
+        "suggested_name": response.suggested_name,
+        "category": response.category,
+        "confidence": response.confidence,
+        "source": source,
+        "route": route,
+        "processing_time_ms": response.processing_time_ms,
+        "llm_calls": usage.get("calls", 0),
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+        "cost_usd": usage.get("cost_usd", 0.0),
+        "topics": json.dumps(topics) if topics else None,
+        "entities": json.dumps(entities) if entities else None,
+    })
+
+async def unique_name(request: FileAnalysisRequest, response: FileAnalysisResponse) -> FileAnalysisResponse:
+    """Make the suggested name unique in the file's directory (off the event loop: it may list the directory)"""
+    if name_allocator:
+        response.suggested_name = await asyncio.to_thread(
+            allocate_suggested_name, name_allocator, request.file_path, response.suggested_name
+        )
+    return response
+
+def rules_response(request: FileAnalysisRequest, content_preview: str, start_time: float,
+                   workflow_id: str) -> FileAnalysisResponse:
+    """Answer with the rules engine instead of the LLM once the daily LLM budget is spent"""
+    with workflow_instance.usage.request("rules") as usage:
+        result = analyze_with_rules(request.original_name, content_preview, request.file_extension)
+    analysis_sources["rules"] += 1
+    response = FileAnalysisResponse(
+        suggested_name=result["suggested_name"],
+        confidence=0.6,
+        category=result["category"],
+        reasoning=f"Rules engine ({result['category']}/{result['subcategory']}): daily LLM budget reached",
+        processing_time_ms=int((time.time() - start_time) * 1000),
+        workflow_id=workflow_id,
+        usage=usage.as_dict()
+    )
+    record_result(request, response, "rules", entities=result["entities"])
+    return response
+
+async def run_workflow(request: FileAnalysisRequest, allocate_name: bool = True,
+                       watched: bool = False) -> FileAnalysisResponse:
+    """Run one file through the LangGraph workflow"""
+    start_time = time.time()
+    workflow_id = f"workflow_{uuid.uuid4().hex}"  # Unique per run, so reducers never add up across runs
+    
+    # Files the service may read are fingerprinted; known content skips analysis entirely
+    fingerprint = None
+    readable = request.file_path if watched else allowed_path(request.file_path)
+    if fingerprint_index and readable:
+        fingerprint = await fingerprint_index.fingerprint(readable)
+        if fingerprint and request.use_index is not False:
+            entry = await fingerprint_index.lookup(request.file_path, fingerprint)
+            if entry and entry["result"]:
+                analysis_sources["fingerprint_index"] += 1
+                response = indexed_response(entry, start_time)
+                record_result(request, response, "fingerprint_index")
+                return await unique_name(request, response) if allocate_name else response
+    
+    content_preview = request.content_preview or ""
+    file_size = request.file_size
+    if watched or should_read_from_path(request):
+        # Files found by the folder watcher are read as-is; client paths must be inside SERVER_READ_ROOTS
+        path = request.file_path if watched else resolve_readable_path(request.file_path)
+        if is_document(path):
+            content_preview, file_size = await document_extractor.extract(path)
+        else:
+            # Bounded read of just the preview, off the event loop
+            content_preview, file_size, _ = await asyncio.to_thread(read_preview, path)
+    if file_grouper:
+        file_grouper.add(request.file_path, request.original_name, content_preview)
+    
+    # Every log line emitted while this request runs carries its workflow_id
+    with logger.contextualize(workflow_id=workflow_id):
+        try:
+            initial_state = build_initial_state(request, file_size, content_preview, readable)
+            
+            # Over the daily LLM budget only learned patterns still skip the rules engine;
+            # its answers are not indexed, so the file is analyzed properly once budget returns
+            if not initial_state["user_patterns"] and workflow_instance.usage.over_budget():
+                response = rules_response(request, content_preview, start_time, workflow_id)
+                return await unique_name(request, response) if allocate_name else response
+        
+            # Run workflow
+            with workflow_instance.usage.request("langgraph") as usage:
+                final_state = await workflow_instance.workflow.ainvoke(initial_state)
+        
+            # Calculate processing time
+            processing_time = int((time.time() - start_time) * 1000)
+            sampled().info(
+                "Analyzed {file} in {processing_time_ms}ms",
+                file=request.original_name,
+                processing_time_ms=processing_time,
+            )
+        
+            from_pattern = bool(final_state.get("user_patterns"))
+            route = (final_state.get("content_route") or {}).get("route")
+            source = "learned_pattern" if from_pattern else "metadata" if route == "metadata" else "llm"
+            analysis_sources[source] += 1
+            if route and workflow_instance.content_router:
+                workflow_instance.content_router.record_latency(route, processing_time)
+            workflow_stats["requests"] += 1
+            workflow_stats["fallbacks"] += bool(final_state.get("error_message"))
+            workflow_stats["retries"] += final_state.get("retry_count", 0)
+            workflow_stats["llm_calls"] += final_state.get("llm_calls", 0)
+            workflow_stats["wasted_llm_calls"] += final_state.get("wasted_llm_calls", 0)
+            
+            # Return results
+            response = FileAnalysisResponse(
+                suggested_name=final_state.get("suggested_name", request.original_name),
+                confidence=final_state.get("final_confidence", 0.0),
+                category=final_state.get("final_category", "unknown"),
+                reasoning=final_state.get("reasoning", "LangGraph multi-agent analysis"),
+                alternatives=final_state.get("alternatives", []),
+                content_summary=(final_state.get("content_analysis") or {}).get("content_summary"),
+                processing_time_ms=processing_time,
+                workflow_id=workflow_id,
+                from_pattern=from_pattern,
+                suggested_folder=(final_state.get("folder_context") or {}).get(final_state.get("final_category")),
+                usage=usage.as_dict()
+            )
+            record_result(request, response, source, file_size, route,
+                          topics=(final_state.get("content_analysis") or {}).get("key_topics"))
+            if fingerprint:
+                await fingerprint_index.record(request.file_path, fingerprint, response.model_dump())
+            return await unique_name(request, response) if allocate_name else response
+        
+        except Exception as e:
+            logger.error(f"❌ Workflow execution failed: {e}")
+            raise
+
 @app.post("/analyze-file", response_model=FileAnalysisResponse)
-async def analyze_file(request: FileAnalysisRequest):
+async def analyze_file(
+    request: FileAnalysisRequest,
+    x_silentsort_priority: Optional[str] = Header(None),
+):
     """Analyze file using LangGraph multi-agent workflow"""
     
     if not workflow_instance:
         raise HTTPException(status_code=500, detail="LangGraph workflow not available")
     
-    start_time = time.time()
-    workflow_id = f"workflow_{int(time.time())}_{hash(request.file_path) % 10000}"
+    lane = admission.resolve_lane(x_silentsort_priority, request.priority)
     
     try:
-        # Initialize state
-        initial_state: FileProcessingState = {
-            "file_path": request.file_path,
-            "original_filename": request.original_name,
-            "file_extension": request.file_extension,
-            "file_size": request.file_size,
-            "content_preview": request.content_preview or "",
-            "content_analysis": None,
-            "naming_suggestions": None,
-            "category_analysis": None,
-            "confidence_scores": None,
-            "suggested_name": None,
-            "final_confidence": None,
-            "final_category": None,
-            "reasoning": None,
-            "alternatives": None,
-            "processing_stage": ProcessingStage.INITIALIZED.value,
-            "user_decision": None,
-            "error_message": None,
-            "retry_count": 0,
-            "folder_context": None,
-            "user_patterns": None,
-            "operation_metadata": {}
-        }
-        
-        # Run workflow
-        config = {"configurable": {"thread_id": workflow_id}}
-        final_state = await workflow_instance.workflow.ainvoke(initial_state, config=config)
-        
-        # Calculate processing time
-        processing_time = int((time.time() - start_time) * 1000)
-        
-        # Return results
-        return FileAnalysisResponse(
-            suggested_name=final_state.get("suggested_name", request.original_name),
-            confidence=final_state.get("final_confidence", 0.0),
-            category=final_state.get("final_category", "unknown"),
-            reasoning=final_state.get("reasoning", "LangGraph multi-agent analysis"),
-            alternatives=final_state.get("alternatives", []),
-            content_summary=final_state.get("content_analysis", {}).get("content_summary"),
-            processing_time_ms=processing_time,
-            workflow_id=workflow_id
+        async with admission.admit(lane):
+            return await run_workflow(request)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
         )
-        
+    except ReadNotAllowedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ContentReadError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        logger.error(f"❌ Workflow execution failed: {e}")
         raise HTTPException(status_code=500, detail=f"Workflow failed: {str(e)}")
 
+# ============================================================================
+# JOB QUEUE (large organization runs)
+# ============================================================================
+
+async def analyze_in_background(request: FileAnalysisRequest, allocate_name: bool = True,
+                                watched: bool = False) -> Dict[str, Any]:
+    """Analyze one file in the background admission lane, waiting out a full queue"""
+    while True:
+        try:
+            async with admission.admit(BACKGROUND):
+                result = await run_workflow(request, allocate_name, watched)
+            return result.model_dump()
+        except AdmissionRejected as e:
+            await asyncio.sleep(e.retry_after)
+
+async def analyze_job_item(payload: Dict[str, Any], allocate_name: bool = True,
+                           watched: bool = False) -> Dict[str, Any]:
+    """Analyze one job item in the background admission lane"""
+    return await analyze_in_background(FileAnalysisRequest(**payload), allocate_name, watched)
+
+job_manager = JobManager.from_env(analyze_job_item)
+
+async def analyze_plan_item(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """A job item whose name is allocated by the planner in its target folder instead"""
+    return await analyze_job_item(payload, allocate_name=False)
+
+# Whole-directory plans reuse the same background-lane analysis (and its caches)
+directory_planner = DirectoryPlanner.from_env(analyze_plan_item)
+
+async def analyze_batch_item(request: FileAnalysisRequest) -> Dict[str, Any]:
+    """One file of an /analyze-batch request; all batches and streams share the background lane's slots"""
+    return await analyze_in_background(request)
+
+batch_runner = BatchRunner.from_env(analyze_batch_item)
+
+async def analyze_stream_item(item: Any) -> Dict[str, Any]:
+    """One record of an /analyze-stream body; records that failed to parse arrive as the exception"""
+    if isinstance(item, Exception):
+        raise item
+    return await analyze_in_background(item)
+
+# Separate runner so /metrics reports streams apart from bounded batches
+stream_runner = BatchRunner.from_env(analyze_stream_item)
+STREAM_MAX_RECORD_BYTES = int(os.getenv("STREAM_MAX_RECORD_BYTES", str(1 << 20)))
+STREAM_SPOOL_MEMORY_BYTES = int(os.getenv("STREAM_SPOOL_MEMORY_BYTES", str(1 << 20)))
+
+# ============================================================================
+# FOLDER WATCHER (service-side ingestion)
+# ============================================================================
+
+watched_results = deque(maxlen=200)
+
+async def analyze_watched_file(path: str, fingerprint: str) -> None:
+    """Analyze a settled file found by the folder watcher and remember the result"""
+    request = FileAnalysisRequest(
+        file_path=path,
+        original_name=os.path.basename(path),
+        file_size=os.path.getsize(path),
+        file_extension=os.path.splitext(path)[1],
+        file_hash=fingerprint,
+        read_from_path=True
+    )
+    result = await analyze_job_item(request.model_dump(), watched=True)
+    await job_manager.store.store_result(fingerprint, result)
+    watched_results.append({"file_path": path, "file_hash": fingerprint, "result": result})
+
+async def is_known_fingerprint(path: str, fingerprint: str) -> bool:
+    if fingerprint_index:
+        return await fingerprint_index.lookup(path, fingerprint) is not None
+    return await job_manager.store.cached_result(fingerprint) is not None
+
+folder_watcher = FolderWatcher.from_env(analyze_watched_file, is_known_fingerprint)
+
+# ============================================================================
+# WARM-UP & READINESS
+# ============================================================================
+
+warmup = Warmup()
+
+# Forks the extraction workers first: the copy-on-write faults that follow a fork
+# are then absorbed by the remaining steps instead of the first request
+@warmup.step("extraction_pool")
+async def warm_extraction_pool():
+    await document_extractor.warm()
+
+@warmup.step("llm_connection")
+async def warm_llm_connection():
+    if workflow_instance:
+        await workflow_instance.preconnect()
+
+@warmup.step("graph")
+async def warm_graph():
+    """One synthetic file through the compiled graph with a zero-latency mock model, so
+    first-run costs in LangGraph, LangChain and pydantic are not paid by the first user"""
+    if not workflow_instance:
+        return
+    token = llm_override.set(MockChatModel(latency_ms=0, failure_rate=0, max_rps=0))
+    request = FileAnalysisRequest(
+        file_path="/warmup/quarterly-report.txt",
+        original_name="quarterly-report.txt",
+        file_size=64,
+        file_extension=".txt"
+    )
+    state = build_initial_state(request, 64, "Quarterly report for Contoso Ltd")
+    state["user_patterns"] = None  # Always warm the LLM nodes
+    try:
+        await workflow_instance.workflow.ainvoke(state)
+    finally:
+        llm_override.reset(token)
+
+@warmup.step("content_reader")
+async def warm_content_reader():
+    # Starts the default thread pool and allocates its read buffer
+    await asyncio.to_thread(read_preview, __file__)
+
+@warmup.step("fingerprint_index")
+async def warm_fingerprint_index():
+    if fingerprint_index:
+        await fingerprint_index.lookup_fingerprint("warmup")
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start job workers, resume interrupted items and warm up in the background"""
+    if fingerprint_index:
+        await fingerprint_index.open()
+    if user_pattern_store:
+        await user_pattern_store.open()
+    if result_store:
+        await result_store.open()
+    if workflow_instance:
+        await job_manager.start()
+        if folder_watcher:
+            await folder_watcher.start()
+    warmup.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await warmup.stop()
+    if workflow_instance:
+        if folder_watcher:
+            await folder_watcher.stop()
+        await job_manager.stop()
+    if fingerprint_index:
+        await fingerprint_index.close()
+    if user_pattern_store:
+        await user_pattern_store.close()
+    if result_store:
+        await result_store.close()
+    document_extractor.shutdown()
+
+@app.get("/ready")
+async def readiness():
+    """Readiness probe: 503 until the startup warm-up has finished"""
+    status = warmup.status()
+    status["langgraph_enabled"] = workflow_instance is not None
+    if not (warmup.ready and workflow_instance):
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+@app.get("/watcher")
+async def watcher_status():
+    """Folder watcher state and the most recent results it produced"""
+    if not folder_watcher:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "folders": folder_watcher.folders,
+        "metrics": folder_watcher.metrics(),
+        "recent_results": list(watched_results)
+    }
+
+# ============================================================================
+# FINGERPRINT INDEX
+# ============================================================================
+
+def _require_index():
+    if not fingerprint_index:
+        raise HTTPException(status_code=404, detail="Fingerprint index disabled")
+
+@app.get("/index/lookup")
+async def index_lookup(file_path: Optional[str] = None, fingerprint: Optional[str] = None):
+    """What the service already knows about a file, by local path or by fingerprint"""
+    _require_index()
+    if file_path:
+        try:
+            fingerprint = await fingerprint_index.fingerprint(resolve_readable_path(file_path))
+        except ReadNotAllowedError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        entry = await fingerprint_index.lookup(file_path, fingerprint) if fingerprint else None
+        if entry is None:
+            raise HTTPException(status_code=404, detail="File not indexed")
+        return entry
+    if fingerprint:
+        entries = await fingerprint_index.lookup_fingerprint(fingerprint)
+        if not entries:
+            raise HTTPException(status_code=404, detail="Fingerprint not indexed")
+        return {"fingerprint": fingerprint, "entries": entries}
+    raise HTTPException(status_code=400, detail="Pass file_path or fingerprint")
+
+@app.post("/index/decision")
+async def index_decision(request: IndexDecisionRequest):
+    """Record the name and folder the user approved for a file"""
+    _require_index()
+    try:
+        fingerprint = await fingerprint_index.fingerprint(resolve_readable_path(request.file_path))
+    except ReadNotAllowedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    if fingerprint is None:
+        raise HTTPException(status_code=422, detail=f"Cannot read {request.file_path}")
+    await fingerprint_index.record(
+        request.file_path, fingerprint,
+        approved_name=request.approved_name,
+        approved_folder=request.approved_folder
+    )
+    return {"fingerprint": fingerprint, "recorded": True}
+
+# ============================================================================
+# USER FEEDBACK
+# ============================================================================
+
+@app.post("/feedback")
+async def feedback(request: FeedbackRequest):
+    """Learn from the name and folder the user kept for a file"""
+    if name_allocator and request.file_path and request.suggested_name \
+            and request.accepted_name != request.suggested_name:
+        # The suggestion was not used: free it for the next file in that directory
+        name_allocator.release(os.path.dirname(request.file_path), request.suggested_name)
+    if not user_pattern_store:
+        raise HTTPException(status_code=404, detail="User patterns disabled")
+    template = user_pattern_store.record_feedback(
+        request.original_name,
+        accepted_name=request.accepted_name,
+        suggested_name=request.suggested_name,
+        category=request.category,
+        chosen_folder=request.chosen_folder
+    )
+    return {"recorded": True, "template": template}
+
+# ============================================================================
+# RESULTS EXPORT (offline analytics)
+# ============================================================================
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+@app.get("/results/export")
+async def export_results(format: str = "ndjson", columns: Optional[str] = None,
+                         since: Optional[float] = None, until: Optional[float] = None):
+    """Stream stored analysis results (optionally some columns, between two Unix times) as NDJSON, CSV or Parquet"""
+    if not result_store:
+        raise HTTPException(status_code=404, detail="Results store disabled")
+    try:
+        names = export_columns(format, columns)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Include results still waiting for the next background write
+    await result_store.flush()
+    return StreamingResponse(
+        result_store.export(format, names, since, until),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="silentsort-results.{format}"'}
+    )
+
+@app.get("/results")
+async def results_summary():
+    """Rows and time range in the results store, plus write counters"""
+    if not result_store:
+        raise HTTPException(status_code=404, detail="Results store disabled")
+    return await result_store.summary()
+
+# ============================================================================
+# FILE GROUPING
+# ============================================================================
+
+@app.post("/group-files")
+async def group_files(request: GroupFilesRequest):
+    """Cluster related files (same project, same vendor) by TF-IDF similarity of their names and previews"""
+    if not file_grouper:
+        raise HTTPException(status_code=404, detail="File grouping disabled")
+    for file in request.files:
+        file_grouper.add(file.file_path, file.original_name, file.content_preview or "")
+    return await file_grouper.group(
+        paths=[file.file_path for file in request.files],
+        directory=request.directory,
+        k=request.k,
+        min_similarity=request.min_similarity
+    )
+
+# ============================================================================
+# JOB QUEUE ENDPOINTS
+# ============================================================================
+
+def _require_jobs():
+    if not workflow_instance:
+        raise HTTPException(status_code=500, detail="LangGraph workflow not available")
+
+@app.post("/jobs", response_model=JobSubmitResponse)
+async def submit_job(request: JobSubmitRequest):
+    """Submit a list of files for analysis; poll or stream the job for results"""
+    _require_jobs()
+    if not request.files:
+        raise HTTPException(status_code=400, detail="No files submitted")
+    
+    job_id, total, cached = await job_manager.submit(
+        [file.model_dump(exclude_none=True) for file in request.files]
+    )
+    return JobSubmitResponse(job_id=job_id, total=total, cached=cached)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status with per-state item counts"""
+    _require_jobs()
+    status = await job_manager.store.job_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return status
+
+@app.get("/jobs/{job_id}/results")
+async def get_job_results(job_id: str, after: int = -1, limit: int = 500):
+    """Finished items after `after` (an item_index), in submission order"""
+    _require_jobs()
+    if await job_manager.store.job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job_id, "results": await job_manager.store.job_results(job_id, after, min(limit, 5000))}
+
+@app.get("/jobs/{job_id}/stream")
+async def stream_job_results(job_id: str, after: int = -1):
+    """Stream finished items as NDJSON until the job completes or is cancelled"""
+    _require_jobs()
+    if await job_manager.store.job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def results():
+        last_index = after
+        while True:
+            status = await job_manager.store.job_status(job_id)
+            batch = await job_manager.store.job_results(job_id, last_index)
+            for item in batch:
+                last_index = item["item_index"]
+                yield json.dumps(item) + "\n"
+            if not batch:
+                if status["status"] in (COMPLETED, CANCELLED):
+                    yield json.dumps({"job": status}) + "\n"
+                    return
+                await asyncio.sleep(0.5)
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel all items of a job that have not started yet"""
+    _require_jobs()
+    if await job_manager.store.job_status(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    cancelled = await job_manager.store.cancel_job(job_id)
+    return {"job_id": job_id, "cancelled_items": cancelled}
+
+# ============================================================================
+# DIRECTORY PLANNER
+# ============================================================================
+
+@app.post("/plan-directory")
+async def plan_directory(request: PlanDirectoryRequest):
+    """Analyze every file in a directory and stream one rename/move plan as NDJSON"""
+    _require_jobs()
+    try:
+        directory = resolve_readable_path(request.directory)
+    except ReadNotAllowedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    
+    files = await asyncio.to_thread(directory_planner.scan, directory, request.recursive)
+    if len(files) > directory_planner.max_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"More than {directory_planner.max_files} files; plan subfolders separately"
+        )
+    
+    async def plan():
+        async for event in directory_planner.plan(directory, files, request.use_index):
+            yield json.dumps(event) + "\n"
+    
+    return StreamingResponse(plan(), media_type="application/x-ndjson")
+
+@app.post("/analyze-batch")
+async def analyze_batch(request: BatchAnalysisRequest):
+    """Analyze many files concurrently and stream each result as NDJSON as soon as it completes"""
+    if not workflow_instance:
+        raise HTTPException(status_code=500, detail="LangGraph workflow not available")
+    if len(request.files) > batch_runner.max_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"More than {batch_runner.max_files} files; split the batch or submit a job"
+        )
+    
+    async def results():
+        async for event in batch_runner.run(request.files, request.max_concurrency):
+            if "index" in event:
+                event["file_path"] = request.files[event["index"]].file_path
+            yield json.dumps(event) + "\n"
+    
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+class DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse sent while the endpoint is still reading the request body.
+
+    The stock response listens for a disconnect on receive() while it
+    streams, which would swallow the body chunks the endpoint has yet to
+    read; a client that goes away shows up as a failed read or send instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+@app.post("/analyze-stream")
+async def analyze_stream(http_request: Request, max_concurrency: Optional[int] = None):
+    """Analyze an NDJSON stream of FileAnalysisRequest records, streaming NDJSON results in completion order.
+
+    Records are read from the body only as workers free up, and results are
+    spooled to disk while the client is still uploading, so memory stays
+    constant however long the stream is.
+    """
+    if not workflow_instance:
+        raise HTTPException(status_code=500, detail="LangGraph workflow not available")
+    
+    async def records():
+        async for line in ndjson_records(http_request.stream(), STREAM_MAX_RECORD_BYTES):
+            try:
+                yield FileAnalysisRequest.model_validate_json(line)
+            except ValidationError as e:
+                yield ValueError(f"Invalid record: {e.errors(include_url=False)[0]['msg']}")
+    
+    def describe(item: Any) -> Dict[str, Any]:
+        return {"file_path": item.file_path} if isinstance(item, FileAnalysisRequest) else {}
+    
+    spool = ResultSpool(STREAM_SPOOL_MEMORY_BYTES)
+    
+    async def produce():
+        try:
+            async for event in stream_runner.run(records(), max_concurrency, describe):
+                spool.write((json.dumps(event) + "\n").encode())
+        finally:
+            spool.close()
+    
+    async def results():
+        producer = asyncio.create_task(produce())
+        try:
+            async for chunk in spool.chunks():
+                yield chunk
+            await producer
+        finally:
+            producer.cancel()
+    
+    return DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+@app.get("/metrics")
+async def metrics():
+    """Service metrics"""
+    return {
+        "admission": admission.metrics(),
+        "jobs": {
+            "workers": job_manager.worker_count,
+            "processed": job_manager.processed
+        },
+        "watcher": folder_watcher.metrics() if folder_watcher else None,
+        "extraction": document_extractor.stats,
+        "index": fingerprint_index.stats if fingerprint_index else None,
+        "planner": directory_planner.stats(),
+        "batches": batch_runner.stats(),
+        "streams": stream_runner.stats(),
+        "names": name_allocator.stats if name_allocator else None,
+        "patterns": user_pattern_store.stats if user_pattern_store else None,
+        "results": result_store.stats if result_store else None,
+        "grouping": {**file_grouper.stats, "documents": file_grouper.documents,
+                     "dead_rows": file_grouper.dead_rows, "terms": len(file_grouper.terms)} if file_grouper else None,
+        "analysis_sources": {
+            **analysis_sources,
+            "llm_free_fraction": round(
+                1 - analysis_sources["llm"] / max(1, sum(analysis_sources.values())), 3
+            )
+        },
+        "content_routing": (
+            workflow_instance.content_router.metrics()
+            if workflow_instance and workflow_instance.content_router else None
+        ),
+        "workflow": {
+            **workflow_stats,
+            "fallback_rate": round(workflow_stats["fallbacks"] / max(1, workflow_stats["requests"]), 4),
+            "retries_per_request": round(workflow_stats["retries"] / max(1, workflow_stats["requests"]), 3),
+            "wasted_llm_calls_per_request": round(
+                workflow_stats["wasted_llm_calls"] / max(1, workflow_stats["requests"]), 3
+            ),
+            "retry_policy": workflow_instance.retry_policy.metrics() if workflow_instance else None
+        },
+        "usage": workflow_instance.usage.metrics() if workflow_instance else None,
+        "warmup": warmup.status()
+    }
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -554,17 +1526,29 @@ async def root():
         ],
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "analyze": "/analyze-file",
+            "jobs": "/jobs",
+            "plan": "/plan-directory",
+            "batch": "/analyze-batch",
+            "stream": "/analyze-stream",
+            "index": "/index/lookup",
+            "feedback": "/feedback",
+            "results": "/results/export",
+            "group": "/group-files",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
 
 if __name__ == "__main__":
-    # Development server
+    # RELOAD=true (default) is the development server; without the reloader the
+    # app object is served directly instead of importing this module a second time
+    reload = os.getenv("RELOAD", "true").lower() == "true"
     uvicorn.run(
-        "main:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True,
+        "main:app" if reload else app,
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        reload=reload,
         log_level="info"
     ) 
\ No newline at end of file
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+SilentSort Mock LLM
+Offline stand-in for ChatOpenAI (and the OpenAI client) used for benchmarks
+and local development
+"""
+
+import os
+import re
+import json
+import time
+import random
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def mock_llm_enabled() -> bool:
+    """True when SILENTSORT_MOCK_LLM asks for the offline model"""
+    return os.getenv("SILENTSORT_MOCK_LLM", "false").lower() in ("1", "true", "yes")
+
+
+class MockChatModel:
+    """Answers the workflow prompts with well-formed JSON after a simulated delay.
+
+    The responses are derived from the prompt (file name, extension) so they are
+    deterministic per file, and `usage_metadata` is populated the same way the
+    OpenAI integration does so token accounting can be exercised offline.
+    `failure_rate` makes that fraction of calls raise, to exercise retries and
+    fallbacks; `max_rps` emulates a provider rate limit, delaying calls beyond
+    it to the next free slot.
+    """
+
+    model_name = "mock-llm"
+
+    def __init__(self, latency_ms: Optional[float] = None, jitter: float = 0.2,
+                 failure_rate: Optional[float] = None, max_rps: Optional[float] = None):
+        if latency_ms is None:
+            latency_ms = float(os.getenv("MOCK_LLM_LATENCY_MS", "50"))
+        if failure_rate is None:
+            failure_rate = float(os.getenv("MOCK_LLM_FAILURE_RATE", "0"))
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        if max_rps is None:
+            max_rps = float(os.getenv("MOCK_LLM_MAX_RPS", "0"))
+        self.failure_rate = failure_rate
+        self.max_rps = max_rps
+        self._next_slot = 0.0
+        self.calls = 0
+        self.failures = 0
+
+    def _wait(self) -> float:
+        """Seconds this call waits: for its rate-limit slot, then the simulated latency"""
+        self.calls += 1
+        wait = 0.0
+        if self.max_rps > 0:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self.max_rps
+            wait = slot - now
+        if self.latency_ms > 0:
+            wait += self.latency_ms * random.uniform(1 - self.jitter, 1 + self.jitter) / 1000
+        return wait
+
+    def _complete(self, prompt: str) -> Tuple[str, Dict[str, int]]:
+        """Response text and token usage for a prompt (or the simulated failure)"""
+        if self.failure_rate and random.random() < self.failure_rate:
+            self.failures += 1
+            raise RuntimeError("Simulated LLM failure (MOCK_LLM_FAILURE_RATE)")
+
+        content = json.dumps(self._respond(prompt))
+        input_tokens = max(1, len(prompt) // 4)
+        output_tokens = max(1, len(content) // 4)
+        return content, {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> Any:
+        from langchain_core.messages import AIMessage  # Not installed for the OpenAI-client services
+
+        prompt = "\n".join(str(m.content) for m in messages) if isinstance(messages, list) else str(messages)
+        wait = self._wait()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        content, usage = self._complete(prompt)
+        return AIMessage(content=content, usage_metadata=usage)
+
+    @staticmethod
+    def _field(prompt: str, label: str, default: str = "") -> str:
+        match = re.search(rf"^(?:- )?{label}:\s*(.+)$", prompt, re.MULTILINE)
+        return match.group(1).strip() if match else default
+
+    def _respond(self, prompt: str) -> Dict[str, Any]:
+        filename = self._field(prompt, "(?:File|Original|Current name)", "file.txt")
+        stem, _, extension = filename.rpartition(".")
+        stem = re.sub(r"[^a-z0-9]+", "-", (stem or filename).lower()).strip("-") or "file"
+        extension = f".{extension}" if stem and extension else ""
+
+        alternatives = [f"{stem}-document{extension}", f"{stem}-file{extension}"]
+        if '"suggestedName"' in prompt:  # Enhanced services
+            return {"suggestedName": f"{stem}-renamed{extension}", "confidence": 0.85,
+                    "reasoning": "Mock naming", "alternatives": alternatives,
+                    "contentSummary": f"Mock summary of {filename}."}
+        if '"suggested_name"' in prompt:  # Simple service
+            return {"suggested_name": f"{stem}-renamed{extension}", "confidence": 0.8, "category": "document",
+                    "reasoning": "Mock naming", "alternatives": alternatives,
+                    "content_summary": f"Mock summary of {filename}."}
+        if "folder organization expert" in prompt:
+            return {
+                "suggestions": [
+                    {"path": "Files/Documents", "confidence": 0.8,
+                     "reasoning": "Mock folder suggestion", "category": "document"}
+                ],
+                "analysis": {"organization_strategy": "category-based",
+                             "primary_context": "business", "recommended_depth": 2},
+            }
+        if "file naming expert" in prompt:
+            return {"suggestions": [f"{stem}-renamed{extension}", *alternatives]}
+        if "Categorize this file" in prompt:
+            return {"category": "document", "subcategory": "general"}
+        return {
+            "content_type": "document",
+            "key_topics": [stem],
+            "document_purpose": f"Mock analysis of {filename}",
+            "business_context": "general",
+            "content_summary": f"Mock summary of {filename}.",
+        }
+
+
+class MockOpenAIClient:
+    """`openai.OpenAI` stand-in (chat.completions.create, models.list) answering from a MockChatModel"""
+
+    def __init__(self, model: Optional[MockChatModel] = None):
+        self.model = model or MockChatModel()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(list=lambda: [])
+
+    def _create(self, messages: List[Dict[str, str]], **kwargs: Any) -> Any:
+        prompt = "\n".join(message["content"] for message in messages)
+        wait = self.model._wait()
+        if wait > 0:
+            time.sleep(wait)
+        content, usage = self.model._complete(prompt)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(role="assistant", content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=usage["input_tokens"],
+                completion_tokens=usage["output_tokens"],
+                total_tokens=usage["total_tokens"],
+            ),
+        )
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+SilentSort Name Allocator
+In-memory index of the names used in each target directory, so every
+suggested name is unique before it reaches the client
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from loguru import logger
+
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(value: str) -> str:
+    return _NON_SLUG.sub("-", value.lower()).strip("-")
+
+
+class DirectoryNames:
+    """Names taken in one directory (lowercased: the client may be on a case-insensitive filesystem)"""
+    __slots__ = ("taken", "next_suffix", "by_source")
+
+    def __init__(self, taken: Set[str]):
+        self.taken = taken
+        self.next_suffix: Dict[Tuple[str, str], int] = {}  # (stem, extension) -> next suffix to try
+        self.by_source: Dict[str, Tuple[str, str]] = {}  # source path -> (name requested, name allocated)
+
+
+class NameAllocator:
+    """Allocates unique file names per target directory.
+
+    A directory's existing entries are listed once, on first use; after that
+    each allocation is a set lookup plus, for the chosen name, one existence
+    check against the disk (to catch files created since the listing). A
+    taken name first tries the disambiguating entity (`report-acme.pdf`),
+    then numeric suffixes (`report-2.pdf`) continuing from the last one
+    handed out for that stem, so 100k identical names do not rescan 1..n.
+    Allocations are keyed by source path: asking again for the same file
+    returns the same name. Allocation order alone decides the result.
+    """
+
+    def __init__(self, max_directories: int = 256):
+        self.max_directories = max_directories
+        self._directories: "OrderedDict[str, DirectoryNames]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.collisions = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["NameAllocator"]:
+        if os.getenv("NAME_ALLOCATOR_ENABLED", "true").lower() != "true":
+            return None
+        return cls(max_directories=int(os.getenv("NAME_ALLOCATOR_MAX_DIRECTORIES", "256")))
+
+    def _names(self, directory: str) -> DirectoryNames:
+        names = self._directories.get(directory)
+        if names is not None:
+            self._directories.move_to_end(directory)
+            return names
+        try:
+            taken = {entry.name.lower() for entry in os.scandir(directory)} if directory else set()
+        except OSError:
+            taken = set()  # Not on this machine (client-side path) or not created yet
+        names = self._directories[directory] = DirectoryNames(taken)
+        while len(self._directories) > self.max_directories:
+            self._directories.popitem(last=False)
+        return names
+
+    def _free(self, directory: str, names: DirectoryNames, name: str) -> bool:
+        key = name.lower()
+        if key in names.taken:
+            return False
+        if directory and os.path.lexists(os.path.join(directory, name)):
+            names.taken.add(key)
+            return False
+        return True
+
+    def allocate(self, directory: str, name: str, source: Optional[str] = None,
+                 entity: Optional[str] = None) -> str:
+        """Unique variant of `name` in `directory`, reserved until released or evicted"""
+        directory = os.path.abspath(directory) if directory else ""
+        with self._lock:
+            names = self._names(directory)
+            self.allocations += 1
+
+            if source:
+                source = os.path.abspath(source)
+                previous = names.by_source.get(source)
+                if previous is not None:
+                    if previous[0] == name:
+                        return previous[1]
+                    names.taken.discard(previous[1].lower())
+                # A file keeping its own name in its own directory is not a collision
+                if os.path.join(directory, name).lower() == source.lower():
+                    names.taken.add(name.lower())
+                    names.by_source[source] = (name, name)
+                    return name
+
+            chosen = name
+            if not self._free(directory, names, name):
+                self.collisions += 1
+                stem, extension = os.path.splitext(name)
+                chosen = None
+                slug = slugify(entity) if entity else ""
+                if slug and slug not in stem.lower():
+                    candidate = f"{stem}-{slug}{extension}"
+                    if self._free(directory, names, candidate):
+                        chosen = candidate
+                if chosen is None:
+                    key = (stem.lower(), extension.lower())
+                    suffix = names.next_suffix.get(key, 2)
+                    while not self._free(directory, names, f"{stem}-{suffix}{extension}"):
+                        suffix += 1
+                    names.next_suffix[key] = suffix + 1
+                    chosen = f"{stem}-{suffix}{extension}"
+
+            names.taken.add(chosen.lower())
+            if source:
+                names.by_source[source] = (name, chosen)
+            return chosen
+
+    def release(self, directory: str, name: str) -> None:
+        """Give a reserved name back (the client renamed to something else)"""
+        directory = os.path.abspath(directory) if directory else ""
+        with self._lock:
+            names = self._directories.get(directory)
+            if names is not None:
+                names.taken.discard(name.lower())
+                for source, (_, allocated) in list(names.by_source.items()):
+                    if allocated == name:
+                        del names.by_source[source]
+
+    def forget(self, directory: str) -> None:
+        with self._lock:
+            self._directories.pop(os.path.abspath(directory) if directory else "", None)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"directories": len(self._directories), "allocations": self.allocations, "collisions": self.collisions}
+
+
+def allocate_suggested_name(allocator: Optional[NameAllocator], file_path: str, suggested_name: str,
+                            entity: Optional[str] = None) -> str:
+    """`suggested_name` made unique in the directory of `file_path` (the file is renamed in place)"""
+    if allocator is None or not suggested_name:
+        return suggested_name
+    try:
+        return allocator.allocate(os.path.dirname(file_path), suggested_name, source=file_path, entity=entity)
+    except Exception as e:
+        logger.warning(f"⚠️ Name allocation failed for {file_path}: {e}")
+        return suggested_name
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+SilentSort Results Store
+Every analysis result (name, category, confidence, source, latency, token
+usage, topics and entities) appended to a column-oriented SQLite file for
+offline analytics, and exported as NDJSON, CSV or Parquet
+"""
+
+import io
+import os
+import csv
+import json
+import time
+import zlib
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
+from loguru import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Column -> type; topics and entities hold JSON text
+COLUMNS: Dict[str, str] = {
+    "recorded_at": "float",
+    "workflow_id": "str",
+    "original_name": "str",
+    "file_extension": "str",
+    "file_size": "int",
+    "suggested_name": "str",
+    "category": "str",
+    "confidence": "float",
+    "source": "str",  # llm, learned_pattern, metadata, rules or fingerprint_index (as in /metrics)
+    "route": "str",
+    "processing_time_ms": "int",
+    "llm_calls": "int",
+    "input_tokens": "int",
+    "output_tokens": "int",
+    "cost_usd": "float",
+    "topics": "str",
+    "entities": "str",
+}
+_RECORDED_FIELDS = tuple(COLUMNS)[1:]
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+# One row per chunk (a batch of results written together) and one compressed
+# value array per chunk and column, so an export reads only the columns it needs
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_chunks (
+    chunk_id    INTEGER PRIMARY KEY,
+    rows        INTEGER NOT NULL,
+    first_at    REAL NOT NULL,
+    last_at     REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS result_columns (
+    chunk_id    INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    data        BLOB NOT NULL,
+    PRIMARY KEY (chunk_id, name)
+) WITHOUT ROWID;
+"""
+
+
+def encode_column(values: Sequence[Any]) -> bytes:
+    return zlib.compress(json.dumps(values, separators=(",", ":")).encode(), 6)
+
+
+def decode_column(data: bytes) -> List[Any]:
+    return json.loads(zlib.decompress(data))
+
+
+def encode_chunk(rows: List[Tuple[Any, ...]]) -> List[Tuple[str, bytes]]:
+    """(column, compressed values) for a batch of rows in COLUMNS order"""
+    return [(name, encode_column(values)) for name, values in zip(COLUMNS, zip(*rows))]
+
+
+def export_columns(format: str, columns: Optional[str] = None) -> List[str]:
+    """Columns to export from a comma-separated list (all when empty); ValueError for bad arguments"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format {format!r}; use one of {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and not PYARROW_AVAILABLE:
+        raise ValueError("Parquet export needs pyarrow")
+    names = [name.strip() for name in (columns or "").split(",") if name.strip()] or list(COLUMNS)
+    unknown = [name for name in names if name not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return names
+
+
+class ResultStore:
+    """Append-only analysis results in columnar chunks.
+
+    `record()` only appends a tuple to an in-memory buffer, so requests never
+    wait for the store. A background task turns the buffer into one chunk
+    every `flush_seconds` (sooner once `flush_batch` rows are waiting, and on
+    close): the columns are compressed in a worker thread and the chunk is
+    written in one transaction. If writes keep failing, at most
+    `max_pending` rows are kept and the oldest are dropped.
+    """
+
+    def __init__(self, db_path: str, flush_seconds: float = 5.0, flush_batch: int = 2000,
+                 max_pending: int = 100_000):
+        self.db_path = db_path
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+        self.max_pending = max_pending
+        self.db: Optional[aiosqlite.Connection] = None
+        self._pending: List[Tuple[Any, ...]] = []
+        self._flush_now = asyncio.Event()
+        self._closing = False
+        self._flushing = asyncio.Lock()  # /results/export flushes while the background task may be writing
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "flushes": 0, "rows_written": 0, "bytes_written": 0, "dropped": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultStore"]:
+        """None when RESULTS_STORE_ENABLED=false"""
+        if os.getenv("RESULTS_STORE_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            os.getenv("RESULTS_STORE_PATH", "silentsort-results.db"),
+            flush_seconds=float(os.getenv("RESULTS_STORE_FLUSH_SECONDS", "5")),
+            flush_batch=int(os.getenv("RESULTS_STORE_FLUSH_BATCH", "2000")),
+        )
+
+    async def open(self) -> None:
+        self.db = await aiosqlite.connect(self.db_path)
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.executescript(SCHEMA)
+        await self.db.commit()
+        self._closing = False
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            # Never cancel the flusher: a flush cut short would lose its rows and leave the transaction open
+            self._closing = True
+            self._flush_now.set()
+            await self._flusher
+            self._flusher = None
+        if self.db is not None:
+            await self.flush()
+            await self.db.close()
+            self.db = None
+
+    # ========================================================================
+    # WRITES (buffer now, one chunk per flush)
+    # ========================================================================
+
+    def record(self, row: Dict[str, Any]) -> None:
+        """Buffer one result, stamped with the current time; missing columns are stored as null"""
+        self._pending.append((time.time(), *(row.get(name) for name in _RECORDED_FIELDS)))
+        self.stats["recorded"] += 1
+        if len(self._pending) >= self.flush_batch:
+            self._flush_now.set()
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Writing analysis results failed: {e}")
+
+    async def flush(self) -> int:
+        """Write the buffered rows as one chunk; returns the number of rows written"""
+        async with self._flushing:
+            return await self._flush()
+
+    async def _flush(self) -> int:
+        if self.db is None or not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        try:
+            columns = await asyncio.to_thread(encode_chunk, rows)
+            recorded_at = [row[0] for row in rows]
+            cursor = await self.db.execute(
+                "INSERT INTO result_chunks (rows, first_at, last_at) VALUES (?, ?, ?)",
+                (len(rows), min(recorded_at), max(recorded_at)),
+            )
+            await self.db.executemany(
+                "INSERT INTO result_columns (chunk_id, name, data) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, name, data) for name, data in columns],
+            )
+            await self.db.commit()
+        except Exception:
+            # Drop a half-written chunk (its row without columns would break reads) and keep
+            # the rows for the next flush, within max_pending
+            await self.db.rollback()
+            self._pending = rows + self._pending
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+                self.stats["dropped"] += overflow
+            raise
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(rows)
+        self.stats["bytes_written"] += sum(len(data) for _, data in columns)
+        return len(rows)
+
+    # ========================================================================
+    # READS
+    # ========================================================================
+
+    async def chunks(self, columns: Sequence[str], since: Optional[float] = None,
+                     until: Optional[float] = None) -> AsyncIterator[Dict[str, List[Any]]]:
+        """Column name -> values for each chunk overlapping [since, until], oldest first.
+
+        Rows outside the range are filtered out (recorded_at is read for that
+        even when not requested). Rows still buffered are not included.
+        """
+        wanted = list(dict.fromkeys([*columns, "recorded_at"]))
+        async with self.db.execute(
+            "SELECT chunk_id FROM result_chunks WHERE last_at >= ? AND first_at <= ? ORDER BY chunk_id",
+            (since if since is not None else float("-inf"), until if until is not None else float("inf")),
+        ) as cursor:
+            chunk_ids = [chunk_id async for chunk_id, in cursor]
+
+        placeholders = ",".join("?" * len(wanted))
+        for chunk_id in chunk_ids:
+            async with self.db.execute(
+                f"SELECT name, data FROM result_columns WHERE chunk_id = ? AND name IN ({placeholders})",
+                (chunk_id, *wanted),
+            ) as cursor:
+                blobs = {name: data async for name, data in cursor}
+            values = await asyncio.to_thread(lambda: {name: decode_column(blobs[name]) for name in blobs})
+            times = values["recorded_at"]
+            keep = [i for i, at in enumerate(times)
+                    if (since is None or at >= since) and (until is None or at <= until)]
+            if len(keep) != len(times):
+                values = {name: [column[i] for i in keep] for name, column in values.items()}
+            if keep:
+                yield {name: values.get(name, [None] * len(keep)) for name in columns}
+
+    async def export(self, format: str, columns: Sequence[str], since: Optional[float] = None,
+                     until: Optional[float] = None) -> AsyncIterator[bytes]:
+        """Stored results as NDJSON, CSV (with a header row) or Parquet (one row group per chunk).
+
+        `format` and `columns` are expected to have passed export_columns().
+        """
+        if format == "parquet":
+            sink = _DrainingSink()
+            writer = pq.ParquetWriter(sink, _arrow_schema(columns))
+            async for chunk in self.chunks(columns, since, until):
+                writer.write_table(pa.Table.from_pydict(chunk, schema=writer.schema))
+                yield sink.drain()
+            writer.close()
+            yield sink.drain()
+            return
+
+        if format == "csv":
+            buffer = io.StringIO()
+            out = csv.writer(buffer)
+            out.writerow(columns)
+            async for chunk in self.chunks(columns, since, until):
+                out.writerows(zip(*(chunk[name] for name in columns)))
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+            return
+
+        async for chunk in self.chunks(columns, since, until):
+            yield "".join(json.dumps(dict(zip(columns, row))) + "\n"
+                          for row in zip(*(chunk[name] for name in columns))).encode()
+
+    async def summary(self) -> Dict[str, Any]:
+        async with self.db.execute("SELECT COUNT(*), COALESCE(SUM(rows), 0), MIN(first_at), MAX(last_at) "
+                                   "FROM result_chunks") as cursor:
+            chunks, rows, first_at, last_at = await cursor.fetchone()
+        return {"chunks": chunks, "rows": rows, "first_at": first_at, "last_at": last_at,
+                "pending": len(self._pending), **self.stats}
+
+
+def _arrow_schema(columns: Sequence[str]) -> "pa.Schema":
+    types = {"float": pa.float64(), "int": pa.int64(), "str": pa.string()}
+    return pa.schema([(name, types[COLUMNS[name]]) for name in columns])
+
+
+class _DrainingSink(io.RawIOBase):
+    """Write-only file whose contents are handed out as they are written.
+
+    The Parquet writer records offsets from tell(), so the position keeps
+    counting while drained bytes are released.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
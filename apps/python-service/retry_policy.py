@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+SilentSort Retry Policy
+Per-request retry limit, exponential backoff with jitter, and a retry budget
+shared by all requests so an LLM outage does not multiply the load on it
+"""
+
+import os
+import random
+from typing import Dict, Optional
+
+
+class RetryPolicy:
+    """Decides whether a failed workflow stage may run again, and after how long.
+
+    Each request may retry up to `max_retries` times. Delays grow as
+    base * 2^attempt (capped at `max_delay_ms`), jittered within the upper half. The shared
+    budget is a token bucket: every request adds `budget_ratio` tokens (up to
+    `budget_burst`) and every retry spends one. During a sustained outage,
+    retries therefore stay at about `budget_ratio` of requests instead of
+    `max_retries` times them.
+    """
+
+    def __init__(self, max_retries: int = 2, base_delay_ms: float = 200, max_delay_ms: float = 2000,
+                 budget_ratio: float = 0.2, budget_burst: float = 10):
+        self.max_retries = max_retries
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.tokens = budget_burst
+        self.stats = {"retries": 0, "limit_reached": 0, "budget_exhausted": 0}
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv("WORKFLOW_MAX_RETRIES", "2")),
+            base_delay_ms=float(os.getenv("WORKFLOW_RETRY_BASE_MS", "200")),
+            max_delay_ms=float(os.getenv("WORKFLOW_RETRY_MAX_MS", "2000")),
+            budget_ratio=float(os.getenv("WORKFLOW_RETRY_BUDGET_RATIO", "0.2")),
+        )
+
+    def record_request(self) -> None:
+        self.tokens = min(self.budget_burst, self.tokens + self.budget_ratio)
+
+    def acquire(self, retry_count: int) -> Optional[float]:
+        """Backoff in seconds before retry number `retry_count + 1`, or None to give up"""
+        if retry_count >= self.max_retries:
+            self.stats["limit_reached"] += 1
+            return None
+        if self.tokens < 1:
+            self.stats["budget_exhausted"] += 1
+            return None
+        self.tokens -= 1
+        self.stats["retries"] += 1
+        ceiling = min(self.max_delay_ms, self.base_delay_ms * 2 ** retry_count)
+        return random.uniform(ceiling / 2, ceiling) / 1000
+
+    def metrics(self) -> Dict[str, float]:
+        return {**self.stats, "budget_tokens": round(self.tokens, 2)}
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+SilentSort Service Logging
+Queued, structured JSON logging shared by the SilentSort services
+"""
+
+import os
+import sys
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# Extra keys used for routing/sampling that should not end up in the JSON record
+_INTERNAL_EXTRA_KEYS = {"sample_every", "sampled", "json"}
+
+_sample_lock = threading.Lock()
+_sample_counters: Dict[str, int] = {}
+
+
+def _sample_patcher(record: Dict[str, Any]) -> None:
+    """Decide once per record whether it is kept: every N-th occurrence of a call site bound with `sample_every`"""
+    every = record["extra"].get("sample_every") or 1
+    if every <= 1:
+        return
+
+    key = f"{record['name']}:{record['function']}:{record['line']}"
+    with _sample_lock:
+        seen = _sample_counters.get(key, 0)
+        _sample_counters[key] = seen + 1
+    record["extra"]["sampled"] = seen % every == 0
+
+
+def _sample_filter(record: Dict[str, Any]) -> bool:
+    """Sinks share the patcher's decision, so every sink keeps the same records"""
+    return record["extra"].get("sampled", True)
+
+
+def _json_format(record: Dict[str, Any]) -> str:
+    """Render a record as one compact JSON line keyed by workflow_id"""
+    payload = {
+        "ts": record["time"].isoformat(),
+        "level": record["level"].name,
+        "event": record["message"],
+    }
+    for key, value in record["extra"].items():
+        if key not in _INTERNAL_EXTRA_KEYS:
+            payload[key] = value
+    if record["exception"] is not None:
+        payload["exception"] = repr(record["exception"].value)
+
+    record["extra"]["json"] = json.dumps(payload, default=str)
+    return "{extra[json]}\n"
+
+
+def configure_logging(service: str) -> None:
+    """Replace the default loguru handlers with queued, level-gated sinks.
+
+    Sinks are written from loguru's background thread (enqueue=True), so a
+    request only pays for filtering and formatting its own records.
+
+    Environment:
+        LOG_LEVEL        minimum level for every sink (default: info)
+        LOG_FILE         JSON lines log file (default: silentsort.log)
+        LOG_CONSOLE      also log human-readable lines to stderr (default: true)
+        LOG_ENABLED      set to false to drop all log output (default: true)
+    """
+    level = os.getenv("LOG_LEVEL", "info").upper()
+
+    logger.remove()
+    logger.configure(extra={"service": service, "workflow_id": None}, patcher=_sample_patcher)
+
+    if os.getenv("LOG_ENABLED", "true").lower() == "false":
+        return
+
+    logger.add(
+        os.getenv("LOG_FILE", "silentsort.log"),
+        level=level,
+        format=_json_format,
+        filter=_sample_filter,
+        rotation="10 MB",
+        enqueue=True,
+    )
+
+    if os.getenv("LOG_CONSOLE", "true").lower() != "false":
+        logger.add(
+            sys.stderr,
+            level=level,
+            format="{time:HH:mm:ss} | {level: <7} | {extra[workflow_id]} | {message}",
+            filter=_sample_filter,
+            enqueue=True,
+        )
+
+
+def sampled(every: Optional[int] = None):
+    """Logger for high-volume lines: only every N-th call per call site is written"""
+    if every is None:
+        every = int(os.getenv("LOG_SAMPLE_EVERY", "10"))
+    return logger.bind(sample_every=max(1, every))
@@ -7,8 +7,9 @@ Basic OpenAI-powered file analysis (without LangGraph for now)
 import os
 import json
 import time
+import asyncio
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +17,10 @@ from pydantic import BaseModel, Field
 import uvicorn
 import openai
 
+from name_allocator import NameAllocator, allocate_suggested_name
+from usage_tracker import UsageTracker
+from rules_engine import analyze_with_rules
+
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
@@ -52,6 +57,7 @@ class FileAnalysisResponse(BaseModel):
     alternatives: List[str] = Field(default=[], description="Alternative names")
     content_summary: Optional[str] = Field(None, description="Content summary")
     processing_time_ms: int = Field(..., description="Processing time in milliseconds")
+    usage: Optional[Dict[str, Any]] = Field(None, description="LLM calls, tokens and cost of this analysis")
 
 class HealthResponse(BaseModel):
     status: str
@@ -64,6 +70,23 @@ openai_client = None
 if os.getenv("OPENAI_API_KEY"):
     openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Names handed out per directory, so suggestions never collide
+name_allocator = NameAllocator.from_env()
+
+# Tokens and cost of every OpenAI response, with the daily budget cap
+usage_tracker = UsageTracker.from_env(default_model="gpt-3.5-turbo")
+
+def analyze_file_with_rules(request: FileAnalysisRequest) -> FileAnalysisResponse:
+    """LLM-free analysis, used once the daily LLM budget is spent"""
+    result = analyze_with_rules(request.original_name, request.content_preview or "", request.file_extension)
+    return FileAnalysisResponse(
+        suggested_name=result["suggested_name"],
+        confidence=0.6,
+        category=result["category"],
+        reasoning=f"Rules engine ({result['category']}/{result['subcategory']}): daily LLM budget reached",
+        processing_time_ms=0  # Will be set by endpoint
+    )
+
 async def analyze_file_with_openai(request: FileAnalysisRequest) -> FileAnalysisResponse:
     """Analyze file using OpenAI directly"""
     
@@ -106,6 +129,7 @@ Respond ONLY with valid JSON in this exact format:
             max_tokens=int(os.getenv("OPENAI_MAX_TOKENS", "500")),
             temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.3")),
         )
+        usage_tracker.record("naming", response)
         
         content = response.choices[0].message.content
         if not content:
@@ -155,7 +179,15 @@ async def analyze_file(request: FileAnalysisRequest):
     start_time = time.time()
     
     try:
-        result = await analyze_file_with_openai(request)
+        # Over the daily LLM budget the rules engine answers on its own
+        over_budget = usage_tracker.over_budget()
+        with usage_tracker.request("rules" if over_budget else "simple") as usage:
+            result = analyze_file_with_rules(request) if over_budget else await analyze_file_with_openai(request)
+        result.usage = usage.as_dict()
+        # Off the event loop: the first name in a directory lists it
+        result.suggested_name = await asyncio.to_thread(
+            allocate_suggested_name, name_allocator, request.file_path, result.suggested_name
+        )
         
         # Calculate processing time
         processing_time = int((time.time() - start_time) * 1000)
@@ -168,6 +200,11 @@ async def analyze_file(request: FileAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.get("/metrics")
+async def metrics():
+    """Token usage and cost"""
+    return {"usage": usage_tracker.metrics()}
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -178,6 +215,7 @@ async def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze-file",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
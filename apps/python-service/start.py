@@ -5,9 +5,35 @@ SilentSort Python Service Startup Script
 
 import os
 import sys
+import time
+import hashlib
+import argparse
 import subprocess
+import urllib.request
 from pathlib import Path
 
+# Hash of the installed requirements, stored inside the venv so a fresh venv always installs
+INSTALL_STAMP = ".requirements.sha256"
+
+class PhaseTimer:
+    """Wall-clock duration of each startup phase"""
+
+    def __init__(self):
+        self.phases = {}
+        self.started = time.perf_counter()
+        self._mark = self.started
+
+    def lap(self, phase: str, note: str = ""):
+        now = time.perf_counter()
+        self.phases[phase] = ((now - self._mark) * 1000, note)
+        self._mark = now
+
+    def report(self):
+        print("⏱️  Startup phases:")
+        for phase, (ms, note) in self.phases.items():
+            print(f"   {phase:<10} {ms:8.0f}ms {note}")
+        print(f"   {'total':<10} {(time.perf_counter() - self.started) * 1000:8.0f}ms")
+
 def check_python_version():
     """Check if Python version is compatible"""
     if sys.version_info < (3, 8):
@@ -15,16 +41,25 @@ def check_python_version():
         sys.exit(1)
     print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
 
-def setup_environment():
-    """Setup environment and install dependencies"""
+def requirements_hash() -> str:
+    """Identity of what pip would install: requirements.txt plus the interpreter version"""
+    digest = hashlib.sha256(Path("requirements.txt").read_bytes())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()
+
+def setup_environment(force_install: bool = False):
+    """Setup environment and install dependencies when requirements.txt changed.
+
+    Returns (python_path, whether pip ran).
+    """
     print("🔧 Setting up Python environment...")
-    
+
     # Check if virtual environment exists
     venv_path = Path("venv")
     if not venv_path.exists():
         print("📦 Creating virtual environment...")
         subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
-    
+
     # Determine activation script path
     if os.name == 'nt':  # Windows
         pip_path = venv_path / "Scripts" / "pip"
@@ -32,12 +67,19 @@ def setup_environment():
     else:  # Unix/macOS
         pip_path = venv_path / "bin" / "pip"
         python_path = venv_path / "bin" / "python"
-    
-    # Install dependencies
+
+    # Install dependencies only when they changed since the last successful install
+    stamp = venv_path / INSTALL_STAMP
+    wanted = requirements_hash()
+    if not force_install and stamp.exists() and stamp.read_text().strip() == wanted:
+        print("✅ Dependencies unchanged, skipping install")
+        return str(python_path), False
+
     print("📦 Installing dependencies...")
     subprocess.run([str(pip_path), "install", "-r", "requirements.txt"], check=True)
-    
-    return str(python_path)
+    stamp.write_text(wanted)
+
+    return str(python_path), True
 
 def check_env_file():
     """Check if environment file exists"""
@@ -45,44 +87,102 @@ def check_env_file():
     for env_file in env_files:
         if Path(env_file).exists():
             print(f"✅ Environment file found: {env_file}")
-            return True
-    
+            return env_file
+
     print("⚠️  No environment file found. Please create .env from config.env.template")
     print("   Copy your OpenAI API key to the .env file")
+    return None
+
+def env_setting(name: str, default: str, env_file=None) -> str:
+    """Setting from the process environment, else from the env file, else the default"""
+    if name in os.environ:
+        return os.environ[name]
+    if env_file:
+        for line in Path(env_file).read_text().splitlines():
+            key, _, value = line.partition("=")
+            if key.strip() == name:
+                return value.split("#")[0].strip().strip('"\'')
+    return default
+
+def wait_for(url: str, process: subprocess.Popen, timeout: float = 120.0) -> bool:
+    """Poll `url` until it answers 200; False if the service exits or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.05)
     return False
 
-def start_service(python_path: str):
-    """Start the FastAPI service"""
+def start_service(python_path: str, production: bool, timer: PhaseTimer, env_file=None):
+    """Start the FastAPI service and report when it is live and ready"""
+    host = env_setting("HOST", "127.0.0.1", env_file)
+    port = env_setting("PORT", "8000", env_file)
+    base_url = f"http://{host}:{port}"
+
+    env = dict(os.environ)
+    if production:
+        env["RELOAD"] = "false"
+
     print("🚀 Starting SilentSort LangGraph Service...")
-    print("   Service will be available at: http://127.0.0.1:8000")
-    print("   API documentation: http://127.0.0.1:8000/docs")
+    print(f"   Mode: {'production (no reloader)' if production else 'development (auto-reload)'}")
+    print(f"   Service will be available at: {base_url}")
+    print(f"   API documentation: {base_url}/docs")
     print("   Press Ctrl+C to stop")
-    
+
+    process = subprocess.Popen([python_path, "main.py"], env=env)
     try:
-        subprocess.run([python_path, "main.py"], check=True)
+        # /health answers once imports and app construction are done, /ready after warm-up
+        if wait_for(f"{base_url}/health", process):
+            timer.lap("import")
+            if wait_for(f"{base_url}/ready", process):
+                timer.lap("ready")
+                print("✅ Service ready")
+        timer.report()
+        process.wait()
+        if process.returncode:
+            print(f"❌ Service exited with code {process.returncode}")
+            sys.exit(process.returncode)
     except KeyboardInterrupt:
+        process.terminate()
+        process.wait()
         print("\n👋 Service stopped")
 
 def main():
+    parser = argparse.ArgumentParser(description="Start the SilentSort Python service")
+    parser.add_argument("--production", action="store_true",
+                        help="run without the auto-reloader")
+    parser.add_argument("--reinstall", action="store_true",
+                        help="run pip install even if requirements.txt is unchanged")
+    args = parser.parse_args()
+
     print("🔥 SilentSort Python LangGraph Service")
     print("=====================================")
-    
-    # Check Python version
+    timer = PhaseTimer()
+
+    # Check Python version and environment configuration
     check_python_version()
-    
-    # Setup environment
-    python_path = setup_environment()
-    
-    # Check environment configuration
-    if not check_env_file():
+    env_file = check_env_file()
+    timer.lap("env check")
+    if not env_file:
         print("\n📝 Quick setup:")
         print("   1. Copy config.env.template to .env")
         print("   2. Add your OpenAI API key")
         print("   3. Run this script again")
         return
-    
+
+    # Setup environment
+    python_path, installed = setup_environment(force_install=args.reinstall)
+    timer.lap("install", "" if installed else "(skipped, requirements unchanged)")
+
     # Start the service
-    start_service(python_path)
+    production = args.production or os.getenv("SILENTSORT_PRODUCTION", "false").lower() == "true"
+    start_service(python_path, production, timer, env_file)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
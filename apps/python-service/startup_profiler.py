@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+SilentSort Startup Profiler
+Cold-start report for any of the service apps: module import times (-X importtime),
+app construction, SilentSortWorkflow.__init__, time to ready and first-request latency
+
+Usage: python startup_profiler.py main.py [--report startup-report.json] [--budget-ms 8000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, List
+
+SERVICE_DIR = Path(__file__).resolve().parent
+
+# Written to stderr around the app import so only its imports are attributed to it
+IMPORT_START = "startup-profiler: import start"
+IMPORT_END = "startup-profiler: import end"
+
+SAMPLE_REQUEST = {
+    "file_path": "/profile/quarterly-report.txt",
+    "original_name": "quarterly-report.txt",
+    "file_size": 2048,
+    "file_extension": ".txt",
+    "content_preview": "Quarterly report for Contoso Ltd. Revenue grew 12% year over year.",
+}
+
+
+def _ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+# ============================================================================
+# CHILD: runs in a fresh interpreter under -X importtime
+# ============================================================================
+
+def profile_app(app_file: str, request_path: str, requests: int) -> Dict[str, Any]:
+    """Import the app, start it, wait for readiness and time the first requests"""
+    sys.path.insert(0, str(SERVICE_DIR))
+    profile: Dict[str, Any] = {"app": app_file}
+
+    print(IMPORT_START, file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(Path(app_file).stem.replace("-", "_"), SERVICE_DIR / app_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    profile["module_exec_ms"] = _ms(started)
+    print(IMPORT_END, file=sys.stderr, flush=True)
+    profile.update(getattr(module, "startup_timings", {}))
+
+    from fastapi.testclient import TestClient
+
+    started = time.perf_counter()
+    with TestClient(module.app) as client:
+        profile["startup_hooks_ms"] = _ms(started)
+
+        ready_started = time.perf_counter()
+        if any(getattr(route, "path", None) == "/ready" for route in module.app.routes):
+            deadline = time.monotonic() + 60
+            while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+                time.sleep(0.005)
+        profile["ready_ms"] = _ms(ready_started)
+
+        latencies: List[float] = []
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            if request_path == "/health":
+                response = client.get(request_path)
+            else:
+                response = client.post(request_path, json=SAMPLE_REQUEST)
+            latencies.append(_ms(request_started))
+            profile.setdefault("first_request_status", response.status_code)
+        profile["first_request_ms"] = latencies[0]
+        if len(latencies) > 1:
+            profile["steady_request_ms"] = round(statistics.median(latencies[1:]), 2)
+
+    profile["cold_start_ms"] = round(
+        profile["module_exec_ms"] + profile["startup_hooks_ms"] + profile["ready_ms"] + profile["first_request_ms"], 2
+    )
+    return profile
+
+
+# ============================================================================
+# PARENT: spawn the child and build the report
+# ============================================================================
+
+def parse_importtime(stderr: str, top: int = 15) -> Dict[str, Any]:
+    """Import times of modules loaded while the app module executed"""
+    lines = stderr.splitlines()
+    try:
+        lines = lines[lines.index(IMPORT_START) + 1:lines.index(IMPORT_END)]
+    except ValueError:
+        return {"total_ms": 0.0, "modules": 0, "top_cumulative": [], "top_self": []}
+
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            # Nested imports are indented; one leading space marks a direct import
+            "top_level": not name.startswith("  "),
+        })
+
+    top_level = [e for e in entries if e["top_level"]]
+    by_cumulative = sorted(top_level, key=lambda e: e["cumulative_ms"], reverse=True)[:top]
+    by_self = sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(e["cumulative_ms"] for e in top_level), 2),
+        "modules": len(entries),
+        "top_cumulative": [{k: e[k] for k in ("module", "cumulative_ms")} for e in by_cumulative],
+        "top_self": [{k: e[k] for k in ("module", "self_ms")} for e in by_self],
+    }
+
+
+def run_profile(app_file: str, request_path: str = "/analyze-file", requests: int = 5,
+                env: Dict[str, str] = None) -> Dict[str, Any]:
+    """Profile one app in a fresh interpreter and return the report"""
+    child_env = dict(os.environ)
+    child_env.setdefault("SILENTSORT_MOCK_LLM", "true")
+    child_env.setdefault("MOCK_LLM_LATENCY_MS", "0")
+    child_env.setdefault("LOG_ENABLED", "false")
+    child_env.update(env or {})
+
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", __file__, "--child", app_file,
+         "--request-path", request_path, "--requests", str(requests)],
+        cwd=SERVICE_DIR, env=child_env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Profiling {app_file} failed:\n{completed.stderr[-2000:]}")
+
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    report["process_ms"] = _ms(started)
+    report["imports"] = parse_importtime(completed.stderr)
+    report["app_construction_ms"] = round(max(0.0, report["module_exec_ms"] - report["imports"]["total_ms"]), 2)
+    report["python"] = sys.version.split()[0]
+    report["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"🩺 Startup profile: {report['app']} (python {report['python']})")
+    rows = [
+        ("imports", report["imports"]["total_ms"]),
+        ("app construction", report["app_construction_ms"]),
+        ("  workflow __init__", report.get("workflow_init_ms")),
+        ("startup hooks", report["startup_hooks_ms"]),
+        ("ready", report["ready_ms"]),
+        ("first request", report["first_request_ms"]),
+        ("steady request", report.get("steady_request_ms")),
+        ("cold start", report["cold_start_ms"]),
+        ("process wall", report["process_ms"]),
+    ]
+    for label, value in rows:
+        if value is not None:
+            print(f"   {label:<20} {value:10.1f}ms")
+    print(f"   slowest imports ({report['imports']['modules']} modules loaded):")
+    for entry in report["imports"]["top_cumulative"][:10]:
+        print(f"     {entry['cumulative_ms']:8.1f}ms  {entry['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("app", help="app file, e.g. main.py or langgraph-main-v2.py")
+    parser.add_argument("--report", help="write the JSON report here")
+    parser.add_argument("--budget-ms", type=float, help="exit non-zero if cold start exceeds this")
+    parser.add_argument("--request-path", default="/analyze-file")
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(profile_app(args.app, args.request_path, args.requests)))
+        return
+
+    report = run_profile(args.app, args.request_path, args.requests)
+    print_report(report)
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+        print(f"📝 Report written to {args.report}")
+    if args.budget_ms is not None and report["cold_start_ms"] > args.budget_ms:
+        print(f"❌ Cold start {report['cold_start_ms']:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
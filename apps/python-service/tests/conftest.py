@@ -0,0 +1,58 @@
+"""
+Shared inputs for the rules engine micro-benchmarks: documents of three
+sizes from the benchmark corpus, and folder indexes of three sizes
+"""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus_generator import CATEGORIES, generate_corpus
+from folder_index import FolderIndex
+from rules_engine import determine_category, extract_entities
+
+# Size -> minimum characters of content: one short document, a long preview, a whole extracted PDF
+DOCUMENT_SIZES = {"small": 0, "medium": 5_000, "large": 1_000_000}
+
+# Size -> folders under the base directory
+FOLDER_INDEX_SIZES = {"small": 10, "medium": 500, "large": 5_000}
+
+
+def _document(min_chars: int, corpus) -> SimpleNamespace:
+    """A proposal (it carries every entity type), followed by other documents until `min_chars`"""
+    parts = [next(document["content"] for document in corpus if document["category"] == "project-proposal")]
+    length = len(parts[0])
+    index = 0
+    while length < min_chars:
+        parts.append(corpus[index % len(corpus)]["content"])
+        length += len(parts[-1]) + 1
+        index += 1
+    content = "\n".join(parts)
+    entities = extract_entities(content)
+    category, subcategory = determine_category(content, entities)
+    return SimpleNamespace(content=content, entities=entities, category=category, subcategory=subcategory)
+
+
+@pytest.fixture(scope="session")
+def documents():
+    corpus = generate_corpus(200, seed=7)
+    return {size: _document(min_chars, corpus) for size, min_chars in DOCUMENT_SIZES.items()}
+
+
+@pytest.fixture(scope="session")
+def folder_indexes(tmp_path_factory):
+    """FolderIndex per size over a tree with the category folders the services suggest"""
+    indexes = {}
+    for size, count in FOLDER_INDEX_SIZES.items():
+        base = tmp_path_factory.mktemp(f"folders-{size}")
+        for folder in ("Finance/Invoices", "Legal/Contracts", "Work/Reports", "Work/Meetings"):
+            os.makedirs(base / folder)
+        for index in range(count):
+            os.makedirs(base / "Archive" / CATEGORIES[index % len(CATEGORIES)] / f"folder-{index}")
+        indexes[size] = FolderIndex(str(base)).build()
+    return indexes
@@ -0,0 +1,74 @@
+"""
+Grouping index: warm starts from the last centroids, and compaction in the
+background while files keep arriving
+"""
+
+import asyncio
+from collections import Counter
+
+import file_grouping
+from corpus_generator import generate_corpus
+from file_grouping import FileGrouper, tokenize
+
+
+def _index(grouper, documents, directory="/docs"):
+    for document in documents:
+        grouper.add(f"{directory}/{document['id']}/{document['original_name']}",
+                    document["original_name"], document["content"])
+
+
+def _row_words(grouper, path):
+    indices, counts = grouper._row_terms(grouper._row_of[path])
+    return Counter({grouper.terms[term]: int(count) for term, count in zip(indices, counts)})
+
+
+def test_regrouping_a_directory_starts_from_the_last_centroids(monkeypatch):
+    calls = []
+    cluster_rows = file_grouping.cluster_rows
+
+    def recording(*args):
+        calls.append(args[5])  # previous_centers
+        return cluster_rows(*args)
+
+    monkeypatch.setattr(file_grouping, "cluster_rows", recording)
+    documents = generate_corpus(200, 7)
+    grouper = FileGrouper()
+
+    async def run():
+        _index(grouper, documents[:190])
+        first = await grouper.group(directory="/docs")
+        _index(grouper, documents[190:])
+        second = await grouper.group(directory="/docs")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert calls[0] is None
+    assert calls[1] is not None
+    assert second["clusters"] == first["clusters"]
+    assert second["files"] == 200
+
+
+def test_compaction_carries_over_files_added_meanwhile():
+    grouper = FileGrouper()
+
+    async def run():
+        for i in range(40):
+            grouper.add(f"/docs/{i}.txt", f"report-{i}.txt", f"quarterly budget report alpha{i}")
+        # Replacing 15 of 40 files leaves more than a quarter of the rows dead
+        for i in range(15):
+            grouper.add(f"/docs/{i}.txt", f"invoice-{i}.txt", f"contoso invoice payment beta{i}")
+        compaction = grouper._compacting
+        assert compaction is not None
+        await asyncio.sleep(0)  # The compaction is now in its worker thread
+        grouper.add("/docs/new.txt", "new.txt", "alpha3 gamma")  # A term of a dead row only, and a new one
+        grouper.remove("/docs/20.txt")
+        await compaction
+
+    asyncio.run(run())
+    assert grouper.stats["compactions"] == 1
+    assert grouper.documents == 40
+    assert "/docs/20.txt" not in grouper._row_of
+    assert _row_words(grouper, "/docs/new.txt") == Counter(tokenize("new.txt", "alpha3 gamma"))
+    assert _row_words(grouper, "/docs/3.txt") == Counter(tokenize("invoice-3.txt", "contoso invoice payment beta3"))
+    assert _row_words(grouper, "/docs/30.txt") == Counter(tokenize("report-30.txt", "quarterly budget report alpha30"))
+    assert len(grouper.vocabulary) == len(grouper.terms)
@@ -0,0 +1,62 @@
+"""
+Micro-benchmarks for the rules engine (the offline fallback hot path).
+
+Later runs are compared against the baseline committed in tests/.benchmarks;
+a benchmark whose fastest round is more than 20% slower than in the baseline
+fails the run:
+
+    pytest --benchmark-compare=0001 --benchmark-compare-fail=min:20%
+    pytest --benchmark-save=baseline    # after an intended change
+"""
+
+import pytest
+
+from rules_engine import (
+    determine_category,
+    extract_entities,
+    generate_folder_suggestions,
+    generate_smart_filename,
+    generate_technical_tags,
+)
+
+SIZES = ["small", "medium", "large"]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_extract_entities(benchmark, documents, size):
+    document = documents[size]
+    entities = benchmark(extract_entities, document.content)
+    assert entities == document.entities
+    assert entities["budget"].startswith("$")
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_generate_technical_tags(benchmark, documents, size):
+    document = documents[size]
+    tags = benchmark(generate_technical_tags, document.content, document.entities)
+    assert "document-type-proposal" in tags
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_determine_category(benchmark, documents, size):
+    document = documents[size]
+    category, _ = benchmark(determine_category, document.content, document.entities)
+    assert category == document.category
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_generate_smart_filename(benchmark, documents, size):
+    document = documents[size]
+    name = benchmark(generate_smart_filename, document.content, document.entities, document.category, ".pdf")
+    assert name.endswith(".pdf")
+    assert len(name) <= 64
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_generate_folder_suggestions(benchmark, documents, folder_indexes, size):
+    index = folder_indexes[size]
+    entities = {"company": "Acme Corp", "deadline": "March 2025"}
+    suggestions = benchmark(generate_folder_suggestions, "invoice.pdf", "invoice", entities, index.base, index)
+    assert suggestions[0]["path"] == f"{index.base}/Finance/Invoices"
+    assert suggestions[0]["exists"]
+    assert len(suggestions) == 3
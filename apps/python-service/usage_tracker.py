@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+SilentSort Token Usage
+Token and cost accounting for every LLM response, per request, per workflow
+node, per engine and per day, with an optional daily budget cap
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from loguru import logger
+
+# USD per million (input, output) tokens
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+# Usage of the request the current task is serving; None outside a request
+# (the startup warm-up), so those calls are not counted
+_current_request: ContextVar[Optional["RequestUsage"]] = ContextVar("current_request_usage", default=None)
+
+
+def token_counts(response: Any) -> Tuple[int, int]:
+    """(input, output) tokens of a LangChain message or an OpenAI chat completion"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = getattr(response, "usage", None)
+    if usage:
+        return usage.prompt_tokens or 0, usage.completion_tokens or 0
+    return 0, 0
+
+
+def _totals() -> Dict[str, Any]:
+    return {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+
+
+def _add(totals: Dict[str, Any], input_tokens: int, output_tokens: int, cost: float) -> None:
+    totals["calls"] += 1
+    totals["input_tokens"] += input_tokens
+    totals["output_tokens"] += output_tokens
+    totals["cost_usd"] += cost
+
+
+def _rounded(totals: Dict[str, Any]) -> Dict[str, Any]:
+    return {**totals, "cost_usd": round(totals["cost_usd"], 6)}
+
+
+class RequestUsage:
+    """LLM calls, tokens and cost of one analysis, by node"""
+
+    __slots__ = ("engine", "totals", "nodes")
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.totals = _totals()
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, node: str, input_tokens: int, output_tokens: int, cost: float) -> None:
+        _add(self.totals, input_tokens, output_tokens, cost)
+        _add(self.nodes.setdefault(node, _totals()), input_tokens, output_tokens, cost)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "engine": self.engine,
+            **_rounded(self.totals),
+            "nodes": {node: _rounded(totals) for node, totals in self.nodes.items()},
+        }
+
+
+class UsageTracker:
+    """Aggregates token usage and cost across requests.
+
+    Analyses run inside `request(engine)`; each LLM response is passed to
+    `record(node, response)` and counted against that request, its engine,
+    the node that made the call and the current (UTC) day. Calls made
+    outside a request are ignored. With a `daily_budget_usd`,
+    `over_budget()` turns true once today's spend reaches it, and the
+    services answer with the rules engine until the day rolls over.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini", input_price: Optional[float] = None,
+                 output_price: Optional[float] = None, daily_budget_usd: float = 0.0, history_days: int = 30):
+        default_input, default_output = MODEL_PRICES.get(model, MODEL_PRICES["gpt-4o-mini"])
+        self.model = model
+        self.input_price = default_input if input_price is None else input_price
+        self.output_price = default_output if output_price is None else output_price
+        self.daily_budget_usd = daily_budget_usd
+        self.history_days = history_days
+        self.engines: Dict[str, Dict[str, Any]] = {}
+        self.days: Dict[str, Dict[str, Any]] = {}
+        self.budget_fallbacks = 0
+
+    @classmethod
+    def from_env(cls, default_model: str = "gpt-4o-mini") -> "UsageTracker":
+        """`default_model`: what the service calls when OPENAI_MODEL is not set"""
+        input_price = os.getenv("LLM_PRICE_INPUT_PER_MTOK")
+        output_price = os.getenv("LLM_PRICE_OUTPUT_PER_MTOK")
+        return cls(
+            model=os.getenv("OPENAI_MODEL", default_model),
+            input_price=float(input_price) if input_price else None,
+            output_price=float(output_price) if output_price else None,
+            daily_budget_usd=float(os.getenv("LLM_DAILY_BUDGET_USD", "0")),
+        )
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_price + output_tokens * self.output_price) / 1_000_000
+
+    def _engine(self, engine: str) -> Dict[str, Any]:
+        if engine not in self.engines:
+            self.engines[engine] = {"requests": 0, **_totals(), "nodes": {}}
+        return self.engines[engine]
+
+    def _today(self) -> Dict[str, Any]:
+        day = datetime.now(timezone.utc).date().isoformat()
+        if day not in self.days:
+            self.days[day] = {"requests": 0, **_totals(), "budget_fallbacks": 0}
+            for old in sorted(self.days)[:-self.history_days]:
+                del self.days[old]
+        return self.days[day]
+
+    @contextmanager
+    def request(self, engine: str) -> Iterator[RequestUsage]:
+        """Count the LLM calls made by the current task (and tasks it starts) towards one request"""
+        usage = RequestUsage(engine)
+        token = _current_request.set(usage)
+        try:
+            yield usage
+        finally:
+            _current_request.reset(token)
+            self._engine(engine)["requests"] += 1
+            self._today()["requests"] += 1
+
+    def record(self, node: str, response: Any) -> None:
+        """Count one LLM response made by `node` of the current request"""
+        usage = _current_request.get()
+        if usage is None:
+            return
+        input_tokens, output_tokens = token_counts(response)
+        cost = self.cost(input_tokens, output_tokens)
+        usage.add(node, input_tokens, output_tokens, cost)
+        engine = self._engine(usage.engine)
+        _add(engine, input_tokens, output_tokens, cost)
+        _add(engine["nodes"].setdefault(node, _totals()), input_tokens, output_tokens, cost)
+        _add(self._today(), input_tokens, output_tokens, cost)
+
+    def spent_today(self) -> float:
+        return self._today()["cost_usd"]
+
+    def over_budget(self) -> bool:
+        """True when today's spend has reached the daily budget (never without one)"""
+        if self.daily_budget_usd <= 0 or self.spent_today() < self.daily_budget_usd:
+            return False
+        today = self._today()
+        if today["budget_fallbacks"] == 0:  # Once per day the budget runs out
+            logger.warning("💸 Daily LLM budget of ${budget} reached, switching to the rules engine",
+                           budget=self.daily_budget_usd)
+        today["budget_fallbacks"] += 1
+        self.budget_fallbacks += 1
+        return True
+
+    def metrics(self) -> Dict[str, Any]:
+        engines = {}
+        for name, engine in self.engines.items():
+            requests = max(1, engine["requests"])
+            engines[name] = {
+                **_rounded({key: value for key, value in engine.items() if key != "nodes"}),
+                "tokens_per_request": round((engine["input_tokens"] + engine["output_tokens"]) / requests, 1),
+                "cost_per_request_usd": round(engine["cost_usd"] / requests, 8),
+                "requests_per_usd": round(engine["requests"] / engine["cost_usd"], 1) if engine["cost_usd"] else None,
+                "nodes": {node: _rounded(totals) for node, totals in engine["nodes"].items()},
+            }
+        return {
+            "model": self.model,
+            "price_per_mtok_usd": {"input": self.input_price, "output": self.output_price},
+            "daily_budget_usd": self.daily_budget_usd or None,
+            "spent_today_usd": round(self.spent_today(), 6),
+            "budget_fallbacks": self.budget_fallbacks,
+            "engines": engines,
+            "days": {day: _rounded(totals) for day, totals in sorted(self.days.items())},
+        }
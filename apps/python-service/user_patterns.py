@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+SilentSort User Pattern Store
+Names and folders the user accepted, learned as name-shape templates and
+per-category folder preferences, so files like ones the user already named
+can be named without the LLM
+"""
+
+import os
+import re
+import time
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiosqlite
+from loguru import logger
+
+# A shape is the original stem with digit runs replaced by '#' ("IMG_2034.jpg" -> "img_#.jpg");
+# a template is the accepted stem with digit runs copied from the original replaced by {n}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS name_patterns (
+    shape       TEXT NOT NULL,
+    template    TEXT NOT NULL,
+    category    TEXT,
+    accepted    INTEGER NOT NULL DEFAULT 0,
+    rejected    INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (shape, template)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS folder_preferences (
+    category    TEXT NOT NULL,
+    folder      TEXT NOT NULL,
+    choices     INTEGER NOT NULL DEFAULT 0,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (category, folder)
+) WITHOUT ROWID;
+"""
+
+_DIGITS = re.compile(r"\d+")
+_PLACEHOLDER = re.compile(r"\{(\d+)\}")
+
+
+def name_shape(original_name: str) -> str:
+    stem, extension = os.path.splitext(original_name)
+    return _DIGITS.sub("#", stem.lower()) + extension.lower()
+
+
+def derive_template(original_name: str, accepted_name: str) -> Optional[str]:
+    """Template reproducing `accepted_name` from `original_name`; None when it would not generalize.
+
+    Every digit run in the accepted name must come from the original (a number
+    typed by the user belongs to that one file), and the extension must match.
+    """
+    original_stem, original_extension = os.path.splitext(original_name)
+    accepted_stem, accepted_extension = os.path.splitext(accepted_name)
+    if accepted_extension.lower() != original_extension.lower() or "{" in accepted_stem:
+        return None
+    numbers = _DIGITS.findall(original_stem)
+
+    def placeholder(match: re.Match) -> str:
+        value = match.group(0)
+        if value not in numbers:
+            raise ValueError(value)
+        return "{%d}" % numbers.index(value)
+
+    try:
+        return _DIGITS.sub(placeholder, accepted_stem)
+    except ValueError:
+        return None
+
+
+def render_template(template: str, original_name: str) -> Optional[str]:
+    stem, extension = os.path.splitext(original_name)
+    numbers = _DIGITS.findall(stem)
+    try:
+        return _PLACEHOLDER.sub(lambda m: numbers[int(m.group(1))], template) + extension
+    except IndexError:
+        return None
+
+
+class PatternStats:
+    __slots__ = ("category", "accepted", "rejected")
+
+    def __init__(self, category: Optional[str] = None, accepted: int = 0, rejected: int = 0):
+        self.category = category
+        self.accepted = accepted
+        self.rejected = rejected
+
+
+class UserPatternStore:
+    """Learned naming templates and folder preferences.
+
+    Everything is held in memory and read without touching SQLite; feedback
+    updates memory immediately and marks the rows dirty, and a background
+    task writes dirty rows in one batched transaction every
+    `flush_seconds` (sooner once `flush_batch` rows are dirty, and on close).
+    A template is used once it has `min_support` acceptances and accounts
+    for at least `min_confidence` of the feedback for its shape.
+    """
+
+    def __init__(self, db_path: str, min_support: int = 3, min_confidence: float = 0.8,
+                 flush_seconds: float = 2.0, flush_batch: int = 500):
+        self.db_path = db_path
+        self.min_support = min_support
+        self.min_confidence = min_confidence
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+        self.db: Optional[aiosqlite.Connection] = None
+        self.patterns: Dict[str, Dict[str, PatternStats]] = {}
+        self.folders: Dict[str, Dict[str, int]] = {}
+        self._dirty_patterns: Set[Tuple[str, str]] = set()
+        self._dirty_folders: Set[Tuple[str, str]] = set()
+        self._flush_now = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"feedback": 0, "matches": 0, "flushes": 0, "rows_written": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["UserPatternStore"]:
+        """None when USER_PATTERNS_ENABLED=false"""
+        if os.getenv("USER_PATTERNS_ENABLED", "true").lower() != "true":
+            return None
+        return cls(
+            os.getenv("USER_PATTERNS_PATH", "silentsort-patterns.db"),
+            min_support=int(os.getenv("USER_PATTERNS_MIN_SUPPORT", "3")),
+            min_confidence=float(os.getenv("USER_PATTERNS_MIN_CONFIDENCE", "0.8")),
+            flush_seconds=float(os.getenv("USER_PATTERNS_FLUSH_SECONDS", "2")),
+        )
+
+    async def open(self) -> None:
+        self.db = await aiosqlite.connect(self.db_path)
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.executescript(SCHEMA)
+        await self.db.commit()
+
+        async with self.db.execute("SELECT shape, template, category, accepted, rejected FROM name_patterns") as cursor:
+            async for shape, template, category, accepted, rejected in cursor:
+                self.patterns.setdefault(shape, {})[template] = PatternStats(category, accepted, rejected)
+        async with self.db.execute("SELECT category, folder, choices FROM folder_preferences") as cursor:
+            async for category, folder, choices in cursor:
+                self.folders.setdefault(category, {})[folder] = choices
+        logger.info("🧠 Loaded {shapes} name shapes and {categories} folder preferences",
+                    shapes=len(self.patterns), categories=len(self.folders))
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        if self.db is not None:
+            await self.flush()
+            await self.db.close()
+            self.db = None
+
+    # ========================================================================
+    # READS (memory only)
+    # ========================================================================
+
+    def match(self, original_name: str) -> Optional[Dict[str, Any]]:
+        """Learned name for a file, or None when no template is trusted enough for its shape"""
+        learned = self._learned(original_name)
+        if learned:
+            self.stats["matches"] += 1
+        return learned
+
+    def _learned(self, original_name: str) -> Optional[Dict[str, Any]]:
+        templates = self.patterns.get(name_shape(original_name))
+        if not templates:
+            return None
+        total = sum(stats.accepted for stats in templates.values())
+        template, stats = max(templates.items(), key=lambda item: item[1].accepted)
+        if stats.accepted < self.min_support:
+            return None
+        confidence = stats.accepted / (total + stats.rejected)
+        if confidence < self.min_confidence:
+            return None
+        name = render_template(template, original_name)
+        if name is None:
+            return None
+        return {
+            "suggested_name": name,
+            "template": template,
+            "shape": name_shape(original_name),
+            "category": stats.category,
+            "confidence": round(confidence, 3),
+            "support": stats.accepted,
+        }
+
+    def folder_preferences(self) -> Dict[str, str]:
+        """Most chosen folder per category"""
+        return {category: max(choices.items(), key=lambda item: item[1])[0]
+                for category, choices in self.folders.items() if choices}
+
+    # ========================================================================
+    # FEEDBACK (memory now, SQLite on the next flush)
+    # ========================================================================
+
+    def record_feedback(self, original_name: str, accepted_name: Optional[str] = None,
+                        suggested_name: Optional[str] = None, category: Optional[str] = None,
+                        chosen_folder: Optional[str] = None) -> Optional[str]:
+        """Learn from what the user kept; returns the template learned, if any"""
+        self.stats["feedback"] += 1
+        shape = name_shape(original_name)
+
+        # A learned suggestion the user did not keep counts against its template
+        learned = self._learned(original_name)
+        if learned and suggested_name == learned["suggested_name"] and accepted_name != suggested_name:
+            self.patterns[shape][learned["template"]].rejected += 1
+            self._dirty_patterns.add((shape, learned["template"]))
+
+        template = derive_template(original_name, accepted_name) if accepted_name else None
+        if template is not None:
+            stats = self.patterns.setdefault(shape, {}).setdefault(template, PatternStats())
+            stats.accepted += 1
+            stats.category = category or stats.category
+            self._dirty_patterns.add((shape, template))
+
+        if chosen_folder and category:
+            choices = self.folders.setdefault(category, {})
+            choices[chosen_folder] = choices.get(chosen_folder, 0) + 1
+            self._dirty_folders.add((category, chosen_folder))
+
+        if len(self._dirty_patterns) + len(self._dirty_folders) >= self.flush_batch:
+            self._flush_now.set()
+        return template
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Writing user patterns failed: {e}")
+
+    async def flush(self) -> int:
+        """Write all dirty rows in one transaction; returns the number of rows written"""
+        if self.db is None or not (self._dirty_patterns or self._dirty_folders):
+            return 0
+        dirty_patterns, self._dirty_patterns = self._dirty_patterns, set()
+        dirty_folders, self._dirty_folders = self._dirty_folders, set()
+        now = time.time()
+
+        pattern_rows: List[Tuple[Any, ...]] = []
+        for shape, template in dirty_patterns:
+            stats = self.patterns[shape][template]
+            pattern_rows.append((shape, template, stats.category, stats.accepted, stats.rejected, now))
+        folder_rows = [(category, folder, self.folders[category][folder], now) for category, folder in dirty_folders]
+
+        try:
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO name_patterns (shape, template, category, accepted, rejected, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                pattern_rows,
+            )
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO folder_preferences (category, folder, choices, updated_at) VALUES (?, ?, ?, ?)",
+                folder_rows,
+            )
+            await self.db.commit()
+        except Exception:
+            # Keep the rows dirty so the next flush retries them
+            self._dirty_patterns |= dirty_patterns
+            self._dirty_folders |= dirty_folders
+            raise
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(pattern_rows) + len(folder_rows)
+        return len(pattern_rows) + len(folder_rows)
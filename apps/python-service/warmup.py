@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+SilentSort Warm-up
+Startup warm-up steps and the readiness flag they gate
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+
+class Warmup:
+    """Runs registered warm-up steps once at startup, then marks the service ready.
+
+    Steps are best effort: a failing step (e.g. the LLM API is unreachable) is
+    logged and reported, but does not keep the service unready forever. /health
+    stays a liveness check; /ready is what load balancers and start.py poll.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = warmup_enabled() if enabled is None else enabled
+        self.steps: List[Tuple[str, Callable[[], Awaitable[Any]]]] = []
+        self.timings_ms: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.ready = False
+        self.duration_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def step(self, name: str):
+        """Decorator registering an async warm-up step; steps run in registration order"""
+        def register(fn: Callable[[], Awaitable[Any]]):
+            self.steps.append((name, fn))
+            return fn
+        return register
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        if self.enabled:
+            for name, fn in self.steps:
+                step_started = time.perf_counter()
+                try:
+                    await fn()
+                except Exception as e:
+                    self.errors[name] = str(e)
+                    logger.warning("⚠️ Warm-up step {step} failed: {error}", step=name, error=str(e))
+                self.timings_ms[name] = round((time.perf_counter() - step_started) * 1000, 2)
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        self.ready = True
+        logger.info("🔥 Ready after {warmup_ms}ms of warm-up", warmup_ms=self.duration_ms)
+
+    def start(self) -> None:
+        """Warm up in the background so /ready can answer 503 meanwhile"""
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "warmup_enabled": self.enabled,
+            "warmup_ms": self.duration_ms,
+            "steps_ms": self.timings_ms,
+            "errors": self.errors,
+        }